@@ -0,0 +1,162 @@
+#!/usr/bin/env python3.13
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+from pathlib import Path
+import sys
+
+from pydantic import ValidationError
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+HarnessExitCode = importlib.import_module("harness.exit_codes").HarnessExitCode
+
+media_contracts = importlib.import_module("harness.contracts.media_pipeline")
+load_assembly_manifest = media_contracts.load_assembly_manifest
+load_render_manifest = media_contracts.load_render_manifest
+load_voice_manifest = media_contracts.load_voice_manifest
+validate_assembly_inputs = media_contracts.validate_assembly_inputs
+validate_render_manifest = media_contracts.validate_render_manifest
+validate_voice_manifest_files = media_contracts.validate_voice_manifest_files
+verify_final_output = media_contracts.verify_final_output
+
+_assembly = importlib.import_module("harness.assembly")
+AssemblyError = _assembly.AssemblyError
+assemble_video = _assembly.assemble_video
+assembly_manifest_path = _assembly.assembly_manifest_path
+write_assembly_manifest = _assembly.write_assembly_manifest
+
+render_profile_from_env = importlib.import_module("harness.render").render_profile_from_env
+
+
+def _resolve_with_project(project_dir: Path, raw_path: str) -> Path:
+    path = Path(raw_path)
+    if path.is_absolute():
+        return path
+    return project_dir / path
+
+
+def _existing_assembly_is_current(project_dir: Path, assembly_manifest_file: Path, render_manifest) -> bool:
+    if not assembly_manifest_file.exists():
+        return False
+    try:
+        assembly_manifest = load_assembly_manifest(assembly_manifest_file)
+        validate_assembly_inputs(assembly_manifest, render_manifest=render_manifest, project_dir=project_dir)
+        verify_final_output(assembly_manifest, project_dir=project_dir)
+    except (ValidationError, ValueError) as exc:
+        print(f"Existing assembly manifest is stale, reassembling: {exc}", file=sys.stderr)
+        return False
+    return True
+
+
+def assemble_project(
+    project_dir: Path,
+    *,
+    voice_manifest_path: str,
+    render_manifest_path: str,
+    workers: int | None,
+    force: bool,
+) -> int:
+    voice_manifest_file = _resolve_with_project(project_dir, voice_manifest_path)
+    render_manifest_file = _resolve_with_project(project_dir, render_manifest_path)
+    assembly_manifest_file = assembly_manifest_path(project_dir)
+
+    missing = [str(path) for path in (voice_manifest_file, render_manifest_file) if not path.exists()]
+    if missing:
+        print(f"Error: required manifest file(s) missing: {', '.join(missing)}", file=sys.stderr)
+        return int(HarnessExitCode.VALIDATION_ERROR)
+
+    voice_manifest = load_voice_manifest(voice_manifest_file)
+    validate_voice_manifest_files(voice_manifest, project_dir=project_dir)
+    render_manifest = load_render_manifest(render_manifest_file)
+    validate_render_manifest(render_manifest, voice_manifest=voice_manifest, project_dir=project_dir)
+
+    if not force and _existing_assembly_is_current(project_dir, assembly_manifest_file, render_manifest):
+        print(json.dumps({"status": "skipped", "type": "assembly", "assembly_manifest": str(assembly_manifest_file)}))
+        return int(HarnessExitCode.SUCCESS)
+
+    result = assemble_video(
+        project_dir,
+        render_manifest,
+        profile=render_profile_from_env("final"),
+        voice_manifest=voice_manifest,
+        reuse_segments=not force,
+        workers=workers,
+    )
+    assembly_manifest = result.manifest
+    validate_assembly_inputs(assembly_manifest, render_manifest=render_manifest, project_dir=project_dir)
+    write_assembly_manifest(project_dir, assembly_manifest)
+
+    print(
+        json.dumps(
+            {
+                "status": "ok",
+                "type": "assembly",
+                "assembly_manifest": str(assembly_manifest_file),
+                "output_path": assembly_manifest.output_path,
+                "stream_copy": result.stream_copy,
+                "reused_segments": list(result.reused_scene_ids),
+                "actual_duration_seconds": assembly_manifest.actual_duration_seconds,
+            }
+        )
+    )
+    return int(HarnessExitCode.SUCCESS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Assemble the final video from the validated render manifest.")
+    parser.add_argument("--project-dir", required=True)
+    parser.add_argument("--voice-manifest-path", default="artifacts/voice_manifest.json")
+    parser.add_argument("--render-manifest-path", default="artifacts/render_manifest.json")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parallel per-scene mux processes (default: WD_MUX_WORKERS, else the CPU count)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reassemble every segment, even when the existing assembly manifest and final output still verify",
+    )
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir)
+    if not project_dir.is_dir():
+        print(f"Error: project directory not found at '{project_dir}'", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+
+    try:
+        sys.exit(
+            assemble_project(
+                project_dir,
+                voice_manifest_path=args.voice_manifest_path,
+                render_manifest_path=args.render_manifest_path,
+                workers=args.workers,
+                force=args.force,
+            )
+        )
+    except PermissionError as exc:
+        print(f"Policy Error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.POLICY_VIOLATION))
+    except ValidationError as exc:
+        print(f"Schema validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.SCHEMA_VIOLATION))
+    except AssemblyError as exc:
+        print(f"Assembly error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+    except ValueError as exc:
+        print(f"Contract validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.VALIDATION_ERROR))
+    except Exception as exc:
+        print(f"Unexpected assembly error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+
+
+if __name__ == "__main__":
+    main()
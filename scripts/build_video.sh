@@ -26,13 +26,76 @@ EOF
 log_info() { echo "[INFO] $(date '+%Y-%m-%d %H:%M:%S') - $1"; }
 log_error() { echo "[ERROR] $(date '+%Y-%m-%d %H:%M:%S') - $1" >&2; }
 
+# --- Harness Calls ---
+# With WD_HARNESS_DAEMON=1 (or an existing WD_HARNESS_DAEMON_SOCKET) state, contract and
+# harness calls go through the warm harness daemon instead of a fresh interpreter each.
+# wd_rpc.py runs the command directly whenever the daemon is unreachable.
+harness_rpc() {
+  if [ -n "${WD_HARNESS_DAEMON_SOCKET:-}" ]; then
+    "$PYTHON_CMD" "$SCRIPT_DIR/wd_rpc.py" --socket "$WD_HARNESS_DAEMON_SOCKET" "$@"
+    return
+  fi
+
+  local method="$1"
+  shift
+  case "$method" in
+    update_project_state) "$PYTHON_CMD" "$SCRIPT_DIR/update_project_state.py" "$@" ;;
+    runtime_phase_contracts) "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" "$@" ;;
+    harness.cli) "$PYTHON_CMD" -m harness.cli "$@" ;;
+    *)
+      log_error "Unknown harness RPC method: $method"
+      return 1
+      ;;
+  esac
+}
+
+# Append a command to the EXIT trap instead of replacing whatever is already there.
+add_exit_trap() {
+  local hook="$1"
+  local existing=""
+  local current
+  current="$(trap -p EXIT)"
+  if [ -n "$current" ]; then
+    eval "set -- $current"
+    existing="$3"
+  fi
+  trap "${existing:+$existing; }$hook" EXIT
+}
+
+state_cli() { harness_rpc update_project_state "$@"; }
+contracts_cli() { harness_rpc runtime_phase_contracts "$@"; }
+harness_cli() { harness_rpc harness.cli "$@"; }
+
+start_harness_daemon() {
+  if [ "${WD_HARNESS_DAEMON:-0}" != "1" ] || [ -n "${WD_HARNESS_DAEMON_SOCKET:-}" ]; then
+    return 0
+  fi
+
+  local socket_path
+  socket_path="$(mktemp -u "${TMPDIR:-/tmp}/wd-harness.XXXXXX").sock"
+  "$PYTHON_CMD" -m harness.daemon --socket "$socket_path" >/dev/null &
+  HARNESS_DAEMON_PID=$!
+  add_exit_trap 'kill "$HARNESS_DAEMON_PID" 2>/dev/null || true'
+
+  local _i
+  for _i in $(seq 1 100); do
+    if [ -S "$socket_path" ]; then
+      export WD_HARNESS_DAEMON_SOCKET="$socket_path"
+      log_info "Harness daemon started (pid $HARNESS_DAEMON_PID)"
+      return 0
+    fi
+    sleep 0.1
+  done
+  log_error "Harness daemon did not start; continuing with direct calls"
+}
+
 # --- State Management ---
 get_state() {
-  $PYTHON_CMD "$SCRIPT_DIR/update_project_state.py" get --project-dir "$PROJECT_DIR" --key "$1"
+  state_cli get --project-dir "$PROJECT_DIR" --key "$1"
 }
 
 set_state() {
-  $PYTHON_CMD "$SCRIPT_DIR/update_project_state.py" set --project-dir "$PROJECT_DIR" --key "$1" --value "$2" --actor orchestrator
+  state_cli set --project-dir "$PROJECT_DIR" --key "$1" --value "$2" --actor orchestrator
 }
 
 advance_phase() {
@@ -42,7 +105,7 @@ advance_phase() {
 }
 
 clear_phase_failures() {
-  $PYTHON_CMD "$SCRIPT_DIR/update_project_state.py" clear-failures --project-dir "$PROJECT_DIR" --actor orchestrator >/dev/null
+  state_cli clear-failures --project-dir "$PROJECT_DIR" --actor orchestrator >/dev/null
 }
 
 emit_phase_event() {
@@ -56,7 +119,7 @@ emit_phase_event() {
   fi
 
   local args=(
-    "$PYTHON_CMD" "$SCRIPT_DIR/update_project_state.py" log-event
+    state_cli log-event
     --project-dir "$PROJECT_DIR"
     --event-type "$event_type"
     --phase "$CURRENT_PHASE"
@@ -86,7 +149,7 @@ record_phase_failure() {
   local evidence_token="${9:-}"
 
   if [ "$force_block" = "true" ]; then
-    $PYTHON_CMD "$SCRIPT_DIR/update_project_state.py" fail \
+    state_cli fail \
       --project-dir "$PROJECT_DIR" \
       --error-code "$error_code" \
       --error-message "$error_message" \
@@ -99,7 +162,7 @@ record_phase_failure() {
       --actor orchestrator \
       --force-block >/dev/null
   else
-    $PYTHON_CMD "$SCRIPT_DIR/update_project_state.py" fail \
+    state_cli fail \
       --project-dir "$PROJECT_DIR" \
       --error-code "$error_code" \
       --error-message "$error_message" \
@@ -175,6 +238,12 @@ classify_exit_code() {
       FAILURE_RETRYABLE="false"
       FAILURE_FORCE_BLOCK="true"
       ;;
+    6)
+      FAILURE_ERROR_CODE="THROTTLED"
+      FAILURE_GATE="runtime"
+      FAILURE_OWNER="harness"
+      FAILURE_RETRYABLE="true"
+      ;;
     *)
       FAILURE_ERROR_CODE="INFRASTRUCTURE_ERROR"
       FAILURE_GATE="runtime"
@@ -185,6 +254,13 @@ classify_exit_code() {
   esac
 }
 
+# THROTTLED (6): the harness already backed off internally; rerun later without
+# recording a failure so rate limiting never consumes the phase retry budget.
+report_throttled() {
+  log_error "$1 was throttled by the API (exit 6); not counted against the retry budget. Rerun to resume."
+  emit_phase_event "phase_failure" "${CURRENT_PHASE_ATTEMPT:-1}" "throttled: $1" "rerun after rate limit window"
+}
+
 run_with_failure_policy() {
   local description="$1"
   shift
@@ -199,6 +275,11 @@ run_with_failure_policy() {
     return 0
   fi
 
+  if [ "$rc" -eq 6 ]; then
+    report_throttled "$description"
+    return "$rc"
+  fi
+
   classify_exit_code "$rc" "$CURRENT_PHASE"
 
   local msg="$description failed with exit code $rc"
@@ -235,6 +316,38 @@ run_with_failure_policy() {
   return "$rc"
 }
 
+# Batch harness entry points record their own (single, aggregated) phase failure
+# through record_phase_failure, so the orchestrator must not record it again.
+run_harness_batch() {
+  local description="$1"
+  shift
+
+  set +e
+  "$@"
+  local rc=$?
+  set -e
+
+  if [ "$rc" -eq 0 ]; then
+    clear_phase_failures
+    return 0
+  fi
+
+  if [ "$rc" -eq 6 ]; then
+    report_throttled "$description"
+    return "$rc"
+  fi
+
+  local phase_status
+  phase_status=$(get_state "phase_status" || echo "active")
+  if [ "$phase_status" = "blocked" ]; then
+    log_error "Phase '$CURRENT_PHASE' is blocked. Review failure_context and resolve manually."
+    return 2
+  fi
+
+  log_error "$description failed with exit code $rc"
+  return "$rc"
+}
+
 resolve_phase_handler() {
   local phase="$1"
   local line p h
@@ -311,7 +424,7 @@ handle_plan() {
   fi
 
   run_with_failure_policy "plan generation" \
-    "$PYTHON_CMD" -m harness.cli \
+    harness_cli \
     --phase "plan" \
     --project-dir "$PROJECT_DIR" \
     --topic "$TOPIC"
@@ -342,18 +455,27 @@ handle_narration() {
     return 1
   fi
 
+  # WD_PIPELINED=1 scaffolds, builds and QCs each scene while narration is still
+  # streaming; the build_scenes and scene_qc batches then skip the scenes the
+  # scene_ledger already reports as done.
+  local narration_mode="--stream"
+  if [ "${WD_PIPELINED:-0}" = "1" ]; then
+    narration_mode="--pipelined"
+  fi
+
   run_with_failure_policy "narration generation" \
-    "$PYTHON_CMD" -m harness.cli \
+    harness_cli \
     --phase "narration" \
-    --project-dir "$PROJECT_DIR"
+    --project-dir "$PROJECT_DIR" \
+    "$narration_mode"
 
   run_with_failure_policy "scene manifest preparation" \
-    "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" \
+    contracts_cli \
     prepare-scene-manifest \
     --project-dir "$PROJECT_DIR"
 
   run_with_failure_policy "scene scaffold preparation" \
-    "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" \
+    contracts_cli \
     scaffold-scenes \
     --project-dir "$PROJECT_DIR"
 
@@ -386,78 +508,26 @@ handle_build_scenes() {
   fi
 
   run_with_failure_policy "scene scaffold consistency" \
-    "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" \
+    contracts_cli \
     scaffold-scenes \
     --project-dir "$PROJECT_DIR"
 
-  local scene_ids_file
-  scene_ids_file=$(mktemp)
-  run_with_failure_policy "scene id extraction" \
-    jq -r '.scenes[].scene_id' "$manifest_path" >"$scene_ids_file"
-
-  if [ ! -s "$scene_ids_file" ]; then
-    rm -f "$scene_ids_file"
-    record_phase_failure \
-      "VALIDATION_ERROR" \
-      "scene manifest contains no scenes: $manifest_path" \
-      "contract" \
-      "orchestrator" \
-      "false" \
-      "true"
-    return 1
+  # Scenes whose build fingerprint (spec, prompt templates, schema version, model)
+  # is unchanged keep their body; WD_FORCE_REBUILD=1 regenerates every scene.
+  local rebuild_args=()
+  if [ "${WD_FORCE_REBUILD:-0}" = "1" ]; then
+    rebuild_args+=(--force)
   fi
 
-  local scene_id
-  while IFS= read -r scene_id; do
-    [ -n "$scene_id" ] || continue
-
-    local scene_payload_file
-    scene_payload_file=$(mktemp)
-    run_with_failure_policy "scene spec resolution $scene_id" \
-      "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" \
-      print-scene-spec \
-      --project-dir "$PROJECT_DIR" \
-      --scene-id "$scene_id" >"$scene_payload_file"
-
-    local scene_file_rel_file
-    scene_file_rel_file=$(mktemp)
-    local scene_spec_json_file
-    scene_spec_json_file=$(mktemp)
-    run_with_failure_policy "scene file extraction $scene_id" \
-      jq -r '.scene_file' "$scene_payload_file" >"$scene_file_rel_file"
-    run_with_failure_policy "scene spec extraction $scene_id" \
-      jq -c '.scene_spec' "$scene_payload_file" >"$scene_spec_json_file"
-
-    local scene_file_rel
-    scene_file_rel=$(cat "$scene_file_rel_file")
-    local scene_spec_json
-    scene_spec_json=$(cat "$scene_spec_json_file")
-    rm -f "$scene_file_rel_file" "$scene_spec_json_file"
-    rm -f "$scene_payload_file"
-
-    if [ -z "$scene_file_rel" ] || [ "$scene_file_rel" = "null" ] || [ -z "$scene_spec_json" ] || [ "$scene_spec_json" = "null" ]; then
-      rm -f "$scene_ids_file"
-      record_phase_failure \
-        "VALIDATION_ERROR" \
-        "scene spec payload invalid for $scene_id" \
-        "contract" \
-        "orchestrator" \
-        "false" \
-        "true"
-      return 1
-    fi
-
-    run_with_failure_policy "scene build $scene_id" \
-      "$PYTHON_CMD" -m harness.cli \
-      --phase "build_scenes" \
-      --project-dir "$PROJECT_DIR" \
-      --scene-file "$PROJECT_DIR/$scene_file_rel" \
-      --scene-spec "$scene_spec_json"
-  done <"$scene_ids_file"
-  rm -f "$scene_ids_file"
+  run_harness_batch "scene build batch" \
+    harness_cli \
+    --phase "build_scenes" \
+    --project-dir "$PROJECT_DIR" \
+    --all-scenes \
+    ${rebuild_args[@]+"${rebuild_args[@]}"}
 
   run_with_failure_policy "scene build contract validation" \
-    "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" \
+    contracts_cli \
     validate-build-scenes \
     --project-dir "$PROJECT_DIR"
 
@@ -489,75 +559,48 @@ handle_scene_qc() {
     return 1
   fi
 
-  local scene_ids_file
-  scene_ids_file=$(mktemp)
-  run_with_failure_policy "scene id extraction for qc" \
-    jq -r '.scenes[].scene_id' "$manifest_path" >"$scene_ids_file"
-
-  if [ ! -s "$scene_ids_file" ]; then
-    rm -f "$scene_ids_file"
-    record_phase_failure \
-      "VALIDATION_ERROR" \
-      "scene manifest contains no scenes: $manifest_path" \
-      "contract" \
-      "orchestrator" \
-      "false" \
-      "true"
-    return 1
-  fi
-
-  local scene_id
-  while IFS= read -r scene_id; do
-    [ -n "$scene_id" ] || continue
-
-    local scene_payload_file
-    scene_payload_file=$(mktemp)
-    run_with_failure_policy "scene path resolution $scene_id" \
-      "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" \
-      print-scene-spec \
-      --project-dir "$PROJECT_DIR" \
-      --scene-id "$scene_id" >"$scene_payload_file"
-
-    local scene_file_rel_file
-    scene_file_rel_file=$(mktemp)
-    run_with_failure_policy "scene path extraction $scene_id" \
-      jq -r '.scene_file' "$scene_payload_file" >"$scene_file_rel_file"
-
-    local scene_file_rel
-    scene_file_rel=$(cat "$scene_file_rel_file")
-    rm -f "$scene_file_rel_file"
-    rm -f "$scene_payload_file"
-
-    if [ -z "$scene_file_rel" ] || [ "$scene_file_rel" = "null" ]; then
-      rm -f "$scene_ids_file"
-      record_phase_failure \
-        "VALIDATION_ERROR" \
-        "scene path payload invalid for $scene_id" \
-        "contract" \
-        "orchestrator" \
-        "false" \
-        "true"
-      return 1
+  # Fans QC out over every manifest scene, streams each report to qc/ as it
+  # lands, and runs the scene QC contract validation once at the end.
+  run_harness_batch "scene qc batch" \
+    harness_cli \
+    --phase "scene_qc" \
+    --project-dir "$PROJECT_DIR" \
+    --all-scenes
+
+  # Runtime gate: a low-res draft render catches scene crashes and timing drift before
+  # voiceovers and the final render. WD_DRAFT_RENDER=0 skips it.
+  if [ "${WD_DRAFT_RENDER:-1}" != "0" ]; then
+    local draft_args=()
+    if [ "${WD_FORCE_RERENDER:-0}" = "1" ]; then
+      draft_args+=(--force)
     fi
 
-    run_with_failure_policy "scene qc $scene_id" \
-      "$PYTHON_CMD" -m harness.cli \
-      --phase "scene_qc" \
+    # Failed scenes are charged to their own scene ledger entries by render_scenes.py.
+    log_info "Running draft render runtime gate..."
+    run_harness_batch "draft render runtime gate" \
+      "$PYTHON_CMD" "$SCRIPT_DIR/render_scenes.py" \
       --project-dir "$PROJECT_DIR" \
-      --scene-id "$scene_id" \
-      --scene-file "$PROJECT_DIR/$scene_file_rel"
-  done <"$scene_ids_file"
-  rm -f "$scene_ids_file"
-
-  run_with_failure_policy "scene qc contract validation" \
-    "$PYTHON_CMD" "$SCRIPT_DIR/runtime_phase_contracts.py" \
-    validate-scene-qc \
-    --project-dir "$PROJECT_DIR"
+      --profile draft \
+      ${draft_args[@]+"${draft_args[@]}"}
+  fi
 
   advance_phase "precache_voiceovers"
 }
 
 handle_precache_voiceovers() {
+  # Scene voiceovers synthesize in parallel (WD_VOICE_WORKERS, default: CPU count); a voice
+  # manifest that still matches the scene manifest is reused unless WD_FORCE_REVOICE=1.
+  local precache_args=()
+  if [ "${WD_FORCE_REVOICE:-0}" = "1" ]; then
+    precache_args+=(--force)
+  fi
+
+  log_info "Precaching scene voiceovers..."
+  run_with_failure_policy "voiceover precache" \
+    "$PYTHON_CMD" "$SCRIPT_DIR/precache_voiceovers.py" \
+    --project-dir "$PROJECT_DIR" \
+    ${precache_args[@]+"${precache_args[@]}"}
+
   log_info "Validating voice manifest and cached voiceover assets..."
 
   run_with_failure_policy "voice manifest validation" \
@@ -577,10 +620,38 @@ handle_final_render() {
     --project-dir "$PROJECT_DIR"
 
   log_info "Render preconditions validated."
+
+  # Renders run in parallel (WD_RENDER_WORKERS, default: CPU count); a render manifest that
+  # still validates against the voice manifest is reused unless WD_FORCE_RERENDER=1.
+  local render_args=()
+  if [ "${WD_FORCE_RERENDER:-0}" = "1" ]; then
+    render_args+=(--force)
+  fi
+
+  log_info "Rendering scenes..."
+  run_with_failure_policy "scene render" \
+    "$PYTHON_CMD" "$SCRIPT_DIR/render_scenes.py" \
+    --project-dir "$PROJECT_DIR" \
+    ${render_args[@]+"${render_args[@]}"}
+
+  log_info "Scenes rendered."
   advance_phase "assemble"
 }
 
 handle_assemble() {
+  # Stream-copy concat when all scene encodes share a codec profile; a final output that
+  # still verifies is reused unless WD_FORCE_REASSEMBLE=1.
+  local assemble_args=()
+  if [ "${WD_FORCE_REASSEMBLE:-0}" = "1" ]; then
+    assemble_args+=(--force)
+  fi
+
+  log_info "Assembling final video..."
+  run_with_failure_policy "final video assembly" \
+    "$PYTHON_CMD" "$SCRIPT_DIR/assemble_video.py" \
+    --project-dir "$PROJECT_DIR" \
+    ${assemble_args[@]+"${assemble_args[@]}"}
+
   log_info "Validating assembly manifest and final output..."
 
   run_with_failure_policy "assembly contract verification" \
@@ -647,6 +718,7 @@ main() {
 
   export PROJECT_DIR="$ROOT_DIR/projects/$PROJECT_NAME"
   export PYTHONPATH="$ROOT_DIR/src"
+  start_harness_daemon
 
   CURRENT_PHASE=$(get_state "phase" || echo "init")
   local phase_status
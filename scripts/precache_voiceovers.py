@@ -0,0 +1,144 @@
+#!/usr/bin/env python3.13
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+from pathlib import Path
+import sys
+
+from pydantic import ValidationError
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+HarnessExitCode = importlib.import_module("harness.exit_codes").HarnessExitCode
+
+media_contracts = importlib.import_module("harness.contracts.media_pipeline")
+load_voice_manifest = media_contracts.load_voice_manifest
+validate_voice_manifest_files = media_contracts.validate_voice_manifest_files
+
+load_scene_manifest = importlib.import_module("harness.contracts.runtime_pipeline").load_scene_manifest
+
+_voice_precache = importlib.import_module("harness.voice_precache")
+precache_voiceovers = _voice_precache.precache_voiceovers
+voice_manifest_matches_scenes = _voice_precache.voice_manifest_matches_scenes
+voice_manifest_path = _voice_precache.voice_manifest_path
+voice_service_from_env = _voice_precache.voice_service_from_env
+write_voice_manifest = _voice_precache.write_voice_manifest
+
+
+def _resolve_with_project(project_dir: Path, raw_path: str) -> Path:
+    path = Path(raw_path)
+    if path.is_absolute():
+        return path
+    return project_dir / path
+
+
+def _existing_manifest_is_current(project_dir: Path, voice_manifest_file: Path, scene_manifest) -> bool:
+    if not voice_manifest_file.exists():
+        return False
+    try:
+        voice_manifest = load_voice_manifest(voice_manifest_file)
+        validate_voice_manifest_files(voice_manifest, project_dir=project_dir)
+        current = voice_manifest_matches_scenes(project_dir, voice_manifest, scene_manifest)
+    except (ValidationError, ValueError) as exc:
+        print(f"Existing voice manifest is stale, re-synthesizing: {exc}", file=sys.stderr)
+        return False
+    return current
+
+
+def precache_project(
+    project_dir: Path,
+    *,
+    scene_manifest_path: str,
+    workers: int | None,
+    backend: str | None,
+    force: bool,
+) -> int:
+    scene_manifest_file = _resolve_with_project(project_dir, scene_manifest_path)
+    voice_manifest_file = voice_manifest_path(project_dir)
+    if not scene_manifest_file.exists():
+        print(f"Error: scene manifest missing: {scene_manifest_file}", file=sys.stderr)
+        return int(HarnessExitCode.VALIDATION_ERROR)
+
+    scene_manifest = load_scene_manifest(scene_manifest_file)
+    if not force and _existing_manifest_is_current(project_dir, voice_manifest_file, scene_manifest):
+        print(json.dumps({"status": "skipped", "type": "voice", "voice_manifest": str(voice_manifest_file)}))
+        return int(HarnessExitCode.SUCCESS)
+
+    service = voice_service_from_env(backend=backend)
+    voice_manifest = precache_voiceovers(project_dir, scene_manifest, service=service, workers=workers)
+    validate_voice_manifest_files(voice_manifest, project_dir=project_dir)
+    write_voice_manifest(project_dir, voice_manifest)
+
+    print(
+        json.dumps(
+            {
+                "status": "ok",
+                "type": "voice",
+                "voice_manifest": str(voice_manifest_file),
+                "scene_count": len(voice_manifest.assets),
+                "cache_hits": sum(1 for asset in voice_manifest.assets if asset.generation_mode == "cache_hit"),
+                "total_audio_seconds": round(sum(asset.duration_seconds for asset in voice_manifest.assets), 3),
+            }
+        )
+    )
+    return int(HarnessExitCode.SUCCESS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthesize every scene voiceover in parallel and write the voice manifest.")
+    parser.add_argument("--project-dir", required=True)
+    parser.add_argument("--scene-manifest-path", default="artifacts/scene_manifest.json")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parallel voice syntheses (default: WD_VOICE_WORKERS, else the CPU count)",
+    )
+    parser.add_argument(
+        "--backend",
+        default=None,
+        help="TTS engine: a built-in name or package.module:ClassName (default: WD_VOICE_BACKEND, else silent_wav)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild the voice manifest even when the existing one still matches the scene manifest",
+    )
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir)
+    if not project_dir.is_dir():
+        print(f"Error: project directory not found at '{project_dir}'", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+
+    try:
+        sys.exit(
+            precache_project(
+                project_dir,
+                scene_manifest_path=args.scene_manifest_path,
+                workers=args.workers,
+                backend=args.backend,
+                force=args.force,
+            )
+        )
+    except PermissionError as exc:
+        print(f"Policy Error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.POLICY_VIOLATION))
+    except ValidationError as exc:
+        print(f"Schema validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.SCHEMA_VIOLATION))
+    except ValueError as exc:
+        print(f"Contract validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.VALIDATION_ERROR))
+    except Exception as exc:
+        print(f"Unexpected voice precache error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+
+
+if __name__ == "__main__":
+    main()
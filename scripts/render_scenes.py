@@ -0,0 +1,277 @@
+#!/usr/bin/env python3.13
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+from pathlib import Path
+import sys
+
+from pydantic import ValidationError
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+HarnessExitCode = importlib.import_module("harness.exit_codes").HarnessExitCode
+ensure_run_context = importlib.import_module("harness.contracts.observability").ensure_run_context
+
+media_contracts = importlib.import_module("harness.contracts.media_pipeline")
+load_render_manifest = media_contracts.load_render_manifest
+load_render_preconditions = media_contracts.load_render_preconditions
+validate_render_manifest = media_contracts.validate_render_manifest
+validate_render_preconditions = media_contracts.validate_render_preconditions
+
+_runtime = importlib.import_module("harness.contracts.runtime_pipeline")
+load_scene_manifest = _runtime.load_scene_manifest
+
+_render = importlib.import_module("harness.render")
+RenderBatchError = _render.RenderBatchError
+build_render_manifest = _render.build_render_manifest
+draft_gate_failures = _render.draft_gate_failures
+draft_timings = _render.draft_timings
+invalidate_draft_renders = _render.invalidate_draft_renders
+load_render_keys = _render.load_render_keys
+render_cache_keys = _render.render_cache_keys
+render_manifest_path = _render.render_manifest_path
+render_profile_from_env = _render.render_profile_from_env
+render_scenes = _render.render_scenes
+write_draft_report = _render.write_draft_report
+write_render_keys = _render.write_render_keys
+write_render_manifest = _render.write_render_manifest
+
+RenderCache = importlib.import_module("harness.render_cache").RenderCache
+
+_batch = importlib.import_module("harness.batch")
+BatchResult = _batch.BatchResult
+SceneOutcome = _batch.SceneOutcome
+record_batch_failure = _batch.record_batch_failure
+
+
+def _resolve_with_project(project_dir: Path, raw_path: str) -> Path:
+    path = Path(raw_path)
+    if path.is_absolute():
+        return path
+    return project_dir / path
+
+
+def _existing_manifest_is_current(project_dir: Path, render_manifest_file: Path, voice_manifest, scene_ids) -> bool:
+    if not render_manifest_file.exists():
+        return False
+    try:
+        render_manifest = load_render_manifest(render_manifest_file)
+        validate_render_manifest(render_manifest, voice_manifest=voice_manifest, project_dir=project_dir)
+    except (ValidationError, ValueError) as exc:
+        print(f"Existing render manifest is stale, re-rendering: {exc}", file=sys.stderr)
+        return False
+    return render_manifest.scene_order == scene_ids
+
+
+def render_project(
+    project_dir: Path,
+    *,
+    preconditions_path: str,
+    scene_manifest_path: str,
+    workers: int | None,
+    force: bool,
+) -> int:
+    preconditions_file = _resolve_with_project(project_dir, preconditions_path)
+    scene_manifest_file = _resolve_with_project(project_dir, scene_manifest_path)
+    render_manifest_file = render_manifest_path(project_dir)
+
+    missing = [str(path) for path in (preconditions_file, scene_manifest_file) if not path.exists()]
+    if missing:
+        print(f"Error: required manifest file(s) missing: {', '.join(missing)}", file=sys.stderr)
+        return int(HarnessExitCode.VALIDATION_ERROR)
+
+    voice_manifest = validate_render_preconditions(load_render_preconditions(preconditions_file), project_dir=project_dir)
+    scene_manifest = load_scene_manifest(scene_manifest_file)
+    scene_ids = [scene.scene_id for scene in scene_manifest.scenes]
+    profile = render_profile_from_env("final")
+    cache_keys = render_cache_keys(project_dir, scene_manifest, voice_manifest, profile=profile)
+
+    # A manifest without recorded cache keys cannot be tied to the current inputs, so it is
+    # rebuilt; unchanged scenes come straight from the render cache.
+    if (
+        not force
+        and load_render_keys(project_dir) == cache_keys
+        and _existing_manifest_is_current(project_dir, render_manifest_file, voice_manifest, scene_ids)
+    ):
+        print(json.dumps({"status": "skipped", "type": "render", "render_manifest": str(render_manifest_file)}))
+        return int(HarnessExitCode.SUCCESS)
+
+    rendered = render_scenes(
+        project_dir,
+        scene_manifest,
+        workers=workers,
+        cache=RenderCache.from_env(),
+        cache_keys=cache_keys,
+        refresh=force,
+        profile=profile,
+    )
+    render_manifest = build_render_manifest(
+        project_dir,
+        rendered,
+        voice_manifest,
+        run_id=ensure_run_context(project_dir),
+    )
+    validate_render_manifest(render_manifest, voice_manifest=voice_manifest, project_dir=project_dir)
+    write_render_manifest(project_dir, render_manifest)
+    write_render_keys(project_dir, cache_keys)
+
+    print(
+        json.dumps(
+            {
+                "status": "ok",
+                "type": "render",
+                "render_manifest": str(render_manifest_file),
+                "scene_count": len(rendered),
+                "cache_hits": sum(1 for scene in rendered if scene.cache_hit),
+                "total_video_seconds": round(sum(scene.duration_seconds for scene in rendered), 3),
+            }
+        )
+    )
+    return int(HarnessExitCode.SUCCESS)
+
+
+def render_draft(project_dir: Path, *, scene_manifest_path: str, workers: int | None, force: bool) -> int:
+    """
+    Runtime-gate pass: render every scene with the draft profile and check timing drift.
+
+    Crashed and drifted scenes are charged to their own scene ledger entries and
+    rewound to `built`, so the scene_qc retry re-runs QC for just those scenes. Their
+    draft outputs and cache entries are dropped, so the retry renders them afresh.
+    """
+    scene_manifest_file = _resolve_with_project(project_dir, scene_manifest_path)
+    if not scene_manifest_file.exists():
+        print(f"Error: scene manifest not found at '{scene_manifest_file}'", file=sys.stderr)
+        return int(HarnessExitCode.VALIDATION_ERROR)
+
+    scene_manifest = load_scene_manifest(scene_manifest_file)
+    profile = render_profile_from_env("draft")
+    cache = RenderCache.from_env()
+    cache_keys = render_cache_keys(project_dir, scene_manifest, profile=profile)
+    try:
+        rendered = render_scenes(
+            project_dir,
+            scene_manifest,
+            workers=workers,
+            cache=cache,
+            cache_keys=cache_keys,
+            refresh=force,
+            profile=profile,
+        )
+        render_failures = []
+    except RenderBatchError as exc:
+        # Scenes that did render still get their drift check, so crash and drift fail in one pass.
+        rendered = exc.rendered
+        render_failures = exc.failures
+    timings = draft_timings(scene_manifest, rendered)
+    report_file = write_draft_report(project_dir, profile, timings)
+
+    failed = draft_gate_failures(timings, render_failures)
+    for scene_id, message in failed.items():
+        print(f"Draft gate failed for {scene_id}: {message}", file=sys.stderr)
+    if failed:
+        invalidate_draft_renders(project_dir, list(failed), cache=cache, cache_keys=cache_keys, profile=profile)
+        record_batch_failure(
+            project_dir,
+            BatchResult(
+                phase="scene_qc",
+                outcomes=tuple(
+                    SceneOutcome(
+                        scene_id=scene.scene_id,
+                        exit_code=HarnessExitCode.VALIDATION_ERROR if scene.scene_id in failed else HarnessExitCode.SUCCESS,
+                        error_message=failed.get(scene.scene_id),
+                    )
+                    for scene in scene_manifest.scenes
+                ),
+            ),
+            rewind_to="built",
+        )
+    print(
+        json.dumps(
+            {
+                "status": "error" if failed else "ok",
+                "type": "draft_render",
+                "report": str(report_file),
+                "scene_count": len(rendered),
+                "failed_scenes": list(failed),
+            }
+        )
+    )
+    return int(HarnessExitCode.VALIDATION_ERROR if failed else HarnessExitCode.SUCCESS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render every manifest scene in parallel and write the render manifest.")
+    parser.add_argument("--project-dir", required=True)
+    parser.add_argument(
+        "--preconditions-path",
+        default="artifacts/render_preconditions.json",
+        help="Path to render preconditions manifest, relative to project-dir unless absolute",
+    )
+    parser.add_argument("--scene-manifest-path", default="artifacts/scene_manifest.json")
+    parser.add_argument(
+        "--profile",
+        choices=("final", "draft"),
+        default="final",
+        help="final renders feed the render manifest; draft is the low-res runtime-gate pass",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parallel render processes (default: WD_RENDER_WORKERS, else the CPU count)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every scene, bypassing the render manifest and the render cache",
+    )
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir)
+    if not project_dir.is_dir():
+        print(f"Error: project directory not found at '{project_dir}'", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+
+    try:
+        if args.profile == "draft":
+            sys.exit(
+                render_draft(
+                    project_dir,
+                    scene_manifest_path=args.scene_manifest_path,
+                    workers=args.workers,
+                    force=args.force,
+                )
+            )
+        sys.exit(
+            render_project(
+                project_dir,
+                preconditions_path=args.preconditions_path,
+                scene_manifest_path=args.scene_manifest_path,
+                workers=args.workers,
+                force=args.force,
+            )
+        )
+    except PermissionError as exc:
+        print(f"Policy Error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.POLICY_VIOLATION))
+    except ValidationError as exc:
+        print(f"Schema validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.SCHEMA_VIOLATION))
+    except RenderBatchError as exc:
+        print(f"Render error: {len(exc.failures)} scene(s) failed to render", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.VALIDATION_ERROR))
+    except ValueError as exc:
+        print(f"Contract validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.VALIDATION_ERROR))
+    except Exception as exc:
+        print(f"Unexpected render error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+
+
+if __name__ == "__main__":
+    main()
@@ -135,7 +135,7 @@ def print_scene_spec(project_dir: Path, manifest_path: Path, scene_id: str) -> i
     return int(HarnessExitCode.SUCCESS)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Runtime phase contract helpers for narration/build_scenes/scene_qc.")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -160,7 +160,7 @@ def main() -> None:
     spec_parser.add_argument("--manifest-path")
     spec_parser.add_argument("--scene-id", required=True)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     project_dir = Path(args.project_dir)
     if not project_dir.is_dir():
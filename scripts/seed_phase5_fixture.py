@@ -15,9 +15,15 @@ if str(SRC_DIR) not in sys.path:
 
 _media_pipeline = importlib.import_module("harness.contracts.media_pipeline")
 duration_tolerance_seconds = _media_pipeline.duration_tolerance_seconds
+load_voice_manifest = _media_pipeline.load_voice_manifest
+
+_render = importlib.import_module("harness.render")
+render_cache_keys = _render.render_cache_keys
+write_render_keys = _render.write_render_keys
 
 _runtime_pipeline = importlib.import_module("harness.contracts.runtime_pipeline")
 build_scene_manifest = _runtime_pipeline.build_scene_manifest
+load_scene_manifest = _runtime_pipeline.load_scene_manifest
 ensure_scene_scaffolds = _runtime_pipeline.ensure_scene_scaffolds
 write_narration_script = _runtime_pipeline.write_narration_script
 write_scene_manifest = _runtime_pipeline.write_scene_manifest
@@ -227,6 +233,15 @@ def _seed_media_artifacts(project_dir: Path) -> dict[str, str]:
         "scenes": render_scenes,
     }
     _write_json(project_dir / "artifacts" / "render_manifest.json", render_manifest)
+    # Record the cache keys the render manifest stands for, as a real final render does.
+    write_render_keys(
+        project_dir,
+        render_cache_keys(
+            project_dir,
+            load_scene_manifest(project_dir / "artifacts" / "scene_manifest.json"),
+            load_voice_manifest(project_dir / "artifacts" / "voice_manifest.json"),
+        ),
+    )
 
     tolerance = duration_tolerance_seconds(expected_duration)
     assembly_manifest = {
@@ -24,6 +24,8 @@ emit_phase_event = _observability.emit_phase_event
 append_event = _observability.append_event
 event_from_failure_context = _observability.event_from_failure_context
 export_blocked_trace_bundle = _observability.export_blocked_trace_bundle
+read_events = _observability.read_events
+summarize_usage_events = _observability.summarize_usage_events
 
 STATE_FILE_NAME = "project_state.json"
 
@@ -294,7 +296,19 @@ def log_event(
     return 0
 
 
-def main() -> None:
+def usage_report(project_dir: Path, run_id: Optional[str]) -> int:
+    """Print `phase_usage` totals per run and per phase from log/events.jsonl."""
+    try:
+        summary = summarize_usage_events(read_events(project_dir), run_id=run_id)
+    except Exception as exc:
+        print(f"Error: failed to build usage report: {exc}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(summary, indent=2, sort_keys=True))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Manages the project_state.json file.")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -349,7 +363,11 @@ def main() -> None:
     log_parser.add_argument("--next-action", help="Optional next-action recommendation.")
     log_parser.add_argument("--metadata-json", help="Optional JSON object metadata payload.")
 
-    args = parser.parse_args()
+    report_parser = subparsers.add_parser("report", help="Aggregate phase usage (tokens, latency, tools).")
+    report_parser.add_argument("--project-dir", required=True, help="The project directory.")
+    report_parser.add_argument("--run-id", help="Restrict the report to one run_id.")
+
+    args = parser.parse_args(argv)
 
     project_dir = Path(args.project_dir)
     if not project_dir.is_dir():
@@ -401,6 +419,9 @@ def main() -> None:
         )
         sys.exit(exit_code)
 
+    if args.command == "report":
+        sys.exit(usage_report(project_dir, args.run_id))
+
 
 if __name__ == "__main__":
     main()
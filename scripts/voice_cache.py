@@ -0,0 +1,156 @@
+#!/usr/bin/env python3.13
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+from pathlib import Path
+import sys
+
+from pydantic import ValidationError
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+HarnessExitCode = importlib.import_module("harness.exit_codes").HarnessExitCode
+
+_voice_precache = importlib.import_module("harness.voice_precache")
+VOICE_CACHE_MAX_AGE_ENV_VAR = _voice_precache.VOICE_CACHE_MAX_AGE_ENV_VAR
+VOICE_CACHE_MAX_BYTES_ENV_VAR = _voice_precache.VOICE_CACHE_MAX_BYTES_ENV_VAR
+optional_env_int = _voice_precache.optional_env_int
+live_voice_cache_keys = _voice_precache.live_voice_cache_keys
+voice_cache_dir = _voice_precache.voice_cache_dir
+
+VoiceCacheIndex = importlib.import_module("wet_donkey_voice.cache_index").VoiceCacheIndex
+
+
+def collect_garbage(
+    cache_dir: Path,
+    *,
+    projects_root: Path,
+    max_bytes: int | None,
+    max_age_seconds: int | None,
+    dry_run: bool,
+) -> int:
+    index = VoiceCacheIndex(cache_dir)
+    entries = index.entries()
+
+    candidates = {Path(project) for entry in entries.values() for project in entry.projects}
+    if projects_root.is_dir():
+        candidates.update(path for path in projects_root.iterdir() if path.is_dir())
+    protected, live_projects = live_voice_cache_keys(sorted(candidates))
+
+    # Without limits, gc drops everything no live voice manifest references.
+    if max_bytes is None and max_age_seconds is None:
+        max_bytes = 0
+    evicted = index.evict(max_bytes=max_bytes, max_age_seconds=max_age_seconds, protected=protected, dry_run=dry_run)
+    if not dry_run:
+        index.forget_projects(live_projects)
+
+    print(
+        json.dumps(
+            {
+                "status": "ok",
+                "type": "voice_cache_gc",
+                "cache_dir": str(cache_dir),
+                "dry_run": dry_run,
+                "live_projects": len(live_projects),
+                "protected_entries": len(protected & set(entries)),
+                "evicted_entries": len(evicted),
+                "freed_bytes": sum(entries[key].size_bytes for key in evicted),
+            }
+        )
+    )
+    return int(HarnessExitCode.SUCCESS)
+
+
+def migrate_layout(cache_dir: Path, *, dry_run: bool) -> int:
+    migrated = VoiceCacheIndex(cache_dir).migrate_flat_layout(dry_run=dry_run)
+    print(
+        json.dumps(
+            {
+                "status": "ok",
+                "type": "voice_cache_migrate",
+                "cache_dir": str(cache_dir),
+                "dry_run": dry_run,
+                "migrated_entries": len(migrated),
+            }
+        )
+    )
+    return int(HarnessExitCode.SUCCESS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the shared voice cache.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gc_parser = subparsers.add_parser(
+        "gc",
+        help="Evict voice cache entries no live voice manifest references, oldest first.",
+    )
+    gc_parser.add_argument("--cache-dir", default=None, help="Defaults to WD_VOICE_CACHE_DIR, else projects/voice_cache")
+    gc_parser.add_argument("--projects-root", default=str(ROOT_DIR / "projects"))
+    gc_parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=None,
+        help=f"Size bound for the cache (default: {VOICE_CACHE_MAX_BYTES_ENV_VAR})",
+    )
+    gc_parser.add_argument(
+        "--max-age-seconds",
+        type=int,
+        default=None,
+        help=f"Evict entries idle for longer than this (default: {VOICE_CACHE_MAX_AGE_ENV_VAR})",
+    )
+    gc_parser.add_argument("--dry-run", action="store_true", help="Report what would be evicted without deleting")
+
+    migrate_parser = subparsers.add_parser(
+        "migrate",
+        help="Move a flat <sha256>.<fmt> cache into the sharded ab/cd/<sha256>.<fmt> layout.",
+    )
+    migrate_parser.add_argument(
+        "--cache-dir", default=None, help="Defaults to WD_VOICE_CACHE_DIR, else projects/voice_cache"
+    )
+    migrate_parser.add_argument("--dry-run", action="store_true", help="Report what would be moved without moving")
+    args = parser.parse_args()
+
+    try:
+        cache_dir = Path(args.cache_dir) if args.cache_dir else voice_cache_dir()
+        if not cache_dir.is_dir():
+            print(f"Error: voice cache directory not found at '{cache_dir}'", file=sys.stderr)
+            sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+        if args.command == "migrate":
+            sys.exit(migrate_layout(cache_dir, dry_run=args.dry_run))
+        max_bytes = args.max_bytes if args.max_bytes is not None else optional_env_int(VOICE_CACHE_MAX_BYTES_ENV_VAR)
+        max_age = (
+            args.max_age_seconds
+            if args.max_age_seconds is not None
+            else optional_env_int(VOICE_CACHE_MAX_AGE_ENV_VAR)
+        )
+        sys.exit(
+            collect_garbage(
+                cache_dir,
+                projects_root=Path(args.projects_root),
+                max_bytes=max_bytes,
+                max_age_seconds=max_age,
+                dry_run=args.dry_run,
+            )
+        )
+    except PermissionError as exc:
+        print(f"Policy Error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.POLICY_VIOLATION))
+    except ValidationError as exc:
+        print(f"Schema validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.SCHEMA_VIOLATION))
+    except ValueError as exc:
+        print(f"Contract validation error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.VALIDATION_ERROR))
+    except Exception as exc:
+        print(f"Unexpected voice cache error: {exc}", file=sys.stderr)
+        sys.exit(int(HarnessExitCode.INFRASTRUCTURE_ERROR))
+
+
+if __name__ == "__main__":
+    main()
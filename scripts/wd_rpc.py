@@ -0,0 +1,89 @@
+#!/usr/bin/env python3.13
+"""
+Thin client for the harness daemon (`python -m harness.daemon`).
+
+Forwards one CLI invocation to the daemon over its Unix socket and replays the
+captured stdout/stderr and exit code. Only stdlib modules are imported so the
+client starts in milliseconds. When the daemon is unreachable the same command is
+executed directly, so callers never depend on the daemon being up.
+
+Usage:
+    wd_rpc.py [--socket PATH] <method> [args ...]
+
+Methods: update_project_state, runtime_phase_contracts, harness.cli
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+SOCKET_ENV_VAR = "WD_HARNESS_DAEMON_SOCKET"
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+DIRECT_COMMANDS = {
+    "update_project_state": [str(SCRIPT_DIR / "update_project_state.py")],
+    "runtime_phase_contracts": [str(SCRIPT_DIR / "runtime_phase_contracts.py")],
+    "harness.cli": ["-m", "harness.cli"],
+}
+
+
+def _call_daemon(socket_path: str, method: str, argv: list[str]) -> dict:
+    request = {
+        "jsonrpc": "2.0",
+        "id": os.getpid(),
+        "method": method,
+        "params": {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)},
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with conn.makefile("rb") as stream:
+            raw = stream.readline()
+    if not raw:
+        raise ConnectionError("harness daemon closed the connection without a response")
+    return json.loads(raw)
+
+
+def _run_direct(method: str, argv: list[str]) -> None:
+    command = [sys.executable, *DIRECT_COMMANDS[method], *argv]
+    sys.stdout.flush()
+    os.execv(sys.executable, command)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    socket_path = os.getenv(SOCKET_ENV_VAR, "")
+    if len(args) >= 2 and args[0] == "--socket":
+        socket_path = args[1]
+        args = args[2:]
+
+    if not args or args[0] not in DIRECT_COMMANDS:
+        print(f"Usage: wd_rpc.py [--socket PATH] {{{','.join(DIRECT_COMMANDS)}}} [args ...]", file=sys.stderr)
+        return 1
+    method, command_args = args[0], args[1:]
+
+    if not socket_path:
+        _run_direct(method, command_args)
+
+    try:
+        response = _call_daemon(socket_path, method, command_args)
+    except (OSError, ValueError) as exc:
+        print(f"[wd_rpc] harness daemon unavailable ({exc}); running {method} directly", file=sys.stderr)
+        _run_direct(method, command_args)
+
+    if "error" in response:
+        print(f"Harness daemon error: {response['error'].get('message')}", file=sys.stderr)
+        return 1
+
+    result = response["result"]
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    return int(result.get("exit_code", 1))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
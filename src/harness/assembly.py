@@ -0,0 +1,619 @@
+"""
+Final video assembly for the `assemble` phase.
+
+The assembler builds the final MP4 from validated `AssemblyInput` rows, in
+render-manifest scene order. When every scene video shares one codec profile
+(codec, resolution, frame rate, pixel format), no frame is re-encoded:
+
+- a worker pool (`WD_MUX_WORKERS`, default the CPU count) muxes each scene's video,
+  stream-copied, with its narration into a self-contained MP4. The narration is
+  encoded to AAC and padded with silence or trimmed to the video length, which
+  must be within `duration_tolerance_seconds` of the voice duration,
+- each muxed scene is stream-copied into an MPEG-TS segment,
+- the segments are spliced byte-for-byte into `artifacts/assembly/segments.ts`
+  (MPEG-TS concatenates at the byte level, like ffmpeg's `concat:` protocol),
+- the segment stream is remuxed to the final MP4 with `-c copy`.
+
+The segment index (per-input checksum, segment checksum, byte offset, byte length
+and duration) is kept in the `AssemblyManifest`. On reassembly only inputs whose
+checksum changed are muxed and get new segments; unchanged ones are copied from
+their recorded byte range of the previous segment stream, but only after that
+range's bytes still hash to the recorded segment checksum. `reuse_segments=False`
+(`--force`) rebuilds every segment. Every new segment's duration is re-verified
+against `duration_tolerance_seconds`.
+
+Only when the codec profiles differ does the assembler fall back to a single-pass
+re-encode. That pass normalizes every scene to the final render profile, fits each
+scene's narration to its own video length (padded with silence or trimmed), and
+joins the scenes with the concat filter, so audio and video stay in sync per scene.
+
+The output is written next to its final path and moved into place. Its probed
+duration becomes `AssemblyManifest.actual_duration_seconds`, and the manifest is
+only returned after `verify_final_output` passes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Callable
+
+from .contracts.media_pipeline import (
+    AssemblyInput,
+    AssemblyManifest,
+    AssemblySegment,
+    RenderManifest,
+    RenderProfile,
+    RenderSceneAsset,
+    VoiceManifest,
+    duration_tolerance_seconds,
+    load_assembly_manifest,
+    verify_final_output,
+)
+from .media_probe import (
+    DurationProbe,
+    VideoProfileProbe,
+    probe_duration_seconds,
+    probe_video_profile,
+    flush_shared_media_probe,
+    sha256_file,
+)
+
+FFMPEG_BIN_ENV_VAR = "WD_FFMPEG_BIN"
+DEFAULT_FFMPEG_BIN = "ffmpeg"
+
+ASSEMBLY_OUTPUT_PATH = "final_video.mp4"
+ASSEMBLY_WORK_DIR = "artifacts/assembly"
+SEGMENT_STREAM_PATH = f"{ASSEMBLY_WORK_DIR}/segments.ts"
+MUX_OUTPUT_DIR = f"{ASSEMBLY_WORK_DIR}/muxed"
+ASSEMBLY_LOG_PATH = "log/assembly.log"
+MUX_LOG_DIR = "log/assembly/mux"
+MUX_WORKERS_ENV_VAR = "WD_MUX_WORKERS"
+AUDIO_CODEC = "aac"
+AUDIO_BITRATE = "192k"
+REENCODE_CRF = "18"
+
+_DIAGNOSTIC_TAIL_LINES = 20
+
+FfmpegRunner = Callable[[list[str]], subprocess.CompletedProcess]
+
+
+class AssemblyError(RuntimeError):
+    """ffmpeg failed to assemble the final video; carries the reproduce command and log path."""
+
+    def __init__(self, reason: str, *, command: list[str] | None = None, log_path: Path | None = None) -> None:
+        self.reason = reason
+        self.command = command
+        self.log_path = log_path
+        details = [f"assembly failed: {reason}"]
+        if command:
+            details.append(f"reproduce with: {shlex.join(command)}")
+        if log_path is not None:
+            details.append(f"log: {log_path}")
+        super().__init__(" | ".join(details))
+
+
+@dataclass(frozen=True)
+class SceneMuxJob:
+    scene_id: str
+    video_path: Path
+    audio_path: Path
+    video_duration_seconds: float
+    audio_duration_seconds: float
+
+    @classmethod
+    def from_asset(cls, project_dir: Path, scene: RenderSceneAsset) -> SceneMuxJob:
+        return cls(
+            scene_id=scene.scene_id,
+            video_path=_resolve(project_dir, scene.video_path),
+            audio_path=_resolve(project_dir, scene.audio_path),
+            video_duration_seconds=scene.video_duration_seconds,
+            audio_duration_seconds=scene.audio_duration_seconds,
+        )
+
+
+@dataclass(frozen=True)
+class MuxedScene:
+    scene_id: str
+    path: Path
+    duration_seconds: float
+
+
+@dataclass(frozen=True)
+class AssemblyResult:
+    manifest: AssemblyManifest
+    stream_copy: bool
+    reused_scene_ids: tuple[str, ...] = ()
+
+
+def ffmpeg_bin() -> str:
+    return os.getenv(FFMPEG_BIN_ENV_VAR, "").strip() or DEFAULT_FFMPEG_BIN
+
+
+def run_ffmpeg(command: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(command, capture_output=True, text=True)
+
+
+def _resolve(project_dir: Path, raw_path: str) -> Path:
+    path = Path(raw_path)
+    return path if path.is_absolute() else project_dir / path
+
+
+def build_assembly_inputs(render_manifest: RenderManifest) -> list[AssemblyInput]:
+    return [
+        AssemblyInput(
+            scene_id=scene.scene_id,
+            video_path=scene.video_path,
+            audio_path=scene.audio_path,
+            duration_seconds=scene.video_duration_seconds,
+        )
+        for scene in render_manifest.scenes
+    ]
+
+
+def _audio_encode_args() -> list[str]:
+    return ["-c:a", AUDIO_CODEC, "-b:a", AUDIO_BITRATE]
+
+
+def mux_command(job: SceneMuxJob, output: Path) -> list[str]:
+    """Stream-copy the video; pad the narration with silence, then cut both to the video length."""
+    return [
+        ffmpeg_bin(),
+        "-hide_banner",
+        "-y",
+        "-i",
+        str(job.video_path),
+        "-i",
+        str(job.audio_path),
+        "-map",
+        "0:v:0",
+        "-map",
+        "1:a:0",
+        "-c:v",
+        "copy",
+        "-af",
+        "apad",
+        *_audio_encode_args(),
+        "-t",
+        f"{job.video_duration_seconds:.3f}",
+        "-movflags",
+        "+faststart",
+        str(output),
+    ]
+
+
+def segment_command(muxed: Path, output: Path) -> list[str]:
+    return [
+        ffmpeg_bin(),
+        "-hide_banner",
+        "-y",
+        "-i",
+        str(muxed),
+        "-map",
+        "0",
+        "-c",
+        "copy",
+        "-bsf:v",
+        "h264_mp4toannexb",
+        "-f",
+        "mpegts",
+        str(output),
+    ]
+
+
+def remux_command(segment_stream: Path, output: Path) -> list[str]:
+    return [
+        ffmpeg_bin(),
+        "-hide_banner",
+        "-y",
+        "-i",
+        str(segment_stream),
+        "-map",
+        "0",
+        "-c",
+        "copy",
+        "-bsf:a",
+        "aac_adtstoasc",
+        "-movflags",
+        "+faststart",
+        str(output),
+    ]
+
+
+def reencode_command(jobs: list[SceneMuxJob], output: Path, profile: RenderProfile) -> list[str]:
+    """
+    One re-encode pass: every scene's video is normalized to `profile` and its narration
+    padded with silence or trimmed to that scene's video length before the concat filter
+    joins them, so narration drift never carries over into later scenes.
+    """
+    inputs: list[str] = []
+    for job in jobs:
+        inputs += ["-i", str(job.video_path), "-i", str(job.audio_path)]
+    normalize = (
+        f"scale={profile.width}:{profile.height}:force_original_aspect_ratio=decrease,"
+        f"pad={profile.width}:{profile.height}:(ow-iw)/2:(oh-ih)/2,"
+        f"fps={profile.fps},format=yuv420p,setsar=1"
+    )
+    chains: list[str] = []
+    for index, job in enumerate(jobs):
+        duration = f"{job.video_duration_seconds:.3f}"
+        chains.append(f"[{2 * index}:v]{normalize},trim=duration={duration},setpts=PTS-STARTPTS[v{index}]")
+        chains.append(
+            f"[{2 * index + 1}:a]aresample=48000,aformat=channel_layouts=stereo,"
+            f"apad,atrim=duration={duration},asetpts=PTS-STARTPTS[a{index}]"
+        )
+    joined = "".join(f"[v{index}][a{index}]" for index in range(len(jobs)))
+    filter_graph = ";".join(chains + [f"{joined}concat=n={len(jobs)}:v=1:a=1[vout][aout]"])
+    return [
+        ffmpeg_bin(),
+        "-hide_banner",
+        "-y",
+        *inputs,
+        "-filter_complex",
+        filter_graph,
+        "-map",
+        "[vout]",
+        "-map",
+        "[aout]",
+        "-c:v",
+        profile.codec,
+        "-crf",
+        REENCODE_CRF,
+        "-pix_fmt",
+        "yuv420p",
+        *_audio_encode_args(),
+        "-movflags",
+        "+faststart",
+        str(output),
+    ]
+
+
+def input_checksum(project_dir: Path, item: AssemblyInput) -> str:
+    """SHA-256 over the scene's video and audio checksums."""
+    video = sha256_file(_resolve(project_dir, item.video_path))
+    audio = sha256_file(_resolve(project_dir, item.audio_path))
+    return hashlib.sha256(f"{video}:{audio}".encode("ascii")).hexdigest()
+
+
+def _write_assembly_log(log_path: Path, command: list[str], result: subprocess.CompletedProcess) -> None:
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(
+            f"$ {shlex.join(command)}\n"
+            f"exit code: {result.returncode}\n"
+            f"--- stdout ---\n{result.stdout or ''}\n"
+            f"--- stderr ---\n{result.stderr or ''}\n"
+        )
+
+
+def _run_checked(runner: FfmpegRunner, command: list[str], output: Path, log_path: Path) -> None:
+    result = runner(command)
+    _write_assembly_log(log_path, command, result)
+    if result.returncode != 0:
+        lines = [line for line in (result.stderr or "").splitlines() if line.strip()]
+        tail = "\n".join(lines[-_DIAGNOSTIC_TAIL_LINES:])
+        reason = f"ffmpeg exited with code {result.returncode}" + (f":\n{tail}" if tail else "")
+        raise AssemblyError(reason, command=command, log_path=log_path)
+    if not output.exists():
+        raise AssemblyError(f"ffmpeg reported success but wrote no {output}", command=command, log_path=log_path)
+
+
+def _range_sha256(source, offset: int, length: int) -> str | None:
+    digest = hashlib.sha256()
+    source.seek(offset)
+    remaining = length
+    while remaining:
+        block = source.read(min(remaining, 1024 * 1024))
+        if not block:
+            return None
+        digest.update(block)
+        remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _previous_segment_index(project_dir: Path, manifest_path: Path) -> dict[str, AssemblySegment]:
+    """Segments of the last assembly whose byte range in the segment stream still matches its checksum."""
+    if not manifest_path.exists():
+        return {}
+    try:
+        previous = load_assembly_manifest(manifest_path)
+    except (OSError, ValueError):
+        return {}
+    if not previous.segments or previous.segment_stream_path is None:
+        return {}
+    stream = _resolve(project_dir, previous.segment_stream_path)
+    if not stream.exists():
+        return {}
+    intact: dict[str, AssemblySegment] = {}
+    with stream.open("rb") as source:
+        for segment in previous.segments:
+            if _range_sha256(source, segment.byte_offset, segment.byte_length) == segment.segment_sha256:
+                intact[segment.scene_id] = segment
+            else:
+                print(f"segment for scene '{segment.scene_id}' no longer matches its checksum; rebuilding it")
+    return intact
+
+
+def _copy_range(source, destination, offset: int, length: int) -> None:
+    source.seek(offset)
+    remaining = length
+    while remaining:
+        block = source.read(min(remaining, 1024 * 1024))
+        if not block:
+            raise AssemblyError(f"segment stream ended {remaining} byte(s) early at offset {offset}")
+        destination.write(block)
+        remaining -= len(block)
+
+
+def mux_worker_count(requested: int | None = None) -> int:
+    """Explicit request, else `WD_MUX_WORKERS`, else the number of CPU cores."""
+    if requested is not None:
+        if requested < 1:
+            raise ValueError(f"mux workers must be >= 1, got {requested}")
+        return requested
+
+    raw = os.getenv(MUX_WORKERS_ENV_VAR, "").strip()
+    if not raw:
+        return max(1, os.cpu_count() or 1)
+    try:
+        workers = int(raw)
+    except ValueError as exc:
+        raise PermissionError(f"{MUX_WORKERS_ENV_VAR} must be an integer: {raw!r}") from exc
+    if workers < 1:
+        raise PermissionError(f"{MUX_WORKERS_ENV_VAR} must be >= 1, got {workers}")
+    return workers
+
+
+def _check_duration(label: str, actual: float, expected: float) -> None:
+    tolerance = duration_tolerance_seconds(expected)
+    if abs(actual - expected) > tolerance:
+        raise ValueError(
+            f"{label} is outside tolerance "
+            f"(actual={actual:.3f}s, expected={expected:.3f}s, tolerance={tolerance:.3f}s)"
+        )
+
+
+def check_narration_drift(jobs: list[SceneMuxJob]) -> None:
+    """Reject scenes whose video and narration durations differ beyond tolerance."""
+    for job in jobs:
+        _check_duration(
+            f"video duration for scene '{job.scene_id}' against its narration",
+            job.video_duration_seconds,
+            job.audio_duration_seconds,
+        )
+
+
+def mux_scene(project_dir: Path, job: SceneMuxJob, *, runner: FfmpegRunner, probe: DurationProbe) -> MuxedScene:
+    output = project_dir / MUX_OUTPUT_DIR / f"{job.scene_id}.mp4"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    log_path = project_dir / MUX_LOG_DIR / f"{job.scene_id}.log"
+    log_path.unlink(missing_ok=True)
+    _run_checked(runner, mux_command(job, output), output, log_path)
+    duration = probe(output)
+    _check_duration(f"muxed duration for scene '{job.scene_id}'", duration, job.video_duration_seconds)
+    return MuxedScene(scene_id=job.scene_id, path=output, duration_seconds=duration)
+
+
+def mux_scenes(
+    project_dir: Path,
+    jobs: list[SceneMuxJob],
+    *,
+    workers: int | None = None,
+    runner: FfmpegRunner = run_ffmpeg,
+    probe: DurationProbe = probe_duration_seconds,
+) -> dict[str, MuxedScene]:
+    """
+    Mux every job on a worker pool, keyed by scene id.
+
+    Video/voice drift beyond tolerance is rejected before any ffmpeg runs. A failing
+    scene does not stop the others; once the pool drains, all failures are raised
+    together.
+    """
+    if not jobs:
+        return {}
+    check_narration_drift(jobs)
+
+    max_workers = min(mux_worker_count(workers), len(jobs))
+    print(f"muxing {len(jobs)} scene(s) with {max_workers} worker(s)")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wd-mux") as executor:
+        futures = [executor.submit(mux_scene, project_dir, job, runner=runner, probe=probe) for job in jobs]
+
+    muxed: dict[str, MuxedScene] = {}
+    failures: dict[str, Exception] = {}
+    for job, future in zip(jobs, futures):
+        try:
+            muxed[job.scene_id] = future.result()
+        except (AssemblyError, ValueError) as exc:
+            print(str(exc), file=sys.stderr)
+            failures[job.scene_id] = exc
+    if failures:
+        summary = f"{len(failures)} scene mux(es) failed: {', '.join(failures)}"
+        # ffmpeg failures are infrastructure errors; only pure duration failures are validation errors.
+        ffmpeg_failures = [exc for exc in failures.values() if isinstance(exc, AssemblyError)]
+        if ffmpeg_failures:
+            first = ffmpeg_failures[0]
+            raise AssemblyError(summary, command=first.command, log_path=first.log_path)
+        raise ValueError(summary)
+    return muxed
+
+
+def splice_segment_stream(
+    project_dir: Path,
+    inputs: list[AssemblyInput],
+    *,
+    checksums: dict[str, str],
+    previous_index: dict[str, AssemblySegment],
+    muxed: dict[str, MuxedScene],
+    runner: FfmpegRunner,
+    probe: DurationProbe,
+    log_path: Path,
+) -> tuple[list[AssemblySegment], tuple[str, ...]]:
+    """
+    Rebuild the segment stream from the muxed scenes and the reused byte ranges.
+
+    Returns the new segment index and the scene ids whose segments were reused.
+    """
+    stream_path = project_dir / SEGMENT_STREAM_PATH
+    segments_dir = stream_path.parent / "segments"
+    segments_dir.mkdir(parents=True, exist_ok=True)
+
+    fresh: dict[str, tuple[Path, float]] = {}
+    for item in inputs:
+        if item.scene_id not in muxed:
+            continue
+        segment_path = segments_dir / f"{item.scene_id}.ts"
+        _run_checked(runner, segment_command(muxed[item.scene_id].path, segment_path), segment_path, log_path)
+        duration = probe(segment_path)
+        _check_duration(f"segment duration for scene '{item.scene_id}'", duration, item.duration_seconds)
+        fresh[item.scene_id] = (segment_path, duration)
+
+    index: list[AssemblySegment] = []
+    reused: list[str] = []
+    staging = stream_path.with_name(f".{stream_path.name}.partial")
+    offset = 0
+    old_stream = stream_path.open("rb") if stream_path.exists() and previous_index else None
+    try:
+        with staging.open("wb") as destination:
+            for item in inputs:
+                if item.scene_id in fresh:
+                    segment_path, duration = fresh[item.scene_id]
+                    with segment_path.open("rb") as source:
+                        shutil.copyfileobj(source, destination, 1024 * 1024)
+                    length = segment_path.stat().st_size
+                    segment_sha256 = sha256_file(segment_path)
+                else:
+                    previous = previous_index[item.scene_id]
+                    _copy_range(old_stream, destination, previous.byte_offset, previous.byte_length)
+                    length, duration = previous.byte_length, previous.duration_seconds
+                    segment_sha256 = previous.segment_sha256
+                    reused.append(item.scene_id)
+                index.append(
+                    AssemblySegment(
+                        scene_id=item.scene_id,
+                        input_sha256=checksums[item.scene_id],
+                        segment_sha256=segment_sha256,
+                        byte_offset=offset,
+                        byte_length=length,
+                        duration_seconds=duration,
+                    )
+                )
+                offset += length
+    finally:
+        if old_stream is not None:
+            old_stream.close()
+    os.replace(staging, stream_path)
+
+    # The spliced stream is the segment store; per-scene files are only staging.
+    for segment_path, _ in fresh.values():
+        segment_path.unlink(missing_ok=True)
+    for scene in muxed.values():
+        scene.path.unlink(missing_ok=True)
+    return index, tuple(reused)
+
+
+def _probe_and_flush(probe: DurationProbe, path: Path) -> float:
+    try:
+        return probe(path)
+    finally:
+        flush_shared_media_probe()
+
+
+def assemble_video(
+    project_dir: Path,
+    render_manifest: RenderManifest,
+    *,
+    profile: RenderProfile,
+    voice_manifest: VoiceManifest | None = None,
+    output_path: str = ASSEMBLY_OUTPUT_PATH,
+    runner: FfmpegRunner = run_ffmpeg,
+    probe: DurationProbe = probe_duration_seconds,
+    profile_probe: VideoProfileProbe = probe_video_profile,
+    reuse_segments: bool = True,
+    workers: int | None = None,
+) -> AssemblyResult:
+    """
+    Assemble the final video and return its verified manifest.
+
+    Raises `AssemblyError` when ffmpeg fails and ValueError when verification fails.
+    """
+    inputs = build_assembly_inputs(render_manifest)
+    output = _resolve(project_dir, output_path)
+    staging = output.with_name(f".{output.stem}.partial{output.suffix}")
+    log_path = project_dir / ASSEMBLY_LOG_PATH
+    log_path.unlink(missing_ok=True)
+
+    videos = [_resolve(project_dir, item.video_path) for item in inputs]
+    stream_copy = len({profile_probe(video) for video in videos}) == 1
+    segments: list[AssemblySegment] = []
+    reused: tuple[str, ...] = ()
+    if stream_copy:
+        previous_index = (
+            _previous_segment_index(project_dir, assembly_manifest_path(project_dir)) if reuse_segments else {}
+        )
+        checksums = {item.scene_id: input_checksum(project_dir, item) for item in inputs}
+        jobs = [
+            SceneMuxJob.from_asset(project_dir, scene)
+            for scene in render_manifest.scenes
+            if scene.scene_id not in previous_index
+            or previous_index[scene.scene_id].input_sha256 != checksums[scene.scene_id]
+        ]
+        muxed = mux_scenes(project_dir, jobs, workers=workers, runner=runner, probe=probe)
+        segments, reused = splice_segment_stream(
+            project_dir,
+            inputs,
+            checksums=checksums,
+            previous_index=previous_index,
+            muxed=muxed,
+            runner=runner,
+            probe=probe,
+            log_path=log_path,
+        )
+        command = remux_command(project_dir / SEGMENT_STREAM_PATH, staging)
+    else:
+        jobs = [SceneMuxJob.from_asset(project_dir, scene) for scene in render_manifest.scenes]
+        check_narration_drift(jobs)
+        command = reencode_command(jobs, staging, profile)
+    _run_checked(runner, command, staging, log_path)
+    os.replace(staging, output)
+
+    expected = sum(item.duration_seconds for item in inputs)
+    degraded = any(asset.degraded for asset in voice_manifest.assets) if voice_manifest is not None else False
+    manifest = AssemblyManifest(
+        run_id=render_manifest.run_id,
+        output_path=output_path,
+        scene_order=[item.scene_id for item in inputs],
+        inputs=inputs,
+        expected_duration_seconds=expected,
+        actual_duration_seconds=_probe_and_flush(probe, output),
+        duration_tolerance_seconds=duration_tolerance_seconds(expected),
+        degraded=degraded,
+        segment_stream_path=SEGMENT_STREAM_PATH if segments else None,
+        segments=segments,
+    )
+    verify_final_output(manifest, project_dir=project_dir)
+    mode = f"segment splice ({len(reused)} reused)" if stream_copy else "re-encode"
+    print(f"assembled {len(inputs)} scene(s) into {output} via {mode} ({manifest.actual_duration_seconds:.2f}s)")
+    return AssemblyResult(manifest=manifest, stream_copy=stream_copy, reused_scene_ids=reused)
+
+
+def assembly_manifest_path(project_dir: Path) -> Path:
+    return project_dir / "artifacts" / "assembly_manifest.json"
+
+
+def write_assembly_manifest(project_dir: Path, manifest: AssemblyManifest) -> Path:
+    path = assembly_manifest_path(project_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+        tmp.write(json.dumps(manifest.model_dump(mode="json"), indent=2))
+        tmp_path = Path(tmp.name)
+    tmp_path.replace(path)
+    return path
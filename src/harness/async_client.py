@@ -0,0 +1,102 @@
+# harness/async_client.py
+"""asyncio versions of the harness phase calls, built on `AsyncPipelineTrainingSession`."""
+
+from __future__ import annotations
+
+import time
+
+from .client import (
+    PhaseResponseCache,
+    complete_phase_call,
+    narration_prompts,
+    open_phase_chat,
+    plan_prompts,
+    repair_prompts,
+    replay_cached_phase,
+    scene_prompts,
+    scene_qc_prompts,
+)
+from .rate_limit import get_rate_limiter
+from .schemas.narration import Narration
+from .schemas.plan import Plan
+from .schemas.scene_build import SceneBuild
+from .schemas.scene_qc import SceneQC
+from .session import AsyncPipelineTrainingSession
+
+
+async def _sample_phase(
+    session: AsyncPipelineTrainingSession,
+    phase: str,
+    prompts: dict,
+    *,
+    bypass_cache: bool = False,
+):
+    cached = PhaseResponseCache.for_call(session, phase, prompts)
+    if cached is not None and not bypass_cache:
+        payload = replay_cached_phase(session, phase, cached)
+        if payload is not None:
+            return payload
+
+    chat = open_phase_chat(session, phase, prompts)
+    started = time.perf_counter()
+    response = await get_rate_limiter().call_async(chat.sample, label=phase)
+    return complete_phase_call(session, phase, response, started, cached)
+
+
+async def generate_plan(
+    session: AsyncPipelineTrainingSession,
+    topic: str,
+    retry_context: str | None = None,
+) -> Plan:
+    """Generate structured plan with API-enforced schema."""
+    return await _sample_phase(
+        session,
+        "plan",
+        plan_prompts(topic, retry_context),
+        bypass_cache=retry_context is not None,
+    )
+
+
+async def generate_narration(session: AsyncPipelineTrainingSession, plan: Plan) -> Narration:
+    """Generate narration script for all plan scenes."""
+    return await _sample_phase(session, "narration", narration_prompts(plan))
+
+
+async def generate_scene(
+    session: AsyncPipelineTrainingSession,
+    scene_spec: dict,
+    retry_context: str | None = None,
+) -> SceneBuild:
+    """Generate the Manim code for a single scene."""
+    return await _sample_phase(
+        session,
+        "build_scenes",
+        scene_prompts(scene_spec, retry_context),
+        bypass_cache=retry_context is not None,
+    )
+
+
+async def run_scene_qc(
+    session: AsyncPipelineTrainingSession,
+    scene_file: str,
+    *,
+    bypass_cache: bool = False,
+) -> SceneQC:
+    """Run scene quality checks and return structured QC result; `bypass_cache` forces a fresh verdict."""
+    return await _sample_phase(session, "scene_qc", scene_qc_prompts(scene_file), bypass_cache=bypass_cache)
+
+
+async def repair_scene(
+    session: AsyncPipelineTrainingSession,
+    scene_file: str,
+    failure_reason: str,
+    *,
+    bypass_cache: bool = True,
+) -> SceneBuild:
+    """Attempt to repair a scene that failed validation; cache reads are skipped by default."""
+    return await _sample_phase(
+        session,
+        "scene_repair",
+        repair_prompts(scene_file, failure_reason),
+        bypass_cache=bypass_cache,
+    )
@@ -0,0 +1,464 @@
+"""Bounded-concurrency batch runners for scene-scoped harness phases."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from pydantic import ValidationError
+
+from .build_fingerprint import record_build_fingerprint, scene_build_fingerprint, scene_build_is_current
+from .client import generate_scene, run_scene_qc
+from .contracts.observability import append_event, event_from_failure_context, export_blocked_trace_bundle
+from .contracts.prompt_manifest import PromptContractError
+from .contracts.runtime_pipeline import (
+    SceneManifest,
+    SceneManifestEntry,
+    build_scene_spec,
+    load_scene_manifest,
+    scene_manifest_path,
+    scene_qc_report_errors,
+    write_scene_qc_report,
+)
+from .contracts.scaffold import ScaffoldContractError, inject_scene_body_file
+from .contracts.state import (
+    ProjectState,
+    SceneStage,
+    advance_scene_stage,
+    blocked_scene_ids,
+    get_scene_ledger,
+    load_state,
+    record_phase_failure,
+    record_scene_failure,
+    reset_scene_ledger,
+    save_state_atomic,
+    scene_stage_reached,
+)
+from .exit_codes import BUDGET_EXEMPT_EXIT_CODES, HarnessExitCode, get_exit_code_policy
+from .parser import SchemaContractError, SemanticValidationError
+from .rate_limit import ThrottledError
+from .session import PipelineTrainingSession, SessionContractError
+
+DEFAULT_SCENE_CONCURRENCY = 4
+SCENE_CONCURRENCY_ENV_VAR = "WD_SCENE_CONCURRENCY"
+BATCH_SCOPE = "*"
+
+# Serializes project_state.json read-modify-write cycles between the threads of one
+# harness process (batch result handlers, pipelined scene chains, narration progress).
+STATE_WRITE_LOCK = threading.RLock()
+
+
+@dataclass(frozen=True)
+class SceneOutcome:
+    scene_id: str
+    exit_code: HarnessExitCode
+    error_message: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.exit_code is HarnessExitCode.SUCCESS
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    phase: str
+    outcomes: tuple[SceneOutcome, ...]
+
+    @property
+    def failures(self) -> list[SceneOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.succeeded]
+
+    @property
+    def exit_code(self) -> HarnessExitCode:
+        """
+        Most severe failure code: non-retryable failures first, then highest code.
+
+        Budget-exempt failures (throttling) only decide the code when no scene failed
+        for any other reason, so real failures still consume a retry attempt.
+        """
+        failures = self.failures
+        if not failures:
+            return HarnessExitCode.SUCCESS
+        counted = [outcome for outcome in failures if outcome.exit_code not in BUDGET_EXEMPT_EXIT_CODES]
+        failures = counted or failures
+
+        def severity(outcome: SceneOutcome) -> tuple[bool, int]:
+            policy = get_exit_code_policy(outcome.exit_code, phase=self.phase)
+            return (not policy.retryable, int(outcome.exit_code))
+
+        return max(failures, key=severity).exit_code
+
+
+def exit_code_for_exception(exc: BaseException) -> HarnessExitCode:
+    """Map a harness exception to its canonical exit code (mirrors `harness.cli.main`)."""
+    if isinstance(exc, (SemanticValidationError, ScaffoldContractError)):
+        return HarnessExitCode.VALIDATION_ERROR
+    if isinstance(
+        exc,
+        (ValidationError, json.JSONDecodeError, SessionContractError, SchemaContractError, PromptContractError),
+    ):
+        return HarnessExitCode.SCHEMA_VIOLATION
+    if isinstance(exc, PermissionError):
+        return HarnessExitCode.POLICY_VIOLATION
+    if isinstance(exc, ThrottledError):
+        return HarnessExitCode.THROTTLED
+    return HarnessExitCode.INFRASTRUCTURE_ERROR
+
+
+def resolve_scene_concurrency(value: int | None = None) -> int:
+    if value is None:
+        raw = os.getenv(SCENE_CONCURRENCY_ENV_VAR, "").strip()
+        if not raw:
+            return DEFAULT_SCENE_CONCURRENCY
+        try:
+            value = int(raw)
+        except ValueError as exc:
+            raise PermissionError(f"{SCENE_CONCURRENCY_ENV_VAR} must be an integer: {raw!r}") from exc
+
+    if value < 1:
+        raise PermissionError(f"scene concurrency must be >= 1, got {value}")
+    return value
+
+
+def load_batch_manifest(project_dir: Path) -> SceneManifest:
+    manifest_file = scene_manifest_path(project_dir)
+    if not manifest_file.exists():
+        raise PermissionError(f"scene manifest not found: {manifest_file} (narration phase must run first)")
+    return load_scene_manifest(manifest_file)
+
+
+def artifact_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def record_scene_stage(
+    project_dir: Path,
+    scene_id: str,
+    stage: SceneStage,
+    *,
+    artifacts: dict[str, Path] | None = None,
+    rewind: bool = False,
+) -> None:
+    """
+    Advance one scene in the `scene_ledger` of project_state.json (no-op without a state file).
+
+    `artifacts` maps artifact names (e.g. `scene_file`) to the files this stage produced;
+    their SHA-256 hashes are stored on the ledger entry.
+    """
+    state_file = project_dir / "project_state.json"
+    hashes = {name: artifact_sha256(path) for name, path in (artifacts or {}).items()}
+    with STATE_WRITE_LOCK:
+        if not state_file.exists():
+            return
+        state = load_state(state_file)
+        updated = advance_scene_stage(state, scene_id, stage, artifact_hashes=hashes, rewind=rewind)
+        if updated is not state:
+            save_state_atomic(state_file, updated)
+
+
+def _apply_scene_failures(
+    state: ProjectState,
+    result: BatchResult,
+    *,
+    rewind_to: SceneStage | None = None,
+) -> ProjectState:
+    """Charge each failed scene of `result` to its own ledger entry (throttled scenes excepted)."""
+    for outcome in result.failures:
+        if outcome.scene_id == BATCH_SCOPE or outcome.exit_code in BUDGET_EXEMPT_EXIT_CODES:
+            continue
+        policy = get_exit_code_policy(outcome.exit_code, phase=result.phase)
+        state = record_scene_failure(
+            state,
+            outcome.scene_id,
+            phase=result.phase,
+            error_code=policy.machine_error_code,
+            error_message=outcome.error_message or "no diagnostic",
+            gate=policy.gate,
+            retryable=policy.retryable,
+            attempt_delta=os.getenv("WD_RETRY_DELTA") or None,
+            evidence_token=os.getenv("WD_RETRY_EVIDENCE_TOKEN") or None,
+            force_block=not policy.retryable,
+            rewind_to=rewind_to,
+        )
+    return state
+
+
+def record_scene_failures(project_dir: Path, result: BatchResult) -> list[str]:
+    """
+    Record scene-level failures in the scene ledger without touching the phase failure state.
+
+    Used for scene work that runs ahead of its phase (pipelined narration).
+    Returns the IDs of scenes that are blocked afterwards.
+    """
+    state_file = project_dir / "project_state.json"
+    with STATE_WRITE_LOCK:
+        if not state_file.exists():
+            return []
+        state = _apply_scene_failures(load_state(state_file), result)
+        save_state_atomic(state_file, state)
+    return blocked_scene_ids(state)
+
+
+def clear_scene_ledger(project_dir: Path) -> None:
+    """Drop every per-scene stage, e.g. when narration (and so every scene input) is regenerated."""
+    state_file = project_dir / "project_state.json"
+    with STATE_WRITE_LOCK:
+        if not state_file.exists():
+            return
+        state = load_state(state_file)
+        updated = reset_scene_ledger(state)
+        if updated is not state:
+            save_state_atomic(state_file, updated)
+
+
+def completed_scene_ids(project_dir: Path, manifest: SceneManifest, stage: SceneStage) -> set[str]:
+    """Manifest scenes whose ledger entry already reached `stage`."""
+    state_file = project_dir / "project_state.json"
+    if not state_file.exists():
+        return set()
+    state = load_state(state_file)
+    return {scene.scene_id for scene in manifest.scenes if scene_stage_reached(state, scene.scene_id, stage)}
+
+
+def retried_scene_ids(project_dir: Path, manifest: SceneManifest) -> set[str]:
+    """Manifest scenes whose ledger entry records a failed attempt since its last completed stage."""
+    state_file = project_dir / "project_state.json"
+    if not state_file.exists():
+        return set()
+    ledger = get_scene_ledger(load_state(state_file))
+    return {scene.scene_id for scene in manifest.scenes if scene.scene_id in ledger and ledger[scene.scene_id].attempts}
+
+
+def _failure_outcome(scene_id: str, exc: BaseException) -> SceneOutcome:
+    return SceneOutcome(
+        scene_id=scene_id,
+        exit_code=exit_code_for_exception(exc),
+        error_message=f"{type(exc).__name__}: {exc}",
+    )
+
+
+def _run_scene_pool(
+    phase: str,
+    manifest: SceneManifest,
+    *,
+    max_concurrency: int,
+    call: Callable[[SceneManifestEntry], Any],
+    on_result: Callable[[SceneManifestEntry, Any], None],
+    completed: frozenset[str] | set[str] = frozenset(),
+) -> list[SceneOutcome]:
+    """
+    Fan `call` out over every manifest scene and hand each result to `on_result` as it lands.
+
+    `on_result` runs on the calling thread, so artifact writes are never concurrent.
+    A failing scene is recorded as an outcome without cancelling the remaining scenes.
+    Scenes in `completed` (already up to date for this phase) succeed without a call.
+    """
+    entries: dict[str, SceneManifestEntry] = {scene.scene_id: scene for scene in manifest.scenes}
+    outcomes: dict[str, SceneOutcome] = {}
+    for scene_id in entries:
+        if scene_id in completed:
+            outcomes[scene_id] = SceneOutcome(scene_id=scene_id, exit_code=HarnessExitCode.SUCCESS)
+            print(f"{phase} skipped for {scene_id}: already up to date")
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"wd-{phase}") as executor:
+        futures = {
+            executor.submit(call, entry): scene_id
+            for scene_id, entry in entries.items()
+            if scene_id not in outcomes
+        }
+        for future in as_completed(futures):
+            scene_id = futures[future]
+            try:
+                on_result(entries[scene_id], future.result())
+            except Exception as exc:
+                outcomes[scene_id] = _failure_outcome(scene_id, exc)
+                print(f"{phase} failed for {scene_id}: {exc}")
+                continue
+            outcomes[scene_id] = SceneOutcome(scene_id=scene_id, exit_code=HarnessExitCode.SUCCESS)
+
+    return [outcomes[scene_id] for scene_id in entries]
+
+
+def build_scenes_batch(
+    session: PipelineTrainingSession,
+    project_dir: Path,
+    manifest: SceneManifest,
+    *,
+    max_concurrency: int = DEFAULT_SCENE_CONCURRENCY,
+    retry_context: str | None = None,
+    force: bool = False,
+) -> BatchResult:
+    """
+    Run `generate_scene` for every manifest scene, injecting each body as its build completes.
+
+    Scenes whose build fingerprint is unchanged and whose slot body is populated are
+    skipped unless `force` is set.
+    """
+    specs = {entry.scene_id: build_scene_spec(entry) for entry in manifest.scenes}
+    fingerprints = {scene_id: scene_build_fingerprint(spec) for scene_id, spec in specs.items()}
+
+    current: set[str] = set()
+    if not force:
+        for entry in manifest.scenes:
+            scene_file = project_dir / entry.scene_file
+            if scene_build_is_current(project_dir, entry.scene_id, scene_file, fingerprints[entry.scene_id]):
+                current.add(entry.scene_id)
+                record_scene_stage(project_dir, entry.scene_id, "built", artifacts={"scene_file": scene_file})
+
+    def inject(entry: SceneManifestEntry, scene_build) -> None:
+        scene_file = project_dir / entry.scene_file
+        inject_scene_body_file(scene_file, scene_build.scene_body)
+        print(f"Scene body injected into {scene_file}")
+        record_build_fingerprint(project_dir, entry.scene_id, fingerprints[entry.scene_id])
+        record_scene_stage(project_dir, entry.scene_id, "built", artifacts={"scene_file": scene_file}, rewind=True)
+
+    outcomes = _run_scene_pool(
+        "build_scenes",
+        manifest,
+        max_concurrency=max_concurrency,
+        call=lambda entry: generate_scene(session, specs[entry.scene_id], retry_context),
+        on_result=inject,
+        completed=current,
+    )
+    return BatchResult(phase="build_scenes", outcomes=tuple(outcomes))
+
+
+def require_scene_qc_pass(project_dir: Path, entry: SceneManifestEntry, *, min_score: float) -> None:
+    """Raise `SemanticValidationError` unless the scene's written QC report clears the gate."""
+    errors = scene_qc_report_errors(project_dir, entry, min_score=min_score)
+    if errors:
+        raise SemanticValidationError("scene QC contract validation failed: " + "; ".join(errors))
+
+
+def scene_qc_batch(
+    session: PipelineTrainingSession,
+    project_dir: Path,
+    manifest: SceneManifest,
+    *,
+    max_concurrency: int = DEFAULT_SCENE_CONCURRENCY,
+    min_score: float = 0.7,
+) -> BatchResult:
+    """
+    Run `run_scene_qc` for every manifest scene, writing each report as it lands.
+
+    Each report is checked against the QC contract as it is written; a scene that
+    fails the pass flag or `min_score` is a validation failure of that scene, so the
+    ledger charges the attempt to the scene rather than to the batch. Scenes skipped
+    as already passed are re-checked against their report on disk.
+    """
+
+    def write_report(entry: SceneManifestEntry, qc_result) -> None:
+        report_path = write_scene_qc_report(project_dir, entry, qc_result)
+        print(f"Scene QC report written to {report_path}")
+        require_scene_qc_pass(project_dir, entry, min_score=min_score)
+        record_scene_stage(project_dir, entry.scene_id, "qc_passed", artifacts={"qc_report": report_path})
+
+    # Scenes with a failed attempt on record get a fresh verdict, not a cached replay of the old one.
+    retried = retried_scene_ids(project_dir, manifest)
+    completed = completed_scene_ids(project_dir, manifest, "qc_passed")
+    outcomes = _run_scene_pool(
+        "scene_qc",
+        manifest,
+        max_concurrency=max_concurrency,
+        call=lambda entry: run_scene_qc(
+            session,
+            str(project_dir / entry.scene_file),
+            bypass_cache=entry.scene_id in retried,
+        ),
+        on_result=write_report,
+        completed=completed,
+    )
+
+    entries = {entry.scene_id: entry for entry in manifest.scenes}
+    for index, outcome in enumerate(outcomes):
+        if outcome.scene_id not in completed:
+            continue
+        try:
+            require_scene_qc_pass(project_dir, entries[outcome.scene_id], min_score=min_score)
+        except SemanticValidationError as exc:
+            outcomes[index] = _failure_outcome(outcome.scene_id, exc)
+
+    return BatchResult(phase="scene_qc", outcomes=tuple(outcomes))
+
+
+def _batch_failure_message(result: BatchResult) -> str:
+    failures = result.failures
+    details = "; ".join(
+        f"{outcome.scene_id} ({outcome.exit_code.name}): {outcome.error_message or 'no diagnostic'}"
+        for outcome in failures
+    )
+    return f"{len(failures)}/{len(result.outcomes)} scene(s) failed in {result.phase}: {details}"
+
+
+def record_batch_failure(
+    project_dir: Path,
+    result: BatchResult,
+    *,
+    actor: str = "harness",
+    rewind_to: SceneStage | None = None,
+) -> bool:
+    """
+    Record one phase failure for a batch run through `record_phase_failure`.
+
+    A batch counts as a single phase attempt regardless of how many scenes failed.
+    Each failed scene is also charged to its own scene ledger entry
+    (`record_scene_failure`); a scene that exhausts its budget or repeats the same
+    failure without new evidence blocks the phase. Successful scenes are not
+    re-run by the next batch attempt.
+    `rewind_to` moves each failed scene back to that stage (keeping its attempt
+    count), so the next attempt redoes the work the failing gate rejected.
+    Throttle-only batches are not recorded, so they never consume the retry budget.
+    Returns True when the phase is blocked after recording.
+    """
+    state_file = project_dir / "project_state.json"
+    if not state_file.exists() or not result.failures:
+        return False
+    if result.exit_code in BUDGET_EXEMPT_EXIT_CODES:
+        return False
+
+    with STATE_WRITE_LOCK:
+        state = load_state(state_file)
+        if state.phase != result.phase:
+            return False
+
+        state = _apply_scene_failures(state, result, rewind_to=rewind_to)
+        blocked_scenes = blocked_scene_ids(state)
+        message = _batch_failure_message(result)
+        if blocked_scenes:
+            message += f" | blocked scene(s): {', '.join(blocked_scenes)}"
+
+        policy = get_exit_code_policy(result.exit_code, phase=result.phase)
+        state = record_phase_failure(
+            state,
+            error_code=policy.machine_error_code,
+            error_message=message,
+            gate=policy.gate,
+            owner_component=policy.owner_component,
+            retryable=policy.retryable,
+            attempt_delta=os.getenv("WD_RETRY_DELTA") or None,
+            evidence_token=os.getenv("WD_RETRY_EVIDENCE_TOKEN") or None,
+            actor=actor,
+            force_block=not policy.retryable or bool(blocked_scenes),
+        )
+        save_state_atomic(state_file, state)
+
+    payload = state.model_dump(mode="json")
+    append_event(
+        project_dir,
+        event_from_failure_context(
+            project_dir,
+            phase=result.phase,
+            failure_context=dict(payload.get("failure_context") or {}),
+            actor=actor,
+        ),
+    )
+    blocked = payload.get("phase_status") == "blocked"
+    if blocked:
+        export_blocked_trace_bundle(project_dir, state_payload=payload, actor=actor)
+    return blocked
@@ -0,0 +1,73 @@
+"""
+Input fingerprints for incremental `build_scenes` runs.
+
+A scene's build fingerprint is the SHA-256 of everything that shapes its
+generated body: the `build_scene_spec` payload, the `04_build_scenes` prompt
+template fingerprint, the schema registry contract version and the model.
+Fingerprints of successful builds are kept in `artifacts/build_fingerprints.json`;
+a scene whose fingerprint still matches and whose scaffold slot holds executable
+code is not regenerated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any
+
+from .contracts.runtime_pipeline import scene_body_is_built
+from .prompts import prompt_template_fingerprint
+from .schemas import SCHEMA_REGISTRY_CONTRACT_VERSION
+from .session import DEFAULT_MODEL
+
+BUILD_PROMPT_PHASE = "04_build_scenes"
+
+_FINGERPRINTS_LOCK = threading.Lock()
+
+
+def scene_build_fingerprint(scene_spec: dict[str, Any], *, model: str = DEFAULT_MODEL) -> str:
+    material = {
+        "scene_spec": scene_spec,
+        "prompt_fingerprint": prompt_template_fingerprint(BUILD_PROMPT_PHASE),
+        "schema_version": SCHEMA_REGISTRY_CONTRACT_VERSION,
+        "model": model,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def build_fingerprints_path(project_dir: Path) -> Path:
+    return project_dir / "artifacts" / "build_fingerprints.json"
+
+
+def load_build_fingerprints(project_dir: Path) -> dict[str, str]:
+    path = build_fingerprints_path(project_dir)
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    return {str(key): value for key, value in payload.items() if isinstance(value, str)}
+
+
+def record_build_fingerprint(project_dir: Path, scene_id: str, fingerprint: str) -> None:
+    path = build_fingerprints_path(project_dir)
+    with _FINGERPRINTS_LOCK:
+        fingerprints = load_build_fingerprints(project_dir)
+        fingerprints[scene_id] = fingerprint
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+            tmp.write(json.dumps(dict(sorted(fingerprints.items())), indent=2))
+            tmp_path = Path(tmp.name)
+        tmp_path.replace(path)
+
+
+def scene_build_is_current(project_dir: Path, scene_id: str, scene_file: Path, fingerprint: str) -> bool:
+    """True when the recorded fingerprint matches and the scene body is still populated."""
+    return load_build_fingerprints(project_dir).get(scene_id) == fingerprint and scene_body_is_built(scene_file)
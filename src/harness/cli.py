@@ -6,13 +6,28 @@ from pathlib import Path
 
 from pydantic import ValidationError
 
-from .client import generate_narration, generate_plan, generate_scene, repair_scene, run_scene_qc
+from .batch import (
+    BATCH_SCOPE,
+    BatchResult,
+    SceneOutcome,
+    build_scenes_batch,
+    clear_scene_ledger,
+    exit_code_for_exception,
+    load_batch_manifest,
+    record_batch_failure,
+    resolve_scene_concurrency,
+    scene_qc_batch,
+)
+from .client import generate_narration, generate_plan, generate_scene, repair_scene, run_scene_qc, stream_narration
+from .client_pool import CLIENT_POOL
 from .contracts.prompt_manifest import PromptContractError
 from .contracts.runtime_pipeline import load_scene_manifest, scene_manifest_path, write_scene_qc_report
 from .contracts.scaffold import ScaffoldContractError, inject_scene_body_file
-from .contracts.state import load_state, save_state_atomic, update_state_key
+from .contracts.state import load_state, remove_state_key, save_state_atomic, update_state_key
 from .exit_codes import HarnessExitCode
 from .parser import SchemaContractError, SemanticValidationError
+from .pipeline import NarrationProgressWriter, ScenePipeline
+from .rate_limit import ThrottledError
 from .schemas.plan import Plan
 from .session import PipelineTrainingSession, SessionContractError
 
@@ -30,8 +45,12 @@ def reject_legacy_fallback_toggles() -> None:
         raise PermissionError(f"legacy harness fallback toggles are disabled: {pairs}")
 
 
-def write_state_payload(key: str, payload, project_dir: str | Path) -> None:
-    """Save a phase payload into project_state.json using the canonical state contract."""
+def write_state_payload(key: str, payload, project_dir: str | Path, *, superseded: tuple[str, ...] = ()) -> None:
+    """
+    Save a phase payload into project_state.json using the canonical state contract.
+
+    `superseded` keys (e.g. partial progress the payload replaces) are removed in the same write.
+    """
     project_dir = Path(project_dir)
     state_file = project_dir / "project_state.json"
 
@@ -40,6 +59,8 @@ def write_state_payload(key: str, payload, project_dir: str | Path) -> None:
 
     state = load_state(state_file)
     updated_state = update_state_key(state, key, payload)
+    for stale_key in superseded:
+        updated_state = remove_state_key(updated_state, stale_key)
     save_state_atomic(state_file, updated_state)
     print(f"{key} written to {state_file}")
 
@@ -49,7 +70,12 @@ def write_plan(plan, project_dir) -> None:
 
 
 def write_narration(narration, project_dir) -> None:
-    write_state_payload("narration", narration.model_dump(mode="json"), project_dir)
+    write_state_payload(
+        "narration",
+        narration.model_dump(mode="json"),
+        project_dir,
+        superseded=("narration_progress",),
+    )
 
 
 def load_plan_from_state(project_dir: str | Path) -> Plan:
@@ -111,7 +137,71 @@ def find_manifest_scene_entry(project_dir: Path, scene_file: str, scene_id: str
     )
 
 
-def main() -> int:
+BATCH_PHASES = ("build_scenes", "scene_qc")
+
+
+def run_scene_batch(args) -> int:
+    """Run a scene-scoped phase for every manifest scene in one harness process."""
+    project_dir = Path(args.project_dir)
+
+    try:
+        reject_legacy_fallback_toggles()
+        max_concurrency = resolve_scene_concurrency(args.max_concurrency)
+        manifest = load_batch_manifest(project_dir)
+        session = PipelineTrainingSession.from_project(project_dir)
+    except Exception as exc:
+        outcome = SceneOutcome(
+            scene_id=BATCH_SCOPE,
+            exit_code=exit_code_for_exception(exc),
+            error_message=f"{type(exc).__name__}: {exc}",
+        )
+        print(f"Batch Error: {exc}", file=sys.stderr)
+        record_batch_failure(project_dir, BatchResult(phase=args.phase, outcomes=(outcome,)))
+        return int(outcome.exit_code)
+
+    if args.dry_run:
+        print(
+            f"Dry run mode. {len(manifest.scenes)} scene(s) would run for '{args.phase}' "
+            f"with concurrency {max_concurrency}."
+        )
+        return int(HarnessExitCode.SUCCESS)
+
+    if args.phase == "build_scenes":
+        result = build_scenes_batch(
+            session,
+            project_dir,
+            manifest,
+            max_concurrency=max_concurrency,
+            retry_context=args.retry_context,
+            force=args.force,
+        )
+    else:
+        result = scene_qc_batch(
+            session,
+            project_dir,
+            manifest,
+            max_concurrency=max_concurrency,
+            min_score=args.min_score,
+        )
+
+    print(
+        json.dumps(
+            {
+                "phase": result.phase,
+                "scene_count": len(result.outcomes),
+                "failed": [outcome.scene_id for outcome in result.failures],
+                "client_pool": CLIENT_POOL.stats(),
+            }
+        )
+    )
+    if result.failures:
+        for outcome in result.failures:
+            print(f"Scene Error: {outcome.scene_id}: {outcome.error_message}", file=sys.stderr)
+        record_batch_failure(project_dir, result)
+    return int(result.exit_code)
+
+
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="xAI Responses API harness")
     parser.add_argument(
         "--phase",
@@ -125,8 +215,49 @@ def main() -> int:
     parser.add_argument("--scene-spec", help="JSON string of the scene specification for building")
     parser.add_argument("--retry-context", help="Error context from previous attempt")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--all-scenes",
+        action="store_true",
+        help="Run a scene-scoped phase for every scene in artifacts/scene_manifest.json",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Upper bound on in-flight scene calls for --all-scenes and --pipelined (default: WD_SCENE_CONCURRENCY or 4)",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Narration only: stream the response and persist each scene as it completes",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help=(
+            "Narration only: stream the response and scaffold, build and QC each scene as soon as "
+            "its narration arrives (bounded by --max-concurrency)"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every scene even when its build fingerprint is unchanged (--all-scenes and --pipelined)",
+    )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=0.7,
+        help="Minimum QC score enforced by the scene_qc batch contract validation",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.all_scenes:
+        if args.phase not in BATCH_PHASES:
+            print(f"Error: --all-scenes is not supported for phase '{args.phase}'.", file=sys.stderr)
+            return int(HarnessExitCode.POLICY_VIOLATION)
+        return run_scene_batch(args)
 
     try:
         reject_legacy_fallback_toggles()
@@ -157,8 +288,34 @@ def main() -> int:
 
         elif args.phase == "narration":
             plan = load_plan_from_state(args.project_dir)
-            result = generate_narration(session, plan)
-            write_narration(result, args.project_dir)
+            if args.pipelined:
+                pipeline = ScenePipeline(
+                    session,
+                    Path(args.project_dir),
+                    plan,
+                    max_concurrency=resolve_scene_concurrency(args.max_concurrency),
+                    min_score=args.min_score,
+                    force=args.force,
+                )
+                result, outcomes = pipeline.run()
+                write_narration(result, args.project_dir)
+                print(
+                    json.dumps(
+                        {
+                            "phase": "narration",
+                            "pipelined": True,
+                            "scenes": len(result.scenes),
+                            "deferred": [outcome.scene_id for outcome in outcomes if not outcome.succeeded],
+                        }
+                    )
+                )
+            else:
+                clear_scene_ledger(Path(args.project_dir))
+                if args.stream:
+                    result = stream_narration(session, plan, NarrationProgressWriter(plan, args.project_dir))
+                else:
+                    result = generate_narration(session, plan)
+                write_narration(result, args.project_dir)
 
         elif args.phase == "build_scenes":
             if not args.scene_spec or not args.scene_file:
@@ -205,6 +362,10 @@ def main() -> int:
         print(f"Policy Error: {exc}", file=sys.stderr)
         return int(HarnessExitCode.POLICY_VIOLATION)
 
+    except ThrottledError as exc:
+        print(f"Throttled: {exc}", file=sys.stderr)
+        return int(HarnessExitCode.THROTTLED)
+
     except Exception as exc:
         print(f"Harness Error: {exc}", file=sys.stderr)
         return int(HarnessExitCode.INFRASTRUCTURE_ERROR)
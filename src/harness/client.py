@@ -1,42 +1,36 @@
 # harness/client.py
+import time
 from pathlib import Path
+from typing import Callable
 
 from xai_sdk.chat import user
 
+from .contracts.observability import PhaseUsageRecord
 from .parser import (
+    NarrationStreamParser,
     validate_phase_payload,
     validate_timing_execution,
 )
 from .prompts import compose_prompts
+from .rate_limit import get_rate_limiter
+from .response_cache import ResponseCache, response_cache_key
 from .schemas import get_schema_for_phase
-from .schemas.narration import Narration
+from .schemas.narration import Narration, NarrationScene
 from .schemas.plan import Plan
 from .schemas.scene_qc import SceneQC
-from .session import PipelineTrainingSession
+from .session import DEFAULT_MODEL, PipelineTrainingSession
+from .usage import record_phase_usage, usage_record_from_response
 
-def generate_plan(session: PipelineTrainingSession, topic: str, retry_context: str | None = None) -> Plan:
-    """Generate structured plan with API-enforced schema"""
-    
-    prompts = compose_prompts("00_plan", topic=topic, retry_context=retry_context)
-    
-    chat = session.create_chat(
-        phase="plan",
-        response_format=get_schema_for_phase("plan"),
-    )
-    
-    chat.append(user(prompts["system"], prompts["user"]))
-    response = chat.sample()
-    
-    plan = validate_phase_payload("plan", response.content)
-    
-    session.update_response_id(response.id)
-    
-    return plan
+# Prompt composition, response caching, usage accounting and response acceptance are shared
+# with `harness.async_client`; only the `chat.sample()` call differs between the sync and async paths.
 
-def generate_scene(session: PipelineTrainingSession, scene_spec: dict, retry_context: str | None = None):
-    """Generates the Manim code for a single scene."""
 
-    prompts = compose_prompts(
+def plan_prompts(topic: str, retry_context: str | None = None) -> dict:
+    return compose_prompts("00_plan", topic=topic, retry_context=retry_context)
+
+
+def scene_prompts(scene_spec: dict, retry_context: str | None = None) -> dict:
+    return compose_prompts(
         "04_build_scenes",
         scene_title=scene_spec['title'],
         scene_description=scene_spec['description'],
@@ -48,43 +42,179 @@ def generate_scene(session: PipelineTrainingSession, scene_spec: dict, retry_con
         retry_context=retry_context
     )
 
-    chat = session.create_chat(
-        phase="build_scenes",
-        response_format=get_schema_for_phase("build_scenes"),
+
+def repair_prompts(scene_file: str, failure_reason: str) -> dict:
+    return compose_prompts(
+        "06_scene_repair",
+        scene_file_content=Path(scene_file).read_text(),
+        failure_reason=failure_reason
     )
-    
-    chat.append(user(prompts["system"], prompts["user"]))
-    response = chat.sample()
 
-    # Validate that the model actually used the code execution tool for timing
-    validate_timing_execution(response)
 
-    scene_build = validate_phase_payload("build_scenes", response.content)
-    session.update_response_id(response.id)
+def narration_prompts(plan: Plan) -> dict:
+    return compose_prompts(
+        "02_narration",
+        plan=plan.model_dump(mode="json"),
+    )
 
-    return scene_build
 
-def repair_scene(session: PipelineTrainingSession, scene_file: str, failure_reason: str):
-    """Attempts to repair a scene that failed validation."""
-    
-    prompts = compose_prompts(
-        "06_scene_repair",
-        scene_file_content=Path(scene_file).read_text(),
-        failure_reason=failure_reason
+def scene_qc_prompts(scene_file: str) -> dict:
+    return compose_prompts(
+        "05_scene_qc",
+        scene_code=Path(scene_file).read_text(encoding="utf-8"),
     )
 
+
+def open_phase_chat(session, phase: str, prompts: dict):
+    """Create the phase chat with its canonical schema and append the composed prompts."""
     chat = session.create_chat(
-        phase="scene_repair",
-        response_format=get_schema_for_phase("scene_repair"),
+        phase=phase,
+        response_format=get_schema_for_phase(phase),
     )
-
     chat.append(user(prompts["system"], prompts["user"]))
-    response = chat.sample()
+    return chat
+
+
+def accept_phase_response(session, phase: str, response):
+    """Validate a sampled response against the phase contract and advance the session."""
+    if phase == "build_scenes":
+        # Validate that the model actually used the code execution tool for timing
+        validate_timing_execution(response)
 
-    scene_repair = validate_phase_payload("scene_repair", response.content)
+    payload = validate_phase_payload(phase, response.content)
     session.update_response_id(response.id)
+    return payload
+
+
+class PhaseResponseCache:
+    """Binds the configured `ResponseCache` to one phase call's content-addressed key."""
+
+    def __init__(self, cache: ResponseCache, session, phase: str, prompts: dict) -> None:
+        options = session.chat_options(phase, get_schema_for_phase(phase))
+        self.cache = cache
+        self.phase = phase
+        self.schema_name = options["response_format"].__name__
+        self.model = options["model"]
+        self.key = response_cache_key(
+            phase=phase,
+            prompts=prompts,
+            schema_name=self.schema_name,
+            tools=options["tools"],
+            model=self.model,
+            previous_response_id=options["previous_response_id"],
+        )
+
+    @classmethod
+    def for_call(cls, session, phase: str, prompts: dict) -> "PhaseResponseCache | None":
+        cache = ResponseCache.from_env(session.project_dir)
+        return None if cache is None else cls(cache, session, phase, prompts)
+
+    def replay(self, session):
+        """Return the cached payload re-validated against the current contract, or None."""
+        entry = self.cache.get(self.key)
+        if entry is None:
+            return None
+        try:
+            payload = validate_phase_payload(self.phase, entry.payload)
+        except ValueError:
+            self.cache.discard(self.key)
+            return None
+        session.update_response_id(entry.response_id)
+        return payload
+
+    def store(self, payload, response_id: str) -> None:
+        self.cache.put(
+            self.key,
+            phase=self.phase,
+            schema_name=self.schema_name,
+            model=self.model,
+            response_id=response_id,
+            payload=payload.model_dump(mode="json"),
+        )
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def replay_cached_phase(session, phase: str, cached: PhaseResponseCache):
+    """Replay a cached payload, recording a zero-token cache-hit usage record on success."""
+    started = time.perf_counter()
+    payload = cached.replay(session)
+    if payload is not None:
+        record_phase_usage(
+            session,
+            PhaseUsageRecord(
+                call_phase=phase,
+                model=cached.model,
+                response_id=session.response_id if isinstance(session.response_id, str) else None,
+                latency_ms=round(_elapsed_ms(started), 3),
+                cache_hit=True,
+            ),
+        )
+    return payload
+
+
+def complete_phase_call(session, phase: str, response, started: float, cached: PhaseResponseCache | None):
+    """Accept a sampled response, record its usage (also when rejected) and populate the cache."""
+    latency_ms = _elapsed_ms(started)
+    model = cached.model if cached is not None else DEFAULT_MODEL
+    try:
+        payload = accept_phase_response(session, phase, response)
+    except Exception:
+        record_phase_usage(
+            session,
+            usage_record_from_response(phase, response, model=model, latency_ms=latency_ms, accepted=False),
+        )
+        raise
 
-    return scene_repair
+    record_phase_usage(session, usage_record_from_response(phase, response, model=model, latency_ms=latency_ms))
+    if cached is not None:
+        cached.store(payload, response.id)
+    return payload
+
+
+def run_phase(session, phase: str, prompts: dict, *, bypass_cache: bool = False):
+    """Sample one phase call, replaying a cached response when `WD_RESPONSE_CACHE=1`."""
+    cached = PhaseResponseCache.for_call(session, phase, prompts)
+    if cached is not None and not bypass_cache:
+        payload = replay_cached_phase(session, phase, cached)
+        if payload is not None:
+            return payload
+
+    chat = open_phase_chat(session, phase, prompts)
+    started = time.perf_counter()
+    response = get_rate_limiter().call(chat.sample, label=phase)
+    return complete_phase_call(session, phase, response, started, cached)
+
+
+def generate_plan(session: PipelineTrainingSession, topic: str, retry_context: str | None = None) -> Plan:
+    """Generate structured plan with API-enforced schema"""
+    return run_phase(session, "plan", plan_prompts(topic, retry_context), bypass_cache=retry_context is not None)
+
+def generate_scene(session: PipelineTrainingSession, scene_spec: dict, retry_context: str | None = None):
+    """Generates the Manim code for a single scene."""
+    return run_phase(
+        session,
+        "build_scenes",
+        scene_prompts(scene_spec, retry_context),
+        bypass_cache=retry_context is not None,
+    )
+
+def repair_scene(
+    session: PipelineTrainingSession,
+    scene_file: str,
+    failure_reason: str,
+    *,
+    bypass_cache: bool = True,
+):
+    """
+    Attempts to repair a scene that failed validation.
+
+    Repairs skip cache reads by default: replaying the fix for the same file and
+    failure would only reproduce the failure.
+    """
+    return run_phase(session, "scene_repair", repair_prompts(scene_file, failure_reason), bypass_cache=bypass_cache)
 
 
 def generate_narration(
@@ -92,40 +222,59 @@ def generate_narration(
     plan: Plan,
 ) -> Narration:
     """Generate narration script for all plan scenes."""
-    prompts = compose_prompts(
-        "02_narration",
-        plan=plan.model_dump(mode="json"),
-    )
+    return run_phase(session, "narration", narration_prompts(plan))
 
-    chat = session.create_chat(
-        phase="narration",
-        response_format=get_schema_for_phase("narration"),
-    )
-    chat.append(user(prompts["system"], prompts["user"]))
-    response = chat.sample()
 
-    narration = validate_phase_payload("narration", response.content)
-    session.update_response_id(response.id)
-    return narration
+NarrationSceneCallback = Callable[[int, NarrationScene], None]
+
+
+def _consume_narration_stream(chat, on_scene: NarrationSceneCallback | None):
+    parser = NarrationStreamParser()
+    response = None
+    for response, chunk in chat.stream():
+        for scene in parser.feed(chunk.content):
+            if on_scene is not None:
+                on_scene(len(parser.scenes) - 1, scene)
+    if response is None:
+        raise RuntimeError("narration stream ended without a response")
+    return response
+
+
+def stream_narration(
+    session: PipelineTrainingSession,
+    plan: Plan,
+    on_scene: NarrationSceneCallback | None = None,
+) -> Narration:
+    """
+    Generate narration over `chat.stream()`, handing each `NarrationScene` to
+    `on_scene(index, scene)` as soon as its array element completes.
+
+    The accumulated response goes through the same acceptance, usage accounting
+    and response caching as `generate_narration`; a cache replay reports every
+    scene to `on_scene` before returning.
+    """
+    phase = "narration"
+    prompts = narration_prompts(plan)
+    cached = PhaseResponseCache.for_call(session, phase, prompts)
+    if cached is not None:
+        payload = replay_cached_phase(session, phase, cached)
+        if payload is not None:
+            if on_scene is not None:
+                for index, scene in enumerate(payload.scenes):
+                    on_scene(index, scene)
+            return payload
+
+    chat = open_phase_chat(session, phase, prompts)
+    started = time.perf_counter()
+    response = get_rate_limiter().call(lambda: _consume_narration_stream(chat, on_scene), label=phase)
+    return complete_phase_call(session, phase, response, started, cached)
 
 
 def run_scene_qc(
     session: PipelineTrainingSession,
     scene_file: str,
+    *,
+    bypass_cache: bool = False,
 ) -> SceneQC:
-    """Run scene quality checks and return structured QC result."""
-    prompts = compose_prompts(
-        "05_scene_qc",
-        scene_code=Path(scene_file).read_text(encoding="utf-8"),
-    )
-
-    chat = session.create_chat(
-        phase="scene_qc",
-        response_format=get_schema_for_phase("scene_qc"),
-    )
-    chat.append(user(prompts["system"], prompts["user"]))
-    response = chat.sample()
-
-    scene_qc = validate_phase_payload("scene_qc", response.content)
-    session.update_response_id(response.id)
-    return scene_qc
+    """Run scene quality checks and return structured QC result; `bypass_cache` forces a fresh verdict."""
+    return run_phase(session, "scene_qc", scene_qc_prompts(scene_file), bypass_cache=bypass_cache)
@@ -0,0 +1,100 @@
+"""Process-wide pool of xAI SDK clients so phase calls share one gRPC channel per host."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+API_HOST_ENV_VAR = "XAI_API_HOST"
+DEFAULT_API_HOST = "api.x.ai"
+
+# Keep idle channels alive between phase calls (and across long model calls) so a
+# reused client never pays for a fresh TCP/TLS handshake.
+KEEPALIVE_CHANNEL_OPTIONS: tuple[tuple[str, Any], ...] = (
+    ("grpc.keepalive_time_ms", 30_000),
+    ("grpc.keepalive_timeout_ms", 10_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+)
+
+
+@dataclass
+class PooledClientStats:
+    factory: str
+    api_host: str
+    created: int = 0
+    reused: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "factory": self.factory,
+            "api_host": self.api_host,
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+
+def resolve_api_host() -> str:
+    return os.getenv(API_HOST_ENV_VAR, "").strip() or DEFAULT_API_HOST
+
+
+def _key_fingerprint(api_key: str | None) -> str:
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+
+
+class ClientPool:
+    """
+    Hands out one shared client per (client factory, API host, API key).
+
+    The SDK's sync `Client` is safe to share across threads, so concurrently
+    running scene builds multiplex their requests over the same channel.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[Callable[..., Any], str, str], Any] = {}
+        self._stats: dict[tuple[Callable[..., Any], str, str], PooledClientStats] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        factory: Callable[..., Any],
+        *,
+        api_key: str | None,
+        api_host: str | None = None,
+    ) -> Any:
+        host = api_host or resolve_api_host()
+        key = (factory, host, _key_fingerprint(api_key))
+        with self._lock:
+            stats = self._stats.setdefault(
+                key,
+                PooledClientStats(factory=getattr(factory, "__name__", repr(factory)), api_host=host),
+            )
+            client = self._clients.get(key)
+            if client is not None:
+                stats.reused += 1
+                return client
+
+            client = factory(
+                api_key=api_key,
+                api_host=host,
+                channel_options=list(KEEPALIVE_CHANNEL_OPTIONS),
+            )
+            self._clients[key] = client
+            stats.created += 1
+            return client
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [stats.as_dict() for stats in self._stats.values()]
+
+    def clear(self) -> None:
+        """Drop pooled clients (their channels close when garbage collected)."""
+        with self._lock:
+            self._clients.clear()
+            self._stats.clear()
+
+
+CLIENT_POOL = ClientPool()
@@ -19,6 +19,14 @@ REQUIRED_RENDER_GATES: tuple[str, ...] = ("schema", "contract", "semantic", "run
 
 ValidationGate = Literal["schema", "contract", "semantic", "runtime", "assembly"]
 GenerationMode = Literal["cache_hit", "generated", "fallback_generated"]
+RenderProfileName = Literal["draft", "final"]
+
+# Documented override ranges for render profiles (section 16).
+RENDER_WIDTH_RANGE = (426, 3840)
+RENDER_HEIGHT_RANGE = (240, 2160)
+RENDER_FPS_RANGE = (15, 60)
+SUPPORTED_RENDER_FORMATS = {"mp4"}
+SUPPORTED_RENDER_CODECS = {"libx264"}
 
 
 def _normalize_non_empty(value: str, *, field_name: str) -> str:
@@ -131,6 +139,88 @@ class RenderPreconditions(BaseModel):
         return self
 
 
+class RenderProfile(BaseModel):
+    """Named render settings; only the `final` profile feeds `RenderManifest` and assembly."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    name: RenderProfileName
+    width: int
+    height: int
+    fps: int
+    format: str = "mp4"
+    codec: str = "libx264"
+
+    @field_validator("width", "height")
+    @classmethod
+    def _validate_even_dimension(cls, value: int) -> int:
+        if value % 2:
+            raise ValueError("render width and height must be even")
+        return value
+
+    @field_validator("width")
+    @classmethod
+    def _validate_width(cls, value: int) -> int:
+        low, high = RENDER_WIDTH_RANGE
+        if not low <= value <= high:
+            raise ValueError(f"render width must be within [{low}, {high}]")
+        return value
+
+    @field_validator("height")
+    @classmethod
+    def _validate_height(cls, value: int) -> int:
+        low, high = RENDER_HEIGHT_RANGE
+        if not low <= value <= high:
+            raise ValueError(f"render height must be within [{low}, {high}]")
+        return value
+
+    @field_validator("fps")
+    @classmethod
+    def _validate_fps(cls, value: int) -> int:
+        low, high = RENDER_FPS_RANGE
+        if not low <= value <= high:
+            raise ValueError(f"render fps must be within [{low}, {high}]")
+        return value
+
+    @field_validator("format")
+    @classmethod
+    def _validate_format(cls, value: str) -> str:
+        if value not in SUPPORTED_RENDER_FORMATS:
+            raise ValueError(f"render format must be one of: {', '.join(sorted(SUPPORTED_RENDER_FORMATS))}")
+        return value
+
+    @field_validator("codec")
+    @classmethod
+    def _validate_codec(cls, value: str) -> str:
+        if value not in SUPPORTED_RENDER_CODECS:
+            raise ValueError(f"render codec must be one of: {', '.join(sorted(SUPPORTED_RENDER_CODECS))}")
+        return value
+
+    @property
+    def resolution(self) -> str:
+        return f"{self.width}x{self.height}"
+
+    def settings(self) -> dict[str, Any]:
+        """Output-affecting settings (everything but the name), e.g. for cache keys."""
+        return self.model_dump(mode="json", exclude={"name"})
+
+
+RENDER_PROFILES: dict[str, RenderProfile] = {
+    "draft": RenderProfile(name="draft", width=854, height=480, fps=15),
+    "final": RenderProfile(name="final", width=2560, height=1440, fps=60),
+}
+
+
+def resolve_render_profile(name: str, overrides: dict[str, Any] | None = None) -> RenderProfile:
+    """Named profile with optional overrides, re-validated against the documented ranges."""
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"unknown render profile '{name}' (expected one of: {', '.join(RENDER_PROFILES)})")
+    base = RENDER_PROFILES[name]
+    if not overrides:
+        return base
+    return RenderProfile.model_validate({**base.model_dump(), **overrides, "name": name})
+
+
 class RenderSceneAsset(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -191,6 +281,24 @@ class AssemblyInput(BaseModel):
         return _normalize_non_empty(value, field_name="assembly_input_field")
 
 
+class AssemblySegment(BaseModel):
+    """Position of one scene inside the spliced MPEG-TS segment stream."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    scene_id: str
+    input_sha256: str
+    segment_sha256: str
+    byte_offset: int = Field(ge=0)
+    byte_length: int = Field(gt=0)
+    duration_seconds: float = Field(gt=0)
+
+    @field_validator("scene_id", "input_sha256", "segment_sha256")
+    @classmethod
+    def _validate_non_empty(cls, value: str) -> str:
+        return _normalize_non_empty(value, field_name="assembly_segment_field")
+
+
 class AssemblyManifest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -203,6 +311,8 @@ class AssemblyManifest(BaseModel):
     actual_duration_seconds: float = Field(gt=0)
     duration_tolerance_seconds: float = Field(gt=0)
     degraded: bool = False
+    segment_stream_path: str | None = None
+    segments: list[AssemblySegment] = Field(default_factory=list)
 
     @field_validator("contract_version")
     @classmethod
@@ -230,6 +340,17 @@ class AssemblyManifest(BaseModel):
             raise ValueError(
                 "duration_tolerance_seconds cannot exceed default policy max(0.5s, 2% of expected duration)"
             )
+
+        if self.segments:
+            if self.segment_stream_path is None:
+                raise ValueError("assembly segment index requires segment_stream_path")
+            if [segment.scene_id for segment in self.segments] != self.scene_order:
+                raise ValueError("assembly segment index must match scene_order exactly")
+            expected_offset = 0
+            for segment in self.segments:
+                if segment.byte_offset != expected_offset:
+                    raise ValueError(f"assembly segment '{segment.scene_id}' is not contiguous in the segment stream")
+                expected_offset += segment.byte_length
         return self
 
 
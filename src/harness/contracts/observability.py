@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Literal
@@ -22,8 +23,12 @@ EventType = Literal[
     "phase_transition",
     "phase_unblocked",
     "diagnostic_bundle",
+    "phase_usage",
 ]
 
+# Serializes run-context creation and event appends across harness worker threads.
+_EVENTS_LOCK = threading.RLock()
+
 
 class ContextBudgetMarker(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -40,6 +45,30 @@ class RetryContextMarker(BaseModel):
     meaningful_delta: bool = False
 
 
+class PhaseUsageRecord(BaseModel):
+    """Cost and latency of one harness phase call, carried in `phase_usage` event metadata."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    call_phase: str
+    model: str
+    response_id: str | None = None
+    latency_ms: float = Field(ge=0)
+    prompt_tokens: int = Field(default=0, ge=0)
+    cached_prompt_tokens: int = Field(default=0, ge=0)
+    completion_tokens: int = Field(default=0, ge=0)
+    reasoning_tokens: int = Field(default=0, ge=0)
+    total_tokens: int = Field(default=0, ge=0)
+    server_side_tool_calls: dict[str, int] = Field(default_factory=dict)
+    cost_usd: float | None = None
+    cache_hit: bool = False
+    accepted: bool = True
+
+    @property
+    def tool_call_count(self) -> int:
+        return sum(self.server_side_tool_calls.values())
+
+
 class ObservabilityEvent(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -110,6 +139,11 @@ def _events_path(project_dir: Path) -> Path:
 
 
 def ensure_run_context(project_dir: Path) -> str:
+    with _EVENTS_LOCK:
+        return _ensure_run_context(project_dir)
+
+
+def _ensure_run_context(project_dir: Path) -> str:
     run_context_file = _run_context_path(project_dir)
     if run_context_file.exists():
         payload = json.loads(run_context_file.read_text(encoding="utf-8"))
@@ -135,8 +169,9 @@ def ensure_run_context(project_dir: Path) -> str:
 def append_event(project_dir: Path, event: ObservabilityEvent) -> Path:
     events_path = _events_path(project_dir)
     events_path.parent.mkdir(parents=True, exist_ok=True)
-    with events_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(event.model_dump(mode="json"), sort_keys=True) + "\n")
+    line = json.dumps(event.model_dump(mode="json"), sort_keys=True) + "\n"
+    with _EVENTS_LOCK, events_path.open("a", encoding="utf-8") as handle:
+        handle.write(line)
     return events_path
 
 
@@ -181,6 +216,71 @@ def emit_phase_event(
     return event
 
 
+def emit_usage_event(
+    project_dir: Path,
+    record: PhaseUsageRecord,
+    *,
+    attempt: int = 1,
+    actor: str = "harness",
+) -> ObservabilityEvent:
+    return emit_phase_event(
+        project_dir,
+        phase=record.call_phase,
+        event_type="phase_usage",
+        attempt=attempt,
+        actor=actor,
+        metadata=record.model_dump(mode="json"),
+    )
+
+
+_USAGE_SUM_FIELDS = (
+    "prompt_tokens",
+    "cached_prompt_tokens",
+    "completion_tokens",
+    "reasoning_tokens",
+    "total_tokens",
+)
+
+
+def _empty_usage_summary() -> dict[str, Any]:
+    summary: dict[str, Any] = {"calls": 0, "cache_hits": 0, "rejected": 0, "latency_ms": 0.0}
+    summary.update({field: 0 for field in _USAGE_SUM_FIELDS})
+    summary.update({"tool_calls": 0, "cost_usd": 0.0})
+    return summary
+
+
+def _add_usage(summary: dict[str, Any], record: PhaseUsageRecord) -> None:
+    summary["calls"] += 1
+    summary["cache_hits"] += int(record.cache_hit)
+    summary["rejected"] += int(not record.accepted)
+    summary["latency_ms"] = round(summary["latency_ms"] + record.latency_ms, 3)
+    for field in _USAGE_SUM_FIELDS:
+        summary[field] += getattr(record, field)
+    summary["tool_calls"] += record.tool_call_count
+    summary["cost_usd"] = round(summary["cost_usd"] + (record.cost_usd or 0.0), 6)
+
+
+def summarize_usage_events(events: list[dict[str, Any]], *, run_id: str | None = None) -> dict[str, Any]:
+    """Aggregate `phase_usage` events per run and per phase, plus per-phase totals across runs."""
+    runs: dict[str, dict[str, Any]] = {}
+    phases: dict[str, dict[str, Any]] = {}
+    totals = _empty_usage_summary()
+
+    for event in events:
+        if event.get("event_type") != "phase_usage":
+            continue
+        if run_id is not None and event.get("run_id") != run_id:
+            continue
+        record = PhaseUsageRecord.model_validate(event.get("metadata") or {})
+        run = runs.setdefault(str(event.get("run_id")), {"phases": {}, "totals": _empty_usage_summary()})
+        _add_usage(run["phases"].setdefault(record.call_phase, _empty_usage_summary()), record)
+        _add_usage(run["totals"], record)
+        _add_usage(phases.setdefault(record.call_phase, _empty_usage_summary()), record)
+        _add_usage(totals, record)
+
+    return {"runs": runs, "phases": phases, "totals": totals}
+
+
 def recommended_next_action(blocked_reason: str | None, retryable: bool | None) -> str:
     if blocked_reason == "NO_NEW_EVIDENCE":
         return "Attach attempt_delta or evidence_token before retrying."
@@ -10,7 +10,7 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator, model_valida
 
 from harness.contracts.scaffold import SLOT_END_MARKER, SLOT_START_MARKER
 from harness.contracts.state import load_state
-from harness.schemas.narration import Narration
+from harness.schemas.narration import Narration, NarrationScene
 from harness.schemas.plan import Plan
 from harness.schemas.scene_qc import SceneQC
 
@@ -136,15 +136,9 @@ class SceneQCRecord(BaseModel):
         return _normalize_non_empty(value, field_name="scene_qc_field")
 
 
-def build_scene_manifest(plan: Plan, narration: Narration) -> SceneManifest:
-    if len(plan.scenes) != len(narration.scenes):
-        raise ValueError(
-            "plan/narration scene count mismatch: "
-            f"plan={len(plan.scenes)} narration={len(narration.scenes)}"
-        )
-
+def _scene_manifest_entries(plan: Plan, narration_scenes: list[NarrationScene]) -> list[SceneManifestEntry]:
     entries: list[SceneManifestEntry] = []
-    for index, (plan_scene, narration_scene) in enumerate(zip(plan.scenes, narration.scenes), start=1):
+    for index, (plan_scene, narration_scene) in enumerate(zip(plan.scenes, narration_scenes), start=1):
         if _normalize_title_for_match(plan_scene.title) != _normalize_title_for_match(narration_scene.scene_title):
             raise ValueError(
                 "plan/narration scene title mismatch at index "
@@ -167,8 +161,26 @@ def build_scene_manifest(plan: Plan, narration: Narration) -> SceneManifest:
                 visual_ideas=list(plan_scene.visual_ideas),
             )
         )
+    return entries
+
+
+def build_scene_manifest(plan: Plan, narration: Narration) -> SceneManifest:
+    if len(plan.scenes) != len(narration.scenes):
+        raise ValueError(
+            "plan/narration scene count mismatch: "
+            f"plan={len(plan.scenes)} narration={len(narration.scenes)}"
+        )
+    return SceneManifest(generated_at=utc_timestamp(), scenes=_scene_manifest_entries(plan, narration.scenes))
 
-    return SceneManifest(generated_at=utc_timestamp(), scenes=entries)
+
+def build_partial_scene_manifest(plan: Plan, narration_scenes: list[NarrationScene]) -> SceneManifest:
+    """Manifest for the leading narration scenes received so far (streamed narration)."""
+    if len(narration_scenes) > len(plan.scenes):
+        raise ValueError(
+            "plan/narration scene count mismatch: "
+            f"plan={len(plan.scenes)} narration>={len(narration_scenes)}"
+        )
+    return SceneManifest(generated_at=utc_timestamp(), scenes=_scene_manifest_entries(plan, narration_scenes))
 
 
 def load_plan_and_narration_from_state(project_dir: Path) -> tuple[Plan, Narration]:
@@ -284,6 +296,17 @@ def _body_has_executable_content(slot_body: str) -> bool:
     return bool(filtered)
 
 
+def scene_body_is_built(scene_path: Path) -> bool:
+    """True when the scene file exists and its scaffold slot holds executable code."""
+    if not scene_path.exists():
+        return False
+    try:
+        slot_body = _slot_body(scene_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return False
+    return _body_has_executable_content(slot_body)
+
+
 def validate_built_scene_files(project_dir: Path, manifest: SceneManifest) -> list[str]:
     errors: list[str] = []
     for scene in manifest.scenes:
@@ -331,35 +354,42 @@ def write_scene_qc_report(
     return destination
 
 
-def validate_scene_qc_reports(project_dir: Path, manifest: SceneManifest, *, min_score: float = 0.7) -> list[str]:
+def scene_qc_report_errors(project_dir: Path, scene: SceneManifestEntry, *, min_score: float = 0.7) -> list[str]:
     if min_score < 0.0 or min_score > 1.0:
         raise ValueError("min_score must be between 0.0 and 1.0")
 
+    report_path = scene_qc_report_path(project_dir, scene)
+    if not report_path.exists():
+        return [f"missing QC report for {scene.scene_id}: {report_path}"]
+
+    try:
+        payload = json.loads(report_path.read_text(encoding="utf-8"))
+        report = SceneQCRecord.model_validate(payload)
+    except Exception as exc:
+        return [f"invalid QC report for {scene.scene_id}: {exc}"]
+
     errors: list[str] = []
-    for scene in manifest.scenes:
-        report_path = scene_qc_report_path(project_dir, scene)
-        if not report_path.exists():
-            errors.append(f"missing QC report for {scene.scene_id}: {report_path}")
-            continue
+    if report.scene_id != scene.scene_id:
+        errors.append(
+            f"QC scene_id mismatch for {scene.scene_id}: report={report.scene_id} expected={scene.scene_id}"
+        )
 
-        try:
-            payload = json.loads(report_path.read_text(encoding="utf-8"))
-            report = SceneQCRecord.model_validate(payload)
-        except Exception as exc:
-            errors.append(f"invalid QC report for {scene.scene_id}: {exc}")
-            continue
+    if not report.passed:
+        errors.append(f"QC failed for {scene.scene_id}: passed=false")
 
-        if report.scene_id != scene.scene_id:
-            errors.append(
-                f"QC scene_id mismatch for {scene.scene_id}: report={report.scene_id} expected={scene.scene_id}"
-            )
+    if report.score < min_score:
+        errors.append(
+            f"QC score below threshold for {scene.scene_id}: score={report.score} threshold={min_score}"
+        )
 
-        if not report.passed:
-            errors.append(f"QC failed for {scene.scene_id}: passed=false")
+    return errors
 
-        if report.score < min_score:
-            errors.append(
-                f"QC score below threshold for {scene.scene_id}: score={report.score} threshold={min_score}"
-            )
 
+def validate_scene_qc_reports(project_dir: Path, manifest: SceneManifest, *, min_score: float = 0.7) -> list[str]:
+    if min_score < 0.0 or min_score > 1.0:
+        raise ValueError("min_score must be between 0.0 and 1.0")
+
+    errors: list[str] = []
+    for scene in manifest.scenes:
+        errors.extend(scene_qc_report_errors(project_dir, scene, min_score=min_score))
     return errors
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from tempfile import NamedTemporaryFile
@@ -55,6 +56,28 @@ DEFAULT_MAX_ATTEMPTS: dict[PhaseName, int] = {
 
 LOOP_SIGNATURE_REPEAT_BLOCK_THRESHOLD = 2
 
+# Per-scene sub-states, in order. A scene only ever moves forward through these;
+# the project-level `phase` keeps reporting the earliest phase not yet complete
+# for every scene.
+SceneStage = Literal["narrated", "scaffolded", "built", "qc_passed"]
+
+SCENE_STAGE_SEQUENCE: tuple[SceneStage, ...] = (
+    "narrated",
+    "scaffolded",
+    "built",
+    "qc_passed",
+)
+
+SceneStatus = Literal["ok", "failed", "blocked"]
+
+# Phase that moves a scene past each stage; a scene failure is charged to it.
+SCENE_STAGE_PHASES: dict[SceneStage, PhaseName] = {
+    "narrated": "narration",
+    "scaffolded": "narration",
+    "built": "build_scenes",
+    "qc_passed": "scene_qc",
+}
+
 _TRANSITIONS: dict[PhaseName, tuple[PhaseName, ...]] = {
     "init": ("plan",),
     "plan": ("review",),
@@ -87,6 +110,26 @@ class HistoryEntry(BaseModel):
         return value
 
 
+class SceneLedgerEntry(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    scene_id: str
+    stage: SceneStage
+    status: SceneStatus = "ok"
+    attempts: int = Field(default=0, ge=0)
+    last_error_signature: Optional[str] = None
+    blocked_reason: Optional[str] = None
+    artifact_hashes: dict[str, str] = Field(default_factory=dict)
+    updated_at: str
+
+    @field_validator("updated_at")
+    @classmethod
+    def _timestamp_must_be_utc_z(cls, value: str) -> str:
+        if not re.match(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$", value):
+            raise ValueError("updated_at must be UTC with trailing Z")
+        return value
+
+
 class ProjectState(BaseModel):
     model_config = ConfigDict(extra="allow")
 
@@ -180,6 +223,15 @@ def update_state_key(state: ProjectState, key: str, value: Any) -> ProjectState:
     return ProjectState.model_validate(normalized)
 
 
+def remove_state_key(state: ProjectState, key: str) -> ProjectState:
+    payload = state.model_dump(mode="json")
+    if key not in payload:
+        return state
+    del payload[key]
+    normalized = normalize_state_payload(payload)
+    return ProjectState.model_validate(normalized)
+
+
 def transition_state(
     state: ProjectState,
     to_phase: PhaseName,
@@ -228,6 +280,73 @@ def get_attempt_count(state: ProjectState, phase: PhaseName) -> int:
         return 0
 
 
+def get_scene_ledger(state: ProjectState) -> dict[str, SceneLedgerEntry]:
+    payload = state.model_dump(mode="json")
+    return {
+        scene_id: SceneLedgerEntry.model_validate(entry)
+        for scene_id, entry in dict(payload.get("scene_ledger") or {}).items()
+    }
+
+
+def scene_stage_reached(state: ProjectState, scene_id: str, stage: SceneStage) -> bool:
+    entry = get_scene_ledger(state).get(scene_id)
+    if entry is None:
+        return False
+    return SCENE_STAGE_SEQUENCE.index(entry.stage) >= SCENE_STAGE_SEQUENCE.index(stage)
+
+
+def _with_scene_entry(state: ProjectState, entry: SceneLedgerEntry) -> ProjectState:
+    payload = state.model_dump(mode="json")
+    ledger = dict(payload.get("scene_ledger") or {})
+    ledger[entry.scene_id] = entry.model_dump(mode="json")
+    payload["scene_ledger"] = dict(sorted(ledger.items()))
+
+    normalized = normalize_state_payload(payload)
+    return ProjectState.model_validate(normalized)
+
+
+def advance_scene_stage(
+    state: ProjectState,
+    scene_id: str,
+    stage: SceneStage,
+    *,
+    artifact_hashes: Optional[dict[str, str]] = None,
+    rewind: bool = False,
+) -> ProjectState:
+    """
+    Move one scene forward to `stage`, clearing its failure status and attempt count.
+
+    Recording an earlier stage than the current one is a no-op unless `rewind` is
+    set, which is used when a stage's artifact is regenerated and every later stage
+    has to be redone. `artifact_hashes` are merged into the hashes already recorded
+    for the scene.
+    """
+    if not rewind and scene_stage_reached(state, scene_id, stage):
+        return state
+
+    previous = get_scene_ledger(state).get(scene_id)
+    hashes = dict(previous.artifact_hashes) if previous is not None else {}
+    hashes.update(artifact_hashes or {})
+    return _with_scene_entry(
+        state,
+        SceneLedgerEntry(
+            scene_id=scene_id,
+            stage=stage,
+            artifact_hashes=hashes,
+            updated_at=utc_timestamp(),
+        ),
+    )
+
+
+def reset_scene_ledger(state: ProjectState) -> ProjectState:
+    payload = state.model_dump(mode="json")
+    if not payload.get("scene_ledger"):
+        return state
+    payload["scene_ledger"] = {}
+    normalized = normalize_state_payload(payload)
+    return ProjectState.model_validate(normalized)
+
+
 def normalize_error_signature(
     *,
     phase: PhaseName,
@@ -250,6 +369,63 @@ def _is_non_empty(value: Optional[str]) -> bool:
     return bool(value and value.strip())
 
 
+@dataclass(frozen=True)
+class _RetryClassification:
+    same_signature_as_previous: bool
+    has_meaningful_delta: bool
+    blind_retry: bool
+    loop_risk: bool
+    blocked_reason: Optional[str]
+
+
+def _classify_retry(
+    *,
+    attempt: int,
+    attempt_limit: int,
+    signature: str,
+    previous_signature: Optional[str],
+    retryable: bool,
+    attempt_delta: Optional[str],
+    evidence_token: Optional[str],
+    force_block: bool,
+) -> _RetryClassification:
+    """Blind-retry, loop and budget rules shared by phase-level and scene-level failures."""
+    same_signature_as_previous = bool(previous_signature) and previous_signature == signature
+    has_meaningful_delta = (
+        attempt == 1
+        or not same_signature_as_previous
+        or _is_non_empty(attempt_delta)
+        or _is_non_empty(evidence_token)
+    )
+    blind_retry = retryable and attempt > 1 and not has_meaningful_delta
+    loop_risk = (
+        retryable
+        and same_signature_as_previous
+        and not has_meaningful_delta
+        and attempt >= LOOP_SIGNATURE_REPEAT_BLOCK_THRESHOLD
+    )
+
+    blocked_reason: Optional[str] = None
+    if force_block:
+        blocked_reason = "FORCE_BLOCK"
+    elif not retryable:
+        blocked_reason = "NON_RETRYABLE_FAILURE"
+    elif blind_retry:
+        blocked_reason = "NO_NEW_EVIDENCE"
+    elif loop_risk:
+        blocked_reason = "LOOP_SIGNATURE_REPEAT"
+    elif attempt >= attempt_limit:
+        blocked_reason = "RETRY_BUDGET_EXHAUSTED"
+
+    return _RetryClassification(
+        same_signature_as_previous=same_signature_as_previous,
+        has_meaningful_delta=has_meaningful_delta,
+        blind_retry=blind_retry,
+        loop_risk=loop_risk,
+        blocked_reason=blocked_reason,
+    )
+
+
 def record_phase_failure(
     state: ProjectState,
     *,
@@ -287,32 +463,21 @@ def record_phase_failure(
         error_message=error_message,
     )
 
-    same_signature_as_previous = bool(previous_signature) and previous_signature == signature
-    has_meaningful_delta = (
-        attempt == 1
-        or not same_signature_as_previous
-        or _is_non_empty(attempt_delta)
-        or _is_non_empty(evidence_token)
-    )
-    blind_retry = retryable and attempt > 1 and not has_meaningful_delta
-    loop_risk = (
-        retryable
-        and same_signature_as_previous
-        and not has_meaningful_delta
-        and attempt >= LOOP_SIGNATURE_REPEAT_BLOCK_THRESHOLD
+    retry = _classify_retry(
+        attempt=attempt,
+        attempt_limit=phase_limit,
+        signature=signature,
+        previous_signature=previous_signature,
+        retryable=retryable,
+        attempt_delta=attempt_delta,
+        evidence_token=evidence_token,
+        force_block=force_block,
     )
-
-    blocked_reason: Optional[str] = None
-    if force_block:
-        blocked_reason = "FORCE_BLOCK"
-    elif not retryable:
-        blocked_reason = "NON_RETRYABLE_FAILURE"
-    elif blind_retry:
-        blocked_reason = "NO_NEW_EVIDENCE"
-    elif loop_risk:
-        blocked_reason = "LOOP_SIGNATURE_REPEAT"
-    elif attempt >= phase_limit:
-        blocked_reason = "RETRY_BUDGET_EXHAUSTED"
+    same_signature_as_previous = retry.same_signature_as_previous
+    has_meaningful_delta = retry.has_meaningful_delta
+    blind_retry = retry.blind_retry
+    loop_risk = retry.loop_risk
+    blocked_reason = retry.blocked_reason
 
     blocked = blocked_reason is not None
     payload["phase_status"] = "blocked" if blocked else "active"
@@ -352,6 +517,68 @@ def record_phase_failure(
     return ProjectState.model_validate(normalized)
 
 
+def record_scene_failure(
+    state: ProjectState,
+    scene_id: str,
+    *,
+    phase: PhaseName,
+    error_code: str,
+    error_message: str,
+    gate: str = "runtime",
+    retryable: bool = True,
+    error_signature: Optional[str] = None,
+    attempt_delta: Optional[str] = None,
+    evidence_token: Optional[str] = None,
+    max_attempts_by_phase: Optional[dict[PhaseName, int]] = None,
+    force_block: bool = False,
+    rewind_to: Optional[SceneStage] = None,
+) -> ProjectState:
+    """
+    Record one failed attempt for a single scene in the scene ledger.
+
+    The scene keeps its last completed stage, or drops back to `rewind_to` when a
+    later gate invalidated work an earlier stage produced. Its attempt count and error signature
+    go through the same blind-retry, loop and retry-budget rules as
+    `record_phase_failure`, with the phase's `max_attempts` applied per scene.
+    A scene that trips one of them is marked `blocked` with the reason.
+    """
+    previous = get_scene_ledger(state).get(scene_id)
+    attempt = (previous.attempts if previous is not None else 0) + 1
+    signature = error_signature or normalize_error_signature(
+        phase=phase,
+        gate=gate,
+        error_code=error_code,
+        error_message=error_message,
+    )
+    retry = _classify_retry(
+        attempt=attempt,
+        attempt_limit=(max_attempts_by_phase or DEFAULT_MAX_ATTEMPTS)[phase],
+        signature=signature,
+        previous_signature=previous.last_error_signature if previous is not None else None,
+        retryable=retryable,
+        attempt_delta=attempt_delta,
+        evidence_token=evidence_token,
+        force_block=force_block,
+    )
+    return _with_scene_entry(
+        state,
+        SceneLedgerEntry(
+            scene_id=scene_id,
+            stage=rewind_to or (previous.stage if previous is not None else "scaffolded"),
+            status="blocked" if retry.blocked_reason is not None else "failed",
+            attempts=attempt,
+            last_error_signature=signature,
+            blocked_reason=retry.blocked_reason,
+            artifact_hashes=dict(previous.artifact_hashes) if previous is not None else {},
+            updated_at=utc_timestamp(),
+        ),
+    )
+
+
+def blocked_scene_ids(state: ProjectState) -> list[str]:
+    return [scene_id for scene_id, entry in get_scene_ledger(state).items() if entry.status == "blocked"]
+
+
 def clear_phase_failures(
     state: ProjectState,
     *,
@@ -367,6 +594,14 @@ def clear_phase_failures(
 
     payload["failure_context"] = {}
     if payload.get("phase_status") == "blocked":
+        # A manual resume also gives failed and blocked scenes a fresh per-scene budget;
+        # routine clears between successful steps keep per-scene attempt history.
+        ledger = dict(payload.get("scene_ledger") or {})
+        for scene_id, entry in ledger.items():
+            if entry.get("status") != "ok":
+                ledger[scene_id] = {**entry, "status": "ok", "attempts": 0, "blocked_reason": None}
+        if ledger:
+            payload["scene_ledger"] = ledger
         payload["phase_status"] = "active"
         payload["history"] = [
             *payload["history"],
@@ -0,0 +1,309 @@
+"""
+Long-lived local harness server for the orchestrator.
+
+`build_video.sh` otherwise pays a fresh interpreter start (pydantic, jinja2, xai_sdk,
+grpc and prompt manifest validation) for every state read, event line and phase call.
+This daemon keeps those modules warm and executes the existing CLI entry points
+in-process over a Unix-socket JSON-RPC 2.0 protocol (one newline-terminated request
+per connection). `scripts/wd_rpc.py` is the matching stdlib-only client.
+
+The caller's cwd and environment are process-global, so only requests that carry
+the same cwd and environment run concurrently. A request that needs a different
+context waits until the running ones finish, and requests that arrive after it
+queue behind it. Each request's stdout/stderr go to its own buffers, including
+output from threads the request starts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import importlib.util
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+SOCKET_ENV_VAR = "WD_HARNESS_DAEMON_SOCKET"
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    exit_code: int
+    stdout: str
+    stderr: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"exit_code": self.exit_code, "stdout": self.stdout, "stderr": self.stderr}
+
+
+def _load_script(name: str, scripts_dir: Path) -> ModuleType:
+    module_name = f"wd_scripts.{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, scripts_dir / f"{name}.py")
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load script module: {scripts_dir / f'{name}.py'}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _exit_code_from(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    # `sys.exit("message")` prints the message and exits 1.
+    print(result, file=sys.stderr)
+    return 1
+
+
+_CAPTURE_ATTR = "_wd_request_capture"
+
+
+def _current_capture() -> tuple[io.StringIO, io.StringIO] | None:
+    return getattr(threading.current_thread(), _CAPTURE_ATTR, None)
+
+
+class _RoutedStream:
+    """`sys.stdout`/`sys.stderr` stand-in that writes to the current request's buffer."""
+
+    def __init__(self, fallback: Any, index: int) -> None:
+        self._fallback = fallback
+        self._index = index
+
+    def _target(self) -> Any:
+        capture = _current_capture()
+        return capture[self._index] if capture is not None else self._fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fallback, name)
+
+
+_thread_start = threading.Thread.start
+
+
+def _start_with_capture(thread: threading.Thread) -> None:
+    # Worker threads started by a request (scene pools, render pools) inherit its buffers.
+    capture = _current_capture()
+    if capture is not None and not hasattr(thread, _CAPTURE_ATTR):
+        setattr(thread, _CAPTURE_ATTR, capture)
+    _thread_start(thread)
+
+
+class HarnessDaemon:
+    """Dispatch table of in-process CLI entry points, keyed by RPC method name."""
+
+    def __init__(self, scripts_dir: Path = SCRIPTS_DIR) -> None:
+        self.scripts_dir = Path(scripts_dir)
+        self._context = threading.Condition()
+        self._active = 0
+        self._active_context: tuple[Any, ...] | None = None
+        self._waiting = 0
+        self._saved: tuple[dict[str, str], str, Any, Any] | None = None
+        self._entry_points: dict[str, Callable[[list[str]], Any]] = {}
+
+    def warm(self) -> None:
+        """Import every entry point up front so the first request is as fast as the rest."""
+        self._entry_points = {
+            "update_project_state": _load_script("update_project_state", self.scripts_dir).main,
+            "runtime_phase_contracts": _load_script("runtime_phase_contracts", self.scripts_dir).main,
+            "harness.cli": importlib.import_module("harness.cli").main,
+        }
+        importlib.import_module("harness.prompts").warm_prompt_registry()
+
+    @property
+    def methods(self) -> list[str]:
+        return sorted(self._entry_points)
+
+    def run(
+        self,
+        method: str,
+        argv: list[str],
+        *,
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+    ) -> CommandResult:
+        if not self._entry_points:
+            self.warm()
+        entry_point = self._entry_points[method]
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        context = (cwd, tuple(sorted(env.items())) if env is not None else None)
+        request_thread = threading.current_thread()
+        self._enter_context(context, cwd=cwd, env=env)
+        setattr(request_thread, _CAPTURE_ATTR, (stdout, stderr))
+        try:
+            try:
+                exit_code = _exit_code_from(entry_point(list(argv)))
+            except SystemExit as exc:
+                exit_code = _exit_code_from(exc.code)
+            except Exception as exc:
+                print(f"Harness daemon error in {method}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                exit_code = 1
+        finally:
+            delattr(request_thread, _CAPTURE_ATTR)
+            self._exit_context()
+
+        return CommandResult(exit_code=exit_code, stdout=stdout.getvalue(), stderr=stderr.getvalue())
+
+    def _enter_context(self, context: tuple[Any, ...], *, cwd: str | None, env: dict[str, str] | None) -> None:
+        """Join the running requests when they share `context`, else wait and install it."""
+        with self._context:
+            if self._active and (self._active_context != context or self._waiting):
+                self._waiting += 1
+                try:
+                    self._context.wait_for(lambda: not self._active)
+                finally:
+                    self._waiting -= 1
+            if not self._active:
+                self._saved = (dict(os.environ), os.getcwd(), sys.stdout, sys.stderr)
+                if env is not None:
+                    os.environ.clear()
+                    os.environ.update(env)
+                if cwd is not None:
+                    os.chdir(cwd)
+                sys.stdout = _RoutedStream(sys.stdout, 0)
+                sys.stderr = _RoutedStream(sys.stderr, 1)
+                threading.Thread.start = _start_with_capture
+                self._active_context = context
+            self._active += 1
+
+    def _exit_context(self) -> None:
+        with self._context:
+            self._active -= 1
+            if self._active:
+                return
+            saved_env, saved_cwd, sys.stdout, sys.stderr = self._saved
+            threading.Thread.start = _thread_start
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+            self._saved = None
+            self._active_context = None
+            self._context.notify_all()
+
+    def handle_request(self, raw: bytes) -> dict[str, Any]:
+        try:
+            request = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            return _error_response(None, JSONRPC_PARSE_ERROR, f"parse error: {exc}")
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, JSONRPC_INVALID_REQUEST, "request must be an object with a method")
+
+        if not self._entry_points:
+            self.warm()
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params") or {}
+
+        if method == "ping":
+            client_pool = importlib.import_module("harness.client_pool").CLIENT_POOL
+            return _result_response(
+                request_id,
+                {"methods": self.methods, "pid": os.getpid(), "client_pool": client_pool.stats()},
+            )
+
+        if method not in self._entry_points:
+            return _error_response(request_id, JSONRPC_METHOD_NOT_FOUND, f"unknown method: {method}")
+
+        argv = params.get("argv")
+        env = params.get("env")
+        cwd = params.get("cwd")
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            return _error_response(request_id, JSONRPC_INVALID_PARAMS, "params.argv must be a list of strings")
+        if env is not None and not isinstance(env, dict):
+            return _error_response(request_id, JSONRPC_INVALID_PARAMS, "params.env must be an object")
+        if cwd is not None and not isinstance(cwd, str):
+            return _error_response(request_id, JSONRPC_INVALID_PARAMS, "params.cwd must be a string")
+
+        result = self.run(method, argv, cwd=cwd, env=env)
+        return _result_response(request_id, result.as_dict())
+
+
+def _result_response(request_id: Any, result: dict[str, Any]) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        raw = self.rfile.readline()
+        if not raw:
+            return
+        response = self.server.harness.handle_request(raw)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class HarnessDaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, daemon: HarnessDaemon) -> None:
+        self.harness = daemon
+        socket_path = Path(socket_path)
+        if socket_path.exists():
+            socket_path.unlink()
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            Path(self.server_address).unlink()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Local JSON-RPC server for orchestrator harness calls")
+    parser.add_argument(
+        "--socket",
+        default=os.getenv(SOCKET_ENV_VAR),
+        help=f"Unix socket path to listen on (default: ${SOCKET_ENV_VAR})",
+    )
+    parser.add_argument("--scripts-dir", default=str(SCRIPTS_DIR))
+    args = parser.parse_args(argv)
+
+    if not args.socket:
+        print(f"Error: --socket or {SOCKET_ENV_VAR} is required.", file=sys.stderr)
+        return 1
+
+    daemon = HarnessDaemon(Path(args.scripts_dir))
+    daemon.warm()
+    # SIGTERM (the orchestrator's EXIT trap) unwinds through server_close so the socket is removed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with HarnessDaemonServer(Path(args.socket), daemon) as server:
+        print(f"Harness daemon listening on {args.socket} (pid {os.getpid()})", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
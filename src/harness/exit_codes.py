@@ -12,6 +12,7 @@ class HarnessExitCode(IntEnum):
     SCHEMA_VIOLATION = 3
     POLICY_VIOLATION = 4
     MANUAL_GATE_REQUIRED = 5
+    THROTTLED = 6
 
 
 @dataclass(frozen=True)
@@ -78,8 +79,19 @@ EXIT_CODE_POLICIES: dict[HarnessExitCode, ExitCodePolicy] = {
         default_action="wait_for_human_action",
         retryable=False,
     ),
+    HarnessExitCode.THROTTLED: ExitCodePolicy(
+        category="rate_limit",
+        gate="runtime",
+        owner_component="harness",
+        machine_error_code="THROTTLED",
+        default_action="retry_after_backoff",
+        retryable=True,
+    ),
 }
 
+# Exit codes that are retried without consuming the phase retry budget.
+BUDGET_EXEMPT_EXIT_CODES: frozenset[HarnessExitCode] = frozenset({HarnessExitCode.THROTTLED})
+
 
 def get_exit_code_policy(code: Union[int, HarnessExitCode], phase: Optional[str] = None) -> ExitCodePolicy:
     enum_code = HarnessExitCode(code)
@@ -0,0 +1,108 @@
+"""
+Media duration probing for render and assembly contracts.
+
+Durations recorded in `RenderManifest` / `AssemblyManifest` are measured from the
+files on disk rather than taken from estimates, so the duration tolerance checks
+in section 16 compare real media. Probes go through a shared
+`wet_donkey_voice.probe.MediaProbe` whose stat-keyed cache persists at
+`WD_PROBE_CACHE_PATH` (default `projects/probe_cache.json`), so unchanged files
+are not re-probed across runs. New entries are written back once per render or
+assembly run by `flush_shared_media_probe`, not after every probe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+_voice_probe = importlib.import_module("wet_donkey_voice.probe")
+FFPROBE_BIN_ENV_VAR = _voice_probe.FFPROBE_BIN_ENV_VAR
+MediaProbe = _voice_probe.MediaProbe
+ffprobe_bin = _voice_probe.ffprobe_bin
+
+PROBE_CACHE_PATH_ENV_VAR = "WD_PROBE_CACHE_PATH"
+DEFAULT_PROBE_CACHE_PATH = Path(__file__).resolve().parents[2] / "projects" / "probe_cache.json"
+
+DurationProbe = Callable[[Path], float]
+
+_shared_probe = None
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def shared_media_probe():
+    """Process-wide `MediaProbe` backed by the `WD_PROBE_CACHE_PATH` cache file."""
+    global _shared_probe
+    if _shared_probe is None:
+        _shared_probe = MediaProbe(os.getenv(PROBE_CACHE_PATH_ENV_VAR, "").strip() or DEFAULT_PROBE_CACHE_PATH)
+    return _shared_probe
+
+
+def flush_shared_media_probe() -> None:
+    """Persist the shared probe's new entries; a no-op when nothing was probed."""
+    if _shared_probe is not None:
+        _shared_probe.flush()
+
+
+def probe_duration_seconds(path: Path) -> float:
+    """Container duration of `path` in seconds; ValueError when it cannot be measured."""
+    return shared_media_probe().duration_seconds(path)
+
+
+@dataclass(frozen=True)
+class VideoStreamProfile:
+    """Stream parameters that must match for concat-demuxer stream copy."""
+
+    codec_name: str
+    width: int
+    height: int
+    frame_rate: str
+    pix_fmt: str
+
+
+VideoProfileProbe = Callable[[Path], VideoStreamProfile]
+
+
+def probe_video_profile(path: Path) -> VideoStreamProfile:
+    """Codec parameters of the first video stream of `path`."""
+    if not path.exists():
+        raise ValueError(f"cannot probe missing media file: {path}")
+
+    command = [
+        ffprobe_bin(),
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=codec_name,width,height,r_frame_rate,pix_fmt",
+        "-of",
+        "json",
+        str(path),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"ffprobe failed for {path} (exit {result.returncode}): {result.stderr.strip()}")
+    try:
+        stream = json.loads(result.stdout)["streams"][0]
+        return VideoStreamProfile(
+            codec_name=str(stream["codec_name"]),
+            width=int(stream["width"]),
+            height=int(stream["height"]),
+            frame_rate=str(stream["r_frame_rate"]),
+            pix_fmt=str(stream["pix_fmt"]),
+        )
+    except (json.JSONDecodeError, LookupError, TypeError, ValueError) as exc:
+        raise ValueError(f"ffprobe returned no video stream for {path}") from exc
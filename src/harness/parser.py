@@ -6,6 +6,7 @@ from typing import Any
 from pydantic import ValidationError
 
 from .schemas import SCHEMA_REGISTRY_CONTRACT_VERSION, get_schema_for_phase
+from .schemas.narration import NarrationScene
 
 PARSER_SCHEMA_CONTRACT_VERSION = "1.0.0"
 
@@ -112,3 +113,75 @@ def validate_timing_execution(response):
     raise SemanticValidationError(
         "Scene build must include code_execution timing validation."
     )
+
+
+class NarrationStreamParser:
+    """
+    Incrementally extract completed `NarrationScene` objects from a streamed
+    `Narration` JSON document.
+
+    Chunks are fed as they arrive. The scanner tracks string/escape state, bracket
+    depth and whether the top-level object expects a key or a value, so only a
+    `"scenes"` key (never a string value) selects the array whose elements are
+    parsed and validated as soon as their closing brace is seen. The final payload is still
+    validated in full by `validate_phase_payload` once the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = -1
+        self._top_level_key: str | None = None
+        self._expecting_key = False
+        self._in_scenes = False
+        self._element_start = -1
+        self.scenes: list[NarrationScene] = []
+
+    def feed(self, delta: str) -> list[NarrationScene]:
+        """Consume one chunk and return the scenes completed by it, in order."""
+        completed: list[NarrationScene] = []
+        self._text += delta
+        text = self._text
+
+        for index in range(self._position, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expecting_key:
+                        self._top_level_key = text[self._string_start + 1:index]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif self._depth == 1 and char in ",:":
+                # In the top-level object a comma is followed by a key, a colon by its value.
+                self._expecting_key = char == ","
+            elif char in "{[":
+                if char == "{" and self._depth == 0:
+                    self._expecting_key = True
+                if char == "[" and self._depth == 1 and self._top_level_key == "scenes":
+                    self._in_scenes = True
+                elif char == "{" and self._in_scenes and self._depth == 2:
+                    self._element_start = index
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._in_scenes and self._depth == 2 and self._element_start >= 0:
+                    scene = NarrationScene.model_validate(json.loads(text[self._element_start:index + 1]))
+                    self.scenes.append(scene)
+                    completed.append(scene)
+                    self._element_start = -1
+                elif char == "]" and self._depth == 1:
+                    self._in_scenes = False
+
+        self._position = len(text)
+        return completed
@@ -0,0 +1,178 @@
+"""
+Opt-in pipelined execution of the narration -> build_scenes -> scene_qc chain.
+
+In the canonical flow every phase finishes for all scenes before the next one
+starts. With `--pipelined` (`WD_PIPELINED=1` in `build_video.sh`) the narration
+call is streamed, and each scene is scaffolded, built and QC'd as soon as its
+narration entry has arrived. Per-scene progress is recorded in the `scene_ledger`
+of project_state.json, while the project-level `phase` stays `narration` until
+the full narration validates. The `build_scenes` and `scene_qc` batches that the
+orchestrator runs afterwards skip every scene the ledger already reports as done.
+
+A failing scene chain does not fail narration: the scene is left at its last
+completed stage and is picked up again by the regular batch of the next phase.
+"""
+
+from __future__ import annotations
+
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from .batch import (
+    DEFAULT_SCENE_CONCURRENCY,
+    STATE_WRITE_LOCK,
+    BatchResult,
+    SceneOutcome,
+    clear_scene_ledger,
+    exit_code_for_exception,
+    record_scene_failures,
+    record_scene_stage,
+    require_scene_qc_pass,
+)
+from .build_fingerprint import record_build_fingerprint, scene_build_fingerprint, scene_build_is_current
+from .client import generate_scene, run_scene_qc, stream_narration
+from .contracts.runtime_pipeline import (
+    SceneManifest,
+    SceneManifestEntry,
+    build_partial_scene_manifest,
+    build_scene_spec,
+    ensure_scene_scaffolds,
+    write_narration_script,
+    write_scene_qc_report,
+)
+from .contracts.scaffold import inject_scene_body_file
+from .contracts.state import load_state, save_state_atomic, update_state_key
+from .exit_codes import HarnessExitCode
+from .schemas.narration import Narration, NarrationScene
+from .schemas.plan import Plan
+from .session import PipelineTrainingSession
+
+
+class NarrationProgressWriter:
+    """
+    `stream_narration` callback that persists each completed scene as it arrives.
+
+    The scenes received so far are stored under the `narration_progress` state key
+    (the canonical `narration` key is only written once the full payload validates)
+    and `narration_script.py` is regenerated for them, so downstream tooling can
+    start on the leading scenes before the stream ends.
+    """
+
+    def __init__(self, plan: Plan, project_dir: str | Path) -> None:
+        self.plan = plan
+        self.project_dir = Path(project_dir)
+        self.scenes: list[NarrationScene] = []
+
+    def __call__(self, index: int, scene: NarrationScene) -> SceneManifest | None:
+        """Persist the new scene; return the manifest of the scenes so far, or None on a plan mismatch."""
+        del self.scenes[index:]
+        self.scenes.append(scene)
+
+        state_file = self.project_dir / "project_state.json"
+        progress = {
+            "completed_scenes": len(self.scenes),
+            "total_scenes": len(self.plan.scenes),
+            "scenes": [item.model_dump(mode="json") for item in self.scenes],
+        }
+        with STATE_WRITE_LOCK:
+            state = load_state(state_file)
+            save_state_atomic(state_file, update_state_key(state, "narration_progress", progress))
+
+        print(f"narration scene {len(self.scenes)}/{len(self.plan.scenes)} streamed: {scene.scene_title}")
+        try:
+            manifest = build_partial_scene_manifest(self.plan, self.scenes)
+        except ValueError as exc:
+            # prepare-scene-manifest reports the mismatch against the full narration.
+            print(f"Warning: narration_script.py not updated: {exc}", file=sys.stderr)
+            return None
+        write_narration_script(self.project_dir, manifest)
+        return manifest
+
+
+class ScenePipeline:
+    """Streams narration and runs each scene's scaffold -> build -> QC chain as its entry lands."""
+
+    def __init__(
+        self,
+        session: PipelineTrainingSession,
+        project_dir: Path,
+        plan: Plan,
+        *,
+        max_concurrency: int = DEFAULT_SCENE_CONCURRENCY,
+        min_score: float = 0.7,
+        force: bool = False,
+    ) -> None:
+        self.session = session
+        self.project_dir = project_dir
+        self.plan = plan
+        self.max_concurrency = max_concurrency
+        self.min_score = min_score
+        self.force = force
+        self.progress = NarrationProgressWriter(plan, project_dir)
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[str, Future[SceneOutcome]] = {}
+
+    def _on_scene(self, index: int, scene: NarrationScene) -> None:
+        manifest = self.progress(index, scene)
+        if manifest is None:
+            return
+        entry = manifest.scenes[index]
+        if entry.scene_id in self._futures:
+            # A retried stream replays scenes from the start; their chain is already running.
+            # Changed narration is still picked up by the build fingerprint in build_scenes.
+            return
+        record_scene_stage(self.project_dir, entry.scene_id, "narrated")
+        ensure_scene_scaffolds(self.project_dir, manifest)
+        record_scene_stage(self.project_dir, entry.scene_id, "scaffolded")
+        self._futures[entry.scene_id] = self._executor.submit(self._scene_chain, entry)
+
+    def _scene_chain(self, entry: SceneManifestEntry) -> SceneOutcome:
+        scene_file = self.project_dir / entry.scene_file
+        phase = "build_scenes"
+        try:
+            scene_spec = build_scene_spec(entry)
+            fingerprint = scene_build_fingerprint(scene_spec)
+            if not self.force and scene_build_is_current(self.project_dir, entry.scene_id, scene_file, fingerprint):
+                print(f"build_scenes skipped for {entry.scene_id}: already up to date")
+            else:
+                scene_build = generate_scene(self.session, scene_spec)
+                inject_scene_body_file(scene_file, scene_build.scene_body)
+                print(f"Scene body injected into {scene_file}")
+                record_build_fingerprint(self.project_dir, entry.scene_id, fingerprint)
+            record_scene_stage(self.project_dir, entry.scene_id, "built", artifacts={"scene_file": scene_file})
+
+            phase = "scene_qc"
+            qc_result = run_scene_qc(self.session, str(scene_file))
+            report_path = write_scene_qc_report(self.project_dir, entry, qc_result)
+            print(f"Scene QC report written to {report_path}")
+            require_scene_qc_pass(self.project_dir, entry, min_score=self.min_score)
+            record_scene_stage(self.project_dir, entry.scene_id, "qc_passed", artifacts={"qc_report": report_path})
+        except Exception as exc:
+            print(f"pipelined {phase} deferred for {entry.scene_id}: {exc}", file=sys.stderr)
+            outcome = SceneOutcome(
+                scene_id=entry.scene_id,
+                exit_code=exit_code_for_exception(exc),
+                error_message=f"{type(exc).__name__}: {exc}",
+            )
+            record_scene_failures(self.project_dir, BatchResult(phase=phase, outcomes=(outcome,)))
+            return outcome
+        return SceneOutcome(scene_id=entry.scene_id, exit_code=HarnessExitCode.SUCCESS)
+
+    def run(self) -> tuple[Narration, list[SceneOutcome]]:
+        """
+        Stream narration and wait for every started scene chain.
+
+        Narration errors propagate (queued chains are cancelled, in-flight ones finish);
+        scene chain failures are returned as outcomes.
+        """
+        clear_scene_ledger(self.project_dir)
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="wd-pipeline")
+        self._executor = executor
+        try:
+            narration = stream_narration(self.session, self.plan, self._on_scene)
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
+        return narration, [future.result() for future in self._futures.values()]
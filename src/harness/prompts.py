@@ -1,4 +1,7 @@
 # harness/prompts.py
+import hashlib
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 import jinja2
 
@@ -29,13 +32,6 @@ TOOL_DEFINITIONS: dict[str, str] = {
 }
 
 
-def _resolve_phase_dir(phase_name: str) -> Path:
-    phase_dir = PROMPTS_DIR / phase_name
-    if not phase_dir.is_dir():
-        raise FileNotFoundError(f"Prompt directory not found for phase: {phase_name}")
-    return phase_dir
-
-
 def _validate_phase_contracts(phase_dir: Path) -> None:
     manifest = load_prompt_manifest(phase_dir)
     discovered = discover_template_variables(phase_dir)
@@ -72,25 +68,37 @@ def _tool_contract_block(manifest: PromptManifest) -> str:
     )
 
 
-def compose_prompts(phase_name: str, **kwargs) -> dict:
-    """
-    Renders the system and user prompts for a given phase using Jinja2.
+PROMPT_FILES = ("manifest.yaml", "system.md", "user.md")
 
-    Args:
-        phase_name: The name of the phase (e.g., '00_plan').
-        **kwargs: Key-value pairs to render into the templates.
 
-    Returns:
-        A dictionary with 'system' and 'user' prompt strings.
-    """
-    phase_dir = _resolve_phase_dir(phase_name)
+@dataclass(frozen=True)
+class CompiledPhasePrompt:
+    """Validated manifest and compiled templates for one prompt phase directory."""
+
+    phase_dir: Path
+    signature: tuple[tuple[str, int, int], ...]
+    fingerprint: str
+    manifest: PromptManifest
+    system_template: jinja2.Template
+    user_template: jinja2.Template
+    tool_contract_block: str
 
-    system_template_file = phase_dir / "system.md"
-    user_template_file = phase_dir / "user.md"
 
-    if not system_template_file.exists():
+def _file_signature(phase_dir: Path) -> tuple[tuple[str, int, int], ...]:
+    signature = []
+    for name in PROMPT_FILES:
+        try:
+            stat = (phase_dir / name).stat()
+        except FileNotFoundError:
+            continue
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _compile_phase(phase_name: str, phase_dir: Path, signature) -> CompiledPhasePrompt:
+    if not (phase_dir / "system.md").exists():
         raise FileNotFoundError(f"System prompt not found for phase: {phase_name}")
-    if not user_template_file.exists():
+    if not (phase_dir / "user.md").exists():
         raise FileNotFoundError(f"User prompt not found for phase: {phase_name}")
 
     manifest = load_prompt_manifest(phase_dir)
@@ -98,16 +106,103 @@ def compose_prompts(phase_name: str, **kwargs) -> dict:
     validate_manifest_template_alignment(manifest, discovered)
     validate_manifest_schema_alignment(manifest)
     validate_manifest_tool_policy(manifest)
-    validate_runtime_variables(manifest, kwargs.keys())
+
+    digest = hashlib.sha256()
+    for name in PROMPT_FILES:
+        digest.update(name.encode("utf-8") + b"\0")
+        digest.update((phase_dir / name).read_bytes())
 
     environment = jinja2.Environment(
         loader=jinja2.FileSystemLoader(phase_dir),
         undefined=jinja2.StrictUndefined,
+        auto_reload=False,
     )
-    
-    system_prompt = environment.get_template("system.md").render(**kwargs)
-    system_prompt = f"{system_prompt.rstrip()}\n\n{_tool_contract_block(manifest)}\n"
-    user_prompt = environment.get_template("user.md").render(**kwargs)
+    return CompiledPhasePrompt(
+        phase_dir=phase_dir,
+        signature=signature,
+        fingerprint=digest.hexdigest(),
+        manifest=manifest,
+        system_template=environment.get_template("system.md"),
+        user_template=environment.get_template("user.md"),
+        tool_contract_block=_tool_contract_block(manifest),
+    )
+
+
+class PromptRegistry:
+    """
+    Process-wide cache of validated prompt phases.
+
+    A phase is validated and compiled once, then reused until the mtime or size of
+    its manifest or templates changes, so long-lived batch and daemon processes only
+    pay for contract validation when prompt assets are edited.
+    """
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR) -> None:
+        self.prompts_dir = Path(prompts_dir)
+        self._compiled: dict[str, CompiledPhasePrompt] = {}
+        self._lock = threading.Lock()
+
+    def get(self, phase_name: str) -> CompiledPhasePrompt:
+        phase_dir = self.prompts_dir / phase_name
+        if not phase_dir.is_dir():
+            raise FileNotFoundError(f"Prompt directory not found for phase: {phase_name}")
+
+        signature = _file_signature(phase_dir)
+        compiled = self._compiled.get(phase_name)
+        if compiled is not None and compiled.signature == signature:
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled.get(phase_name)
+            if compiled is None or compiled.signature != signature:
+                compiled = _compile_phase(phase_name, phase_dir, signature)
+                self._compiled[phase_name] = compiled
+        return compiled
+
+    def warm(self) -> list[str]:
+        """Validate and compile every phase directory; returns the phase names loaded."""
+        phases = sorted(path.name for path in self.prompts_dir.iterdir() if path.is_dir())
+        for phase_name in phases:
+            self.get(phase_name)
+        return phases
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+
+
+PROMPT_REGISTRY = PromptRegistry()
+
+
+def warm_prompt_registry() -> list[str]:
+    return PROMPT_REGISTRY.warm()
+
+
+def prompt_template_fingerprint(phase_name: str) -> str:
+    """Content hash of a phase's manifest and templates."""
+    return PROMPT_REGISTRY.get(phase_name).fingerprint
+
+
+def compose_prompts(phase_name: str, **kwargs) -> dict:
+    """
+    Renders the system and user prompts for a given phase using Jinja2.
+
+    Manifest validation and template compilation are served from `PROMPT_REGISTRY`;
+    only the runtime variables are checked per call.
+
+    Args:
+        phase_name: The name of the phase (e.g., '00_plan').
+        **kwargs: Key-value pairs to render into the templates.
+
+    Returns:
+        A dictionary with 'system' and 'user' prompt strings.
+    """
+    compiled = PROMPT_REGISTRY.get(phase_name)
+    validate_runtime_variables(compiled.manifest, kwargs.keys())
+
+    system_prompt = compiled.system_template.render(**kwargs)
+    system_prompt = f"{system_prompt.rstrip()}\n\n{compiled.tool_contract_block}\n"
+    user_prompt = compiled.user_template.render(**kwargs)
 
     return {
         "system": system_prompt,
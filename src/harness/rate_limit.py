@@ -0,0 +1,355 @@
+"""
+Client-side rate limiting for xAI phase calls.
+
+Every `chat.sample()` goes through the process-wide `RateLimiter`, which combines:
+
+- an optional token bucket (`WD_XAI_REQUESTS_PER_MINUTE`) that paces request starts,
+- an AIMD concurrency window (`WD_XAI_MAX_CONCURRENCY`). The window grows by
+  1/limit per successful call and halves when the API throttles,
+- coordinated, jittered backoff on RESOURCE_EXHAUSTED. The server's retry-after
+  hint is honored and all workers pause together.
+
+Throttling is retried inside the harness. Only when `WD_XAI_THROTTLE_RETRIES` is
+exhausted does the call fail with `ThrottledError` (exit code THROTTLED), which the
+orchestrator does not count against the phase retry budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+import grpc
+
+REQUESTS_PER_MINUTE_ENV_VAR = "WD_XAI_REQUESTS_PER_MINUTE"
+MAX_CONCURRENCY_ENV_VAR = "WD_XAI_MAX_CONCURRENCY"
+THROTTLE_RETRIES_ENV_VAR = "WD_XAI_THROTTLE_RETRIES"
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_THROTTLE_RETRIES = 5
+DEFAULT_BASE_DELAY_SECONDS = 2.0
+DEFAULT_MAX_DELAY_SECONDS = 60.0
+DEFAULT_JITTER = 0.2
+
+_RETRY_AFTER_METADATA_KEYS = ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+_RETRY_AFTER_DETAILS_RE = re.compile(r"retry(?:[\s_-]+after|[\s_-]+in)\s*:?\s*(\d+(?:\.\d+)?)\s*(ms|s|sec|seconds)?", re.I)
+
+T = TypeVar("T")
+
+
+class ThrottledError(RuntimeError):
+    """Raised when the API keeps throttling after all in-harness backoff retries."""
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    code = getattr(exc, "code", None)
+    if callable(code):
+        try:
+            return code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        except Exception:
+            return False
+    return False
+
+
+def _parse_seconds(value: str, unit: str | None = None) -> float | None:
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if unit is not None and unit.lower() == "ms":
+        seconds /= 1000
+    return seconds if seconds >= 0 else None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Extract a server retry-after hint (trailing metadata first, then error details)."""
+    trailing_metadata = getattr(exc, "trailing_metadata", None)
+    if callable(trailing_metadata):
+        try:
+            metadata = trailing_metadata() or ()
+        except Exception:
+            metadata = ()
+        for key, value in metadata:
+            if str(key).lower() in _RETRY_AFTER_METADATA_KEYS:
+                seconds = _parse_seconds(str(value).rstrip("s"))
+                if seconds is not None:
+                    return seconds
+
+    details = getattr(exc, "details", None)
+    text = details() if callable(details) else str(exc)
+    match = _RETRY_AFTER_DETAILS_RE.search(text or "")
+    if match:
+        return _parse_seconds(match.group(1), match.group(2))
+    return None
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    retry_after: float | None = None,
+    base: float = DEFAULT_BASE_DELAY_SECONDS,
+    cap: float = DEFAULT_MAX_DELAY_SECONDS,
+    jitter: float = DEFAULT_JITTER,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Exponential backoff (base * 2**attempt, capped) with +/- `jitter`, never below retry-after."""
+    delay = min(cap, base * (2**attempt))
+    delay *= 1 + jitter * (2 * rng() - 1)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class TokenBucket:
+    """Paces request starts to `rate_per_second` with bursts up to `capacity`."""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be > 0")
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease window on in-flight calls."""
+
+    def __init__(
+        self,
+        maximum: int = DEFAULT_MAX_CONCURRENCY,
+        *,
+        minimum: int = 1,
+        initial: int | None = None,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        if minimum < 1 or maximum < minimum:
+            raise ValueError("concurrency bounds must satisfy 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self._window = float(initial if initial is not None else maximum)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, min(self.maximum, math.floor(self._window)))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, *, succeeded: bool = False, throttled: bool = False) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self._window = max(float(self.minimum), self._window * self.decrease_factor)
+            elif succeeded:
+                self._window = min(float(self.maximum), self._window + 1 / self._window)
+            self._condition.notify_all()
+
+
+def _env_number(name: str, default: float | None, *, cast: Callable[[str], float]) -> float | None:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError as exc:
+        raise PermissionError(f"{name} must be a number: {raw!r}") from exc
+    if value < 0:
+        raise PermissionError(f"{name} must be >= 0, got {value}")
+    return value
+
+
+def rate_limit_config_from_env() -> dict[str, Any]:
+    """`RateLimiter` keyword arguments from the `WD_XAI_*` variables; PermissionError when invalid."""
+    per_minute = _env_number(REQUESTS_PER_MINUTE_ENV_VAR, None, cast=float)
+    max_concurrency = int(_env_number(MAX_CONCURRENCY_ENV_VAR, DEFAULT_MAX_CONCURRENCY, cast=int))
+    if max_concurrency < 1:
+        raise PermissionError(f"{MAX_CONCURRENCY_ENV_VAR} must be >= 1, got {max_concurrency}")
+    return {
+        "requests_per_second": per_minute / 60 if per_minute else None,
+        "max_concurrency": max_concurrency,
+        "max_throttle_retries": int(_env_number(THROTTLE_RETRIES_ENV_VAR, DEFAULT_THROTTLE_RETRIES, cast=int)),
+    }
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        *,
+        requests_per_second: float | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_throttle_retries: int = DEFAULT_THROTTLE_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY_SECONDS,
+        max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+        jitter: float = DEFAULT_JITTER,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.bucket = TokenBucket(requests_per_second, clock=clock) if requests_per_second else None
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.max_throttle_retries = max_throttle_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+        self.throttle_events = 0
+
+    @classmethod
+    def from_env(cls) -> RateLimiter:
+        return cls(**rate_limit_config_from_env())
+
+    def _start_delay(self) -> float:
+        """Seconds until this caller may start: shared backoff pause, then token-bucket pacing."""
+        with self._lock:
+            pause = max(0.0, self._resume_at - self._clock())
+        return pause + (self.bucket.reserve() if self.bucket is not None else 0.0)
+
+    def _on_throttle(self, exc: BaseException, attempt: int, label: str) -> float:
+        delay = backoff_delay(
+            attempt,
+            retry_after=retry_after_seconds(exc),
+            base=self.base_delay,
+            cap=self.max_delay,
+            jitter=self.jitter,
+            rng=self._rng,
+        )
+        with self._lock:
+            self.throttle_events += 1
+            self._resume_at = max(self._resume_at, self._clock() + delay)
+        print(
+            f"Throttled ({label}); backing off {delay:.1f}s "
+            f"[attempt {attempt + 1}/{self.max_throttle_retries}, window {self.concurrency.limit}]",
+            file=sys.stderr,
+        )
+        return delay
+
+    def _exhausted(self, label: str, exc: BaseException) -> ThrottledError:
+        return ThrottledError(
+            f"{label} still throttled after {self.max_throttle_retries} backoff retries: {exc}"
+        )
+
+    def call(self, fn: Callable[[], T], *, label: str = "xai call") -> T:
+        for attempt in range(self.max_throttle_retries + 1):
+            delay = self._start_delay()
+            if delay > 0:
+                self._sleep(delay)
+            self.concurrency.acquire()
+            succeeded = throttled = False
+            try:
+                result = fn()
+                succeeded = True
+                return result
+            except Exception as exc:
+                if not is_throttle_error(exc):
+                    raise
+                throttled = True
+                last_error = exc
+            finally:
+                self.concurrency.release(succeeded=succeeded, throttled=throttled)
+            if attempt == self.max_throttle_retries:
+                break
+            self._on_throttle(last_error, attempt, label)
+        raise self._exhausted(label, last_error) from last_error
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]], *, label: str = "xai call") -> T:
+        for attempt in range(self.max_throttle_retries + 1):
+            delay = self._start_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            while not self.concurrency.try_acquire():
+                await asyncio.sleep(0.05)
+            succeeded = throttled = False
+            try:
+                result = await fn()
+                succeeded = True
+                return result
+            except Exception as exc:
+                if not is_throttle_error(exc):
+                    raise
+                throttled = True
+                last_error = exc
+            finally:
+                self.concurrency.release(succeeded=succeeded, throttled=throttled)
+            if attempt == self.max_throttle_retries:
+                break
+            self._on_throttle(last_error, attempt, label)
+        raise self._exhausted(label, last_error) from last_error
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "concurrency_limit": self.concurrency.limit,
+            "in_flight": self.concurrency.in_flight,
+            "throttle_events": self.throttle_events,
+        }
+
+
+_RATE_LIMITERS: dict[tuple[tuple[str, Any], ...], RateLimiter] = {}
+_RATE_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Process-wide limiter for the current environment's configuration.
+
+    The `WD_XAI_*` variables are re-read on every call, so a long-lived process (the
+    harness daemon) follows changes to them. Calls with the same configuration share
+    one limiter, and with it one concurrency window and backoff pause.
+    """
+    config = rate_limit_config_from_env()
+    key = tuple(sorted(config.items()))
+    with _RATE_LIMITER_LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None:
+            limiter = _RATE_LIMITERS[key] = RateLimiter(**config)
+        return limiter
+
+
+def reset_rate_limiter() -> None:
+    with _RATE_LIMITER_LOCK:
+        _RATE_LIMITERS.clear()
@@ -0,0 +1,588 @@
+"""
+Parallel per-scene rendering for the `final_render` phase.
+
+Manim renders a scene on a single core, so the render farm runs one `manim`
+subprocess per scene class of the validated `SceneManifest`, with up to
+`WD_RENDER_WORKERS` (default: the CPU count) scenes in flight. Every scene renders
+into its own media directory and the finished video is moved to the stable path
+`render/<scene_id>.mp4`. The full manim output of each scene is kept in
+`log/render/<scene_id>.log`.
+
+Video durations in the emitted `RenderManifest` are probed from the rendered
+files. Audio paths and durations are taken from the validated voice manifest.
+
+With a `RenderCache`, scenes whose render inputs are unchanged are linked from the
+cache instead of being rendered (see `render_cache`). The per-scene cache keys of
+the last render are kept in `artifacts/render_cache_keys.json`.
+
+Renders use a named `RenderProfile`. `final` (2560x1440 at 60 fps) is the delivery
+profile and the only one that may feed a `RenderManifest`. `draft` (854x480 at 15
+fps) is the cheap runtime-gate pass: it renders under `render/draft/` and is checked
+for crashes and timing drift against the scene manifest's narration estimates.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Callable, Mapping
+
+from pydantic import ValidationError
+
+from .contracts.media_pipeline import (
+    RENDER_PROFILES,
+    RenderManifest,
+    RenderProfile,
+    RenderSceneAsset,
+    VoiceManifest,
+    resolve_render_profile,
+)
+from .contracts.runtime_pipeline import SceneManifest, SceneManifestEntry, class_name_for_scene
+from .media_probe import DurationProbe, flush_shared_media_probe, probe_duration_seconds
+from .render_cache import RenderCache, link_or_copy, render_cache_key, scene_helpers_version
+
+RENDER_WORKERS_ENV_VAR = "WD_RENDER_WORKERS"
+MANIM_BIN_ENV_VAR = "WD_MANIM_BIN"
+DEFAULT_MANIM_BIN = "manim"
+
+FINAL_PROFILE = RENDER_PROFILES["final"]
+DRAFT_PROFILE = RENDER_PROFILES["draft"]
+
+# Draft timing drift tolerance: max(DRAFT_MIN_DRIFT_SECONDS, DRAFT_DRIFT_RATIO * expected).
+DRAFT_DRIFT_RATIO = 0.25
+DRAFT_MIN_DRIFT_SECONDS = 2.0
+
+RENDER_OUTPUT_DIR = "render"
+RENDER_MEDIA_DIR = "media"
+RENDER_LOG_DIR = "log/render"
+
+_SRC_DIR = Path(__file__).resolve().parents[1]
+_DIAGNOSTIC_TAIL_LINES = 20
+
+RenderRunner = Callable[[list[str], Path, dict[str, str]], subprocess.CompletedProcess]
+
+
+class RenderError(RuntimeError):
+    """A scene failed to render; carries the command to reproduce it and the log path."""
+
+    def __init__(
+        self,
+        scene_id: str,
+        reason: str,
+        *,
+        command: list[str] | None = None,
+        log_path: Path | None = None,
+    ) -> None:
+        self.scene_id = scene_id
+        self.reason = reason
+        self.command = command
+        self.log_path = log_path
+        details = [f"render failed for {scene_id}: {reason}"]
+        if command:
+            details.append(f"reproduce with: {shlex.join(command)}")
+        if log_path is not None:
+            details.append(f"log: {log_path}")
+        super().__init__(" | ".join(details))
+
+
+class RenderBatchError(RuntimeError):
+    """One or more scenes failed to render; the remaining scenes still completed and are in `rendered`."""
+
+    def __init__(self, failures: list[RenderError], rendered: list[RenderedScene] | None = None) -> None:
+        self.failures = failures
+        self.rendered = rendered or []
+        super().__init__("; ".join(str(failure) for failure in failures))
+
+
+@dataclass(frozen=True)
+class SceneRenderJob:
+    scene_id: str
+    scene_file: Path
+    class_name: str
+
+    @classmethod
+    def from_entry(cls, project_dir: Path, entry: SceneManifestEntry) -> SceneRenderJob:
+        return cls(
+            scene_id=entry.scene_id,
+            scene_file=project_dir / entry.scene_file,
+            class_name=class_name_for_scene(entry.scene_id, entry.scene_title),
+        )
+
+
+@dataclass(frozen=True)
+class RenderedScene:
+    scene_id: str
+    video_path: Path
+    duration_seconds: float
+    cache_hit: bool = False
+    profile: str = FINAL_PROFILE.name
+
+
+def _profile_env_var(name: str, setting: str) -> str:
+    return f"WD_RENDER_{name.upper()}_{setting}"
+
+
+def render_profile_from_env(name: str) -> RenderProfile:
+    """
+    Named profile with `WD_RENDER_<NAME>_RESOLUTION` (`WxH`) / `WD_RENDER_<NAME>_FPS` overrides.
+
+    Overrides outside the documented ranges are policy violations.
+    """
+    overrides: dict[str, int] = {}
+    resolution_var = _profile_env_var(name, "RESOLUTION")
+    raw_resolution = os.getenv(resolution_var, "").strip()
+    if raw_resolution:
+        try:
+            width, height = (int(part) for part in raw_resolution.lower().split("x"))
+        except ValueError as exc:
+            raise PermissionError(f"{resolution_var} must look like WIDTHxHEIGHT: {raw_resolution!r}") from exc
+        overrides.update(width=width, height=height)
+
+    fps_var = _profile_env_var(name, "FPS")
+    raw_fps = os.getenv(fps_var, "").strip()
+    if raw_fps:
+        try:
+            overrides["fps"] = int(raw_fps)
+        except ValueError as exc:
+            raise PermissionError(f"{fps_var} must be an integer: {raw_fps!r}") from exc
+
+    try:
+        return resolve_render_profile(name, overrides)
+    except ValidationError as exc:
+        raise PermissionError(f"render profile '{name}' override is outside the documented ranges: {exc}") from exc
+
+
+def render_worker_count(requested: int | None = None) -> int:
+    """Explicit request, else `WD_RENDER_WORKERS`, else the number of CPU cores."""
+    if requested is not None:
+        if requested < 1:
+            raise ValueError(f"render workers must be >= 1, got {requested}")
+        return requested
+
+    raw = os.getenv(RENDER_WORKERS_ENV_VAR, "").strip()
+    if not raw:
+        return max(1, os.cpu_count() or 1)
+    try:
+        workers = int(raw)
+    except ValueError as exc:
+        raise PermissionError(f"{RENDER_WORKERS_ENV_VAR} must be an integer: {raw!r}") from exc
+    if workers < 1:
+        raise PermissionError(f"{RENDER_WORKERS_ENV_VAR} must be >= 1, got {workers}")
+    return workers
+
+
+def _profile_dir(base: Path, profile: RenderProfile) -> Path:
+    # Final renders keep the stable top-level paths; other profiles get a subdirectory.
+    return base if profile.name == FINAL_PROFILE.name else base / profile.name
+
+
+def render_output_path(project_dir: Path, scene_id: str, profile: RenderProfile = FINAL_PROFILE) -> Path:
+    return _profile_dir(project_dir / RENDER_OUTPUT_DIR, profile) / f"{scene_id}.{profile.format}"
+
+
+def render_log_path(project_dir: Path, scene_id: str, profile: RenderProfile = FINAL_PROFILE) -> Path:
+    return _profile_dir(project_dir / RENDER_LOG_DIR, profile) / f"{scene_id}.log"
+
+
+def render_media_dir(project_dir: Path, scene_id: str, profile: RenderProfile = FINAL_PROFILE) -> Path:
+    return _profile_dir(project_dir / RENDER_MEDIA_DIR, profile) / scene_id
+
+
+def manim_command(job: SceneRenderJob, *, media_dir: Path, profile: RenderProfile = FINAL_PROFILE) -> list[str]:
+    return [
+        os.getenv(MANIM_BIN_ENV_VAR, "").strip() or DEFAULT_MANIM_BIN,
+        "render",
+        "--resolution",
+        f"{profile.width},{profile.height}",
+        "--frame_rate",
+        str(profile.fps),
+        "--format",
+        profile.format,
+        "--media_dir",
+        str(media_dir),
+        "--output_file",
+        job.scene_id,
+        "--progress_bar",
+        "none",
+        str(job.scene_file),
+        job.class_name,
+    ]
+
+
+def render_environment(project_dir: Path) -> dict[str, str]:
+    """Subprocess env: scenes import `narration_script` from the project and `wet_donkey` from src."""
+    env = dict(os.environ)
+    paths = [str(project_dir), str(_SRC_DIR)]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def run_render_command(command: list[str], cwd: Path, env: dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True)
+
+
+def _write_render_log(log_path: Path, command: list[str], result: subprocess.CompletedProcess) -> None:
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log_path.write_text(
+        f"$ {shlex.join(command)}\n"
+        f"exit code: {result.returncode}\n"
+        f"--- stdout ---\n{result.stdout or ''}\n"
+        f"--- stderr ---\n{result.stderr or ''}\n",
+        encoding="utf-8",
+    )
+
+
+def _stderr_tail(result: subprocess.CompletedProcess) -> str:
+    lines = [line for line in (result.stderr or "").splitlines() if line.strip()]
+    return "\n".join(lines[-_DIAGNOSTIC_TAIL_LINES:])
+
+
+def _find_rendered_video(media_dir: Path, scene_id: str, extension: str) -> Path | None:
+    candidates = [
+        path for path in media_dir.rglob(f"{scene_id}.{extension}") if "partial_movie_files" not in path.parts
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda path: path.stat().st_mtime)
+
+
+def render_scene(
+    project_dir: Path,
+    job: SceneRenderJob,
+    *,
+    runner: RenderRunner = run_render_command,
+    probe: DurationProbe = probe_duration_seconds,
+    cache: RenderCache | None = None,
+    cache_key: str | None = None,
+    refresh: bool = False,
+    profile: RenderProfile = FINAL_PROFILE,
+) -> RenderedScene:
+    """
+    Render one scene class with `profile` to its stable output path and probe its duration.
+
+    A cache hit for `cache_key` is linked into place without running manim, unless
+    `refresh` is set; fresh renders are stored in the cache.
+    """
+    media_dir = render_media_dir(project_dir, job.scene_id, profile)
+    command = manim_command(job, media_dir=media_dir, profile=profile)
+    log_path = render_log_path(project_dir, job.scene_id, profile)
+    output_path = render_output_path(project_dir, job.scene_id, profile)
+
+    if not job.scene_file.exists():
+        raise RenderError(job.scene_id, f"scene file missing: {job.scene_file}")
+
+    use_cache = cache is not None and cache_key is not None
+    if use_cache and not refresh:
+        entry = cache.lookup(cache_key)
+        if entry is not None:
+            link_or_copy(entry.video_path, output_path)
+            print(
+                f"render cache hit for {job.scene_id} -> {output_path} ({entry.duration_seconds:.2f}s)",
+                file=sys.stderr,
+            )
+            return RenderedScene(
+                scene_id=job.scene_id,
+                video_path=output_path,
+                duration_seconds=entry.duration_seconds,
+                cache_hit=True,
+                profile=profile.name,
+            )
+
+    result = runner(command, project_dir, render_environment(project_dir))
+    _write_render_log(log_path, command, result)
+    if result.returncode != 0:
+        tail = _stderr_tail(result)
+        reason = f"manim exited with code {result.returncode}" + (f":\n{tail}" if tail else "")
+        raise RenderError(job.scene_id, reason, command=command, log_path=log_path)
+
+    produced = _find_rendered_video(media_dir, job.scene_id, profile.format)
+    if produced is None:
+        raise RenderError(
+            job.scene_id,
+            f"manim reported success but wrote no {job.scene_id}.{profile.format} under {media_dir}",
+            command=command,
+            log_path=log_path,
+        )
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(produced, output_path)
+
+    try:
+        duration = probe(output_path)
+    except ValueError as exc:
+        raise RenderError(job.scene_id, str(exc), command=command, log_path=log_path) from exc
+    if use_cache:
+        cache.store(cache_key, output_path, duration_seconds=duration, scene_id=job.scene_id)
+    print(f"rendered {job.scene_id} [{profile.name}] -> {output_path} ({duration:.2f}s)", file=sys.stderr)
+    return RenderedScene(scene_id=job.scene_id, video_path=output_path, duration_seconds=duration, profile=profile.name)
+
+
+def render_scenes(
+    project_dir: Path,
+    manifest: SceneManifest,
+    *,
+    workers: int | None = None,
+    runner: RenderRunner = run_render_command,
+    probe: DurationProbe = probe_duration_seconds,
+    cache: RenderCache | None = None,
+    cache_keys: Mapping[str, str] | None = None,
+    refresh: bool = False,
+    profile: RenderProfile = FINAL_PROFILE,
+) -> list[RenderedScene]:
+    """
+    Render every manifest scene on a worker pool; results follow manifest order.
+
+    A failing scene does not stop the others. Once the pool drains, all scene failures
+    are raised together as `RenderBatchError`; tooling errors (e.g. manim not
+    installed) propagate unchanged.
+    """
+    jobs = [SceneRenderJob.from_entry(project_dir, entry) for entry in manifest.scenes]
+    max_workers = min(render_worker_count(workers), len(jobs))
+    print(
+        f"rendering {len(jobs)} scene(s) [{profile.name} {profile.resolution}@{profile.fps}] with {max_workers} worker(s)",
+        file=sys.stderr,
+    )
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wd-render") as executor:
+            futures = [
+                executor.submit(
+                    render_scene,
+                    project_dir,
+                    job,
+                    runner=runner,
+                    probe=probe,
+                    cache=cache,
+                    cache_key=(cache_keys or {}).get(job.scene_id),
+                    refresh=refresh,
+                    profile=profile,
+                )
+                for job in jobs
+            ]
+    finally:
+        flush_shared_media_probe()
+
+    rendered: list[RenderedScene] = []
+    failures: list[RenderError] = []
+    for future in futures:
+        try:
+            rendered.append(future.result())
+        except RenderError as exc:
+            print(str(exc), file=sys.stderr)
+            failures.append(exc)
+    if failures:
+        raise RenderBatchError(failures, rendered)
+    hits = sum(1 for scene in rendered if scene.cache_hit)
+    if cache is not None:
+        print(f"render cache: {hits} hit(s), {len(rendered) - hits} rendered", file=sys.stderr)
+    return rendered
+
+
+def render_cache_keys(
+    project_dir: Path,
+    manifest: SceneManifest,
+    voice_manifest: VoiceManifest | None = None,
+    *,
+    profile: RenderProfile = FINAL_PROFILE,
+) -> dict[str, str]:
+    """
+    Render cache key per scene; scenes without a voice asset or source file get none.
+
+    Draft passes run before voiceovers exist, so without a voice manifest the
+    narration text digest stands in for the voice `cache_key`.
+    """
+    voice_by_scene = {asset.scene_id: asset for asset in voice_manifest.assets} if voice_manifest else {}
+    helpers_version = scene_helpers_version()
+    keys: dict[str, str] = {}
+    for entry in manifest.scenes:
+        scene_file = project_dir / entry.scene_file
+        if not scene_file.exists():
+            continue
+        if voice_manifest is None:
+            voice_key = "narration:" + hashlib.sha256(entry.narration_text.encode("utf-8")).hexdigest()
+        elif entry.scene_id in voice_by_scene:
+            voice_key = voice_by_scene[entry.scene_id].cache_key
+        else:
+            continue
+        keys[entry.scene_id] = render_cache_key(
+            scene_file,
+            voice_cache_key=voice_key,
+            profile=profile.settings(),
+            helpers_version=helpers_version,
+        )
+    return keys
+
+
+def render_keys_path(project_dir: Path) -> Path:
+    return project_dir / "artifacts" / "render_cache_keys.json"
+
+
+def load_render_keys(project_dir: Path) -> dict[str, str] | None:
+    """Cache keys the current render manifest was produced from; None when not recorded (a cache miss)."""
+    path = render_keys_path(project_dir)
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    return {str(key): value for key, value in payload.items() if isinstance(value, str)}
+
+
+def write_render_keys(project_dir: Path, keys: Mapping[str, str]) -> Path:
+    path = render_keys_path(project_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+        tmp.write(json.dumps(dict(sorted(keys.items())), indent=2))
+        tmp_path = Path(tmp.name)
+    tmp_path.replace(path)
+    return path
+
+
+def build_render_manifest(
+    project_dir: Path,
+    rendered: list[RenderedScene],
+    voice_manifest: VoiceManifest,
+    *,
+    run_id: str,
+) -> RenderManifest:
+    voice_by_scene = {asset.scene_id: asset for asset in voice_manifest.assets}
+    assets: list[RenderSceneAsset] = []
+    for scene in rendered:
+        if scene.profile != FINAL_PROFILE.name:
+            raise ValueError(
+                f"scene '{scene.scene_id}' was rendered with the '{scene.profile}' profile; "
+                "only final renders feed the render manifest"
+            )
+        voice_asset = voice_by_scene.get(scene.scene_id)
+        if voice_asset is None:
+            raise ValueError(f"scene '{scene.scene_id}' has no voice asset in the voice manifest")
+        assets.append(
+            RenderSceneAsset(
+                scene_id=scene.scene_id,
+                video_path=scene.video_path.relative_to(project_dir).as_posix(),
+                audio_path=voice_asset.audio_path,
+                video_duration_seconds=scene.duration_seconds,
+                audio_duration_seconds=voice_asset.duration_seconds,
+            )
+        )
+    return RenderManifest(
+        run_id=run_id,
+        scene_order=[asset.scene_id for asset in assets],
+        scenes=assets,
+    )
+
+
+def render_manifest_path(project_dir: Path) -> Path:
+    return project_dir / "artifacts" / "render_manifest.json"
+
+
+def write_render_manifest(project_dir: Path, manifest: RenderManifest) -> Path:
+    path = render_manifest_path(project_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+        tmp.write(json.dumps(manifest.model_dump(mode="json"), indent=2))
+        tmp_path = Path(tmp.name)
+    tmp_path.replace(path)
+    return path
+
+
+@dataclass(frozen=True)
+class DraftTiming:
+    scene_id: str
+    duration_seconds: float
+    expected_seconds: float
+    tolerance_seconds: float
+
+    @property
+    def drift_seconds(self) -> float:
+        return self.duration_seconds - self.expected_seconds
+
+    @property
+    def within_tolerance(self) -> bool:
+        return abs(self.drift_seconds) <= self.tolerance_seconds
+
+
+def draft_drift_tolerance_seconds(expected_seconds: float) -> float:
+    return max(DRAFT_MIN_DRIFT_SECONDS, expected_seconds * DRAFT_DRIFT_RATIO)
+
+
+def draft_timings(manifest: SceneManifest, rendered: list[RenderedScene]) -> list[DraftTiming]:
+    """Compare draft render durations with the manifest's narration duration estimates."""
+    expected = {entry.scene_id: entry.narration_duration_seconds for entry in manifest.scenes}
+    return [
+        DraftTiming(
+            scene_id=scene.scene_id,
+            duration_seconds=scene.duration_seconds,
+            expected_seconds=expected[scene.scene_id],
+            tolerance_seconds=draft_drift_tolerance_seconds(expected[scene.scene_id]),
+        )
+        for scene in rendered
+    ]
+
+
+def draft_gate_failures(timings: list[DraftTiming], failures: list[RenderError] | None = None) -> dict[str, str]:
+    """Error message per scene that crashed in the draft render or drifted past its tolerance."""
+    messages = {failure.scene_id: f"draft render failed: {failure.reason}" for failure in failures or []}
+    for timing in timings:
+        if not timing.within_tolerance:
+            messages[timing.scene_id] = (
+                f"timing drift: draft {timing.duration_seconds:.2f}s vs narration "
+                f"{timing.expected_seconds:.2f}s (tolerance {timing.tolerance_seconds:.2f}s)"
+            )
+    return dict(sorted(messages.items()))
+
+
+def invalidate_draft_renders(
+    project_dir: Path,
+    scene_ids: list[str],
+    *,
+    cache: RenderCache | None,
+    cache_keys: Mapping[str, str],
+    profile: RenderProfile = DRAFT_PROFILE,
+) -> None:
+    """Remove the draft output and cache entry of each failed scene so its retry renders afresh."""
+    for scene_id in scene_ids:
+        render_output_path(project_dir, scene_id, profile).unlink(missing_ok=True)
+        if cache is not None and scene_id in cache_keys:
+            cache.invalidate(cache_keys[scene_id])
+
+
+def draft_report_path(project_dir: Path) -> Path:
+    return project_dir / "artifacts" / "draft_render_report.json"
+
+
+def write_draft_report(project_dir: Path, profile: RenderProfile, timings: list[DraftTiming]) -> Path:
+    path = draft_report_path(project_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "profile": profile.model_dump(mode="json"),
+        "scenes": [
+            {
+                "scene_id": timing.scene_id,
+                "duration_seconds": timing.duration_seconds,
+                "expected_seconds": timing.expected_seconds,
+                "drift_seconds": round(timing.drift_seconds, 3),
+                "tolerance_seconds": timing.tolerance_seconds,
+                "within_tolerance": timing.within_tolerance,
+            }
+            for timing in timings
+        ],
+    }
+    with NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+        tmp.write(json.dumps(payload, indent=2))
+        tmp_path = Path(tmp.name)
+    tmp_path.replace(path)
+    return path
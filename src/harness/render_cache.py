@@ -0,0 +1,130 @@
+"""
+Content-addressed cache of rendered scene videos.
+
+A scene render is keyed on the SHA-256 of the scene source file, the voice asset's
+`cache_key` (the narration the scene is timed against), the `wet_donkey.scene_helpers`
+module version and the render profile. A scene only re-renders when one of those
+inputs changes. Typically that is a `scene_repair` edit or a narration change.
+
+Cache entries live in `WD_RENDER_CACHE_DIR` (default `projects/render_cache`) as
+`<key>.mp4` plus a `<key>.json` sidecar with the probed duration. The sidecar is
+written last, so its presence marks a complete entry. A hit is hard-linked into
+the project (copied across filesystems) without invoking Manim.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Mapping
+
+from .contracts.runtime_pipeline import utc_timestamp
+from .media_probe import sha256_file
+
+RENDER_CACHE_DIR_ENV_VAR = "WD_RENDER_CACHE_DIR"
+RENDER_CACHE_CONTRACT_VERSION = "1.0.0"
+
+_ROOT_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_RENDER_CACHE_DIR = _ROOT_DIR / "projects" / "render_cache"
+SCENE_HELPERS_PATH = _ROOT_DIR / "src" / "wet_donkey" / "scene_helpers.py"
+
+
+def scene_helpers_version() -> str:
+    """Content hash of `wet_donkey/scene_helpers.py`, which every scene star-imports."""
+    if not SCENE_HELPERS_PATH.exists():
+        return "missing"
+    return sha256_file(SCENE_HELPERS_PATH)
+
+
+def render_cache_key(
+    scene_file: Path,
+    *,
+    voice_cache_key: str,
+    profile: Mapping[str, Any],
+    helpers_version: str | None = None,
+) -> str:
+    material = {
+        "contract_version": RENDER_CACHE_CONTRACT_VERSION,
+        "scene_sha256": sha256_file(scene_file),
+        "voice_cache_key": voice_cache_key,
+        "scene_helpers_version": helpers_version if helpers_version is not None else scene_helpers_version(),
+        "profile": dict(profile),
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Atomically place `source` at `destination`, hard-linking when both share a filesystem."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    staging = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    staging.unlink(missing_ok=True)
+    try:
+        os.link(source, staging)
+    except OSError:
+        shutil.copy2(source, staging)
+    os.replace(staging, destination)
+
+
+@dataclass(frozen=True)
+class RenderCacheEntry:
+    key: str
+    video_path: Path
+    duration_seconds: float
+
+
+class RenderCache:
+    def __init__(self, cache_dir: str | Path = DEFAULT_RENDER_CACHE_DIR) -> None:
+        self.cache_dir = Path(cache_dir)
+
+    @classmethod
+    def from_env(cls) -> RenderCache:
+        return cls(os.getenv(RENDER_CACHE_DIR_ENV_VAR, "").strip() or DEFAULT_RENDER_CACHE_DIR)
+
+    def video_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp4"
+
+    def metadata_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def lookup(self, key: str) -> RenderCacheEntry | None:
+        video_path = self.video_path(key)
+        metadata_path = self.metadata_path(key)
+        if not video_path.exists() or not metadata_path.exists():
+            return None
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            duration = float(metadata["duration_seconds"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if metadata.get("key") != key or duration <= 0:
+            return None
+        return RenderCacheEntry(key=key, video_path=video_path, duration_seconds=duration)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the cached video for `key`, e.g. after it failed a runtime gate."""
+        self.metadata_path(key).unlink(missing_ok=True)
+        self.video_path(key).unlink(missing_ok=True)
+
+    def store(self, key: str, video_path: Path, *, duration_seconds: float, scene_id: str) -> RenderCacheEntry:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached_video = self.video_path(key)
+        link_or_copy(video_path, cached_video)
+
+        metadata = {
+            "contract_version": RENDER_CACHE_CONTRACT_VERSION,
+            "key": key,
+            "scene_id": scene_id,
+            "duration_seconds": duration_seconds,
+            "stored_at": utc_timestamp(),
+        }
+        with NamedTemporaryFile("w", dir=self.cache_dir, delete=False, encoding="utf-8") as tmp:
+            tmp.write(json.dumps(metadata, indent=2))
+            tmp_path = Path(tmp.name)
+        tmp_path.replace(self.metadata_path(key))
+        return RenderCacheEntry(key=key, video_path=cached_video, duration_seconds=duration_seconds)
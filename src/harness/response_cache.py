@@ -0,0 +1,210 @@
+"""Content-addressed on-disk cache of validated phase responses."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import suppress
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Iterable
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+RESPONSE_CACHE_CONTRACT_VERSION = "1.1.0"
+
+RESPONSE_CACHE_ENV_VAR = "WD_RESPONSE_CACHE"
+RESPONSE_CACHE_DIR_ENV_VAR = "WD_RESPONSE_CACHE_DIR"
+RESPONSE_CACHE_TTL_ENV_VAR = "WD_RESPONSE_CACHE_TTL_SECONDS"
+RESPONSE_CACHE_MAX_BYTES_ENV_VAR = "WD_RESPONSE_CACHE_MAX_BYTES"
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_KEY_RE = re.compile(r"^[0-9a-f]{64}$")
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class ResponseCacheEntry(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    contract_version: str = RESPONSE_CACHE_CONTRACT_VERSION
+    key: str
+    phase: str
+    schema_name: str
+    model: str
+    response_id: str
+    created_at: str
+    payload: dict[str, Any] = Field(default_factory=dict)
+
+    @field_validator("key")
+    @classmethod
+    def _sha256_key(cls, value: str) -> str:
+        if not _KEY_RE.fullmatch(value):
+            raise ValueError("key must be a lowercase sha256 hex digest")
+        return value
+
+
+def _tool_descriptor(tool: Any) -> str:
+    # SDK tools are protobuf messages whose text format is deterministic.
+    return str(tool).strip()
+
+
+def response_cache_key(
+    *,
+    phase: str,
+    prompts: dict,
+    schema_name: str,
+    tools: Iterable[Any],
+    model: str,
+    previous_response_id: str | None = None,
+) -> str:
+    """
+    SHA-256 of everything that shapes the response, including the response the call
+    chains from: the same prompts continued from a different conversation are a
+    different request.
+    """
+    material = {
+        "cache_contract": RESPONSE_CACHE_CONTRACT_VERSION,
+        "phase": phase,
+        "system": prompts["system"],
+        "user": prompts["user"],
+        "schema": schema_name,
+        "tools": sorted(_tool_descriptor(tool) for tool in tools),
+        "model": model,
+        "previous_response_id": previous_response_id,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise PermissionError(f"{name} must be an integer: {raw!r}") from exc
+    if value < 1:
+        raise PermissionError(f"{name} must be >= 1, got {value}")
+    return value
+
+
+class ResponseCache:
+    """
+    One JSON file per key under `root`.
+
+    Entries older than `ttl_seconds` are treated as misses and removed. File mtimes
+    track last use, and the least recently used entries are evicted once the entry
+    files total more than `max_bytes`; payload sizes vary by orders of magnitude
+    between phases, so a count bound says little about disk use.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+
+    @classmethod
+    def from_env(cls, project_dir: Path) -> ResponseCache | None:
+        """Return the configured cache, or None unless `WD_RESPONSE_CACHE=1`."""
+        if os.getenv(RESPONSE_CACHE_ENV_VAR, "0").strip() != "1":
+            return None
+        root = os.getenv(RESPONSE_CACHE_DIR_ENV_VAR, "").strip()
+        return cls(
+            Path(root) if root else Path(project_dir) / "cache" / "responses",
+            ttl_seconds=_env_int(RESPONSE_CACHE_TTL_ENV_VAR, DEFAULT_TTL_SECONDS),
+            max_bytes=_env_int(RESPONSE_CACHE_MAX_BYTES_ENV_VAR, DEFAULT_MAX_BYTES),
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _is_expired(self, entry: ResponseCacheEntry) -> bool:
+        created = datetime.strptime(entry.created_at, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        return self._clock() - created.timestamp() > self.ttl_seconds
+
+    def get(self, key: str) -> ResponseCacheEntry | None:
+        path = self._path(key)
+        try:
+            entry = ResponseCacheEntry.model_validate_json(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (ValidationError, ValueError, OSError):
+            self.discard(key)
+            return None
+
+        if entry.contract_version != RESPONSE_CACHE_CONTRACT_VERSION or self._is_expired(entry):
+            self.discard(key)
+            return None
+
+        now = self._clock()
+        with suppress(FileNotFoundError):
+            os.utime(path, (now, now))
+        return entry
+
+    def put(
+        self,
+        key: str,
+        *,
+        phase: str,
+        schema_name: str,
+        model: str,
+        response_id: str,
+        payload: dict[str, Any],
+    ) -> ResponseCacheEntry:
+        entry = ResponseCacheEntry(
+            key=key,
+            phase=phase,
+            schema_name=schema_name,
+            model=model,
+            response_id=response_id,
+            created_at=datetime.fromtimestamp(self._clock(), tz=timezone.utc).strftime(_TIMESTAMP_FORMAT),
+            payload=payload,
+        )
+        self.root.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile("w", dir=self.root, delete=False, suffix=".tmp", encoding="utf-8") as tmp:
+            tmp.write(json.dumps(entry.model_dump(mode="json"), indent=2))
+            tmp_path = Path(tmp.name)
+        tmp_path.replace(self._path(key))
+        now = self._clock()
+        os.utime(self._path(key), (now, now))
+        self.evict()
+        return entry
+
+    def discard(self, key: str) -> None:
+        with suppress(FileNotFoundError):
+            self._path(key).unlink()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits in `max_bytes`; returns the number removed."""
+        if not self.root.exists():
+            return 0
+        entries = []
+        for path in self.root.glob("*.json"):
+            with suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            with suppress(FileNotFoundError):
+                path.unlink()
+            total -= size
+            removed += 1
+        return removed
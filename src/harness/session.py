@@ -3,9 +3,10 @@ import os
 from pathlib import Path
 
 from pydantic import BaseModel
-from xai_sdk import Client
+from xai_sdk import AsyncClient, Client
 from xai_sdk.tools import code_execution, collections_search, web_search
 
+from .client_pool import CLIENT_POOL, KEEPALIVE_CHANNEL_OPTIONS, resolve_api_host
 from .contracts.session import (
     SessionContractError,
     SessionMetadata,
@@ -15,6 +16,9 @@ from .contracts.session import (
 )
 from .schemas import get_schema_for_phase
 
+DEFAULT_MODEL = "grok-4-1-fast-reasoning"
+
+
 class PipelineTrainingSession:
     """Stateful session manager for xAI Responses API"""
 
@@ -22,9 +26,12 @@ class PipelineTrainingSession:
         self.project_dir = Path(project_dir)
         self.collection_ids = list(collection_ids)
         self.response_id = response_id
-        self.client = Client(api_key=os.getenv("XAI_API_KEY"))
+        self.client = self._build_client()
         self.session_file = self.project_dir / ".xai_session.json"
 
+    def _build_client(self):
+        return CLIENT_POOL.acquire(Client, api_key=os.getenv("XAI_API_KEY"))
+
     @classmethod
     def from_project(cls, project_dir):
         """Load existing session or create new"""
@@ -56,6 +63,10 @@ class PipelineTrainingSession:
 
     def create_chat(self, phase: str, response_format: type[BaseModel] | None = None):
         """Create stateful chat for phase"""
+        return self.client.chat.create(**self.chat_options(phase, response_format))
+
+    def chat_options(self, phase: str, response_format: type[BaseModel] | None = None) -> dict:
+        """Resolve model, tools, schema and response chaining for a phase chat."""
         try:
             canonical_schema = get_schema_for_phase(phase)
         except ValueError as exc:
@@ -84,13 +95,13 @@ class PipelineTrainingSession:
         # intentionally stateless to avoid runaway context growth across many scenes.
         previous_response_id = self.response_id if phase in {"plan", "narration"} else None
 
-        return self.client.chat.create(
-            model="grok-4-1-fast-reasoning",
-            tools=tools,
-            store_messages=True,
-            previous_response_id=previous_response_id,
-            response_format=resolved_schema,
-        )
+        return {
+            "model": DEFAULT_MODEL,
+            "tools": tools,
+            "store_messages": True,
+            "previous_response_id": previous_response_id,
+            "response_format": resolved_schema,
+        }
 
     def update_response_id(self, response_id):
         """Update session state after successful call"""
@@ -106,3 +117,21 @@ class PipelineTrainingSession:
                 collection_ids=self.collection_ids,
             ),
         )
+
+
+class AsyncPipelineTrainingSession(PipelineTrainingSession):
+    """
+    asyncio twin of `PipelineTrainingSession` built on the SDK's `AsyncClient`.
+
+    Chats created here return coroutines from `sample()`, so one event loop can keep
+    many phase calls in flight. Tool wiring, schema resolution and session persistence
+    are shared with the synchronous session. Async clients are not pooled: their
+    channels are bound to the event loop that first uses them.
+    """
+
+    def _build_client(self):
+        return AsyncClient(
+            api_key=os.getenv("XAI_API_KEY"),
+            api_host=resolve_api_host(),
+            channel_options=list(KEEPALIVE_CHANNEL_OPTIONS),
+        )
@@ -0,0 +1,72 @@
+"""Per-call token, tool and latency accounting for harness phase calls."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+from .contracts.observability import PhaseUsageRecord, emit_usage_event
+from .contracts.state import load_state
+
+
+def _int_field(source: Any, name: str) -> int:
+    value = getattr(source, name, 0)
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def usage_record_from_response(
+    phase: str,
+    response,
+    *,
+    model: str,
+    latency_ms: float,
+    accepted: bool = True,
+) -> PhaseUsageRecord:
+    usage = getattr(response, "usage", None)
+    tool_usage = getattr(response, "server_side_tool_usage", None)
+    cost_usd = getattr(response, "cost_usd", None)
+    response_id = getattr(response, "id", None)
+    return PhaseUsageRecord(
+        call_phase=phase,
+        model=model,
+        response_id=response_id if isinstance(response_id, str) else None,
+        latency_ms=round(latency_ms, 3),
+        prompt_tokens=_int_field(usage, "prompt_tokens"),
+        cached_prompt_tokens=_int_field(usage, "cached_prompt_text_tokens"),
+        completion_tokens=_int_field(usage, "completion_tokens"),
+        reasoning_tokens=_int_field(usage, "reasoning_tokens"),
+        total_tokens=_int_field(usage, "total_tokens"),
+        server_side_tool_calls=dict(tool_usage) if isinstance(tool_usage, dict) else {},
+        cost_usd=float(cost_usd) if isinstance(cost_usd, (int, float)) and not isinstance(cost_usd, bool) else None,
+        accepted=accepted,
+    )
+
+
+def _phase_attempt(project_dir: Path, phase: str) -> int:
+    state_file = project_dir / "project_state.json"
+    if not state_file.exists():
+        return 1
+    try:
+        state = load_state(state_file)
+    except (OSError, ValueError):
+        return 1
+    if state.phase != phase:
+        return 1
+    return int(state.attempt_counters.get(phase, 0)) + 1
+
+
+def record_phase_usage(session, record: PhaseUsageRecord) -> None:
+    """
+    Append a `phase_usage` event for the session's project.
+
+    Accounting is best effort: sessions without a project directory on disk are
+    skipped, and write errors are reported without failing the phase call.
+    """
+    project_dir = getattr(session, "project_dir", None)
+    if not isinstance(project_dir, Path) or not project_dir.is_dir():
+        return
+    try:
+        emit_usage_event(project_dir, record, attempt=_phase_attempt(project_dir, record.call_phase))
+    except OSError as exc:
+        print(f"Warning: failed to record {record.call_phase} usage: {exc}", file=sys.stderr)
@@ -0,0 +1,229 @@
+"""
+Voiceover precache for the `precache_voiceovers` phase.
+
+The whole narration goes to the cached voice adapter (`wet_donkey_voice`) as one
+`synthesize_batch` call. Identical narrations are synthesized once, and cache hits
+are resolved up front. The misses go to the TTS backend as one session, so the
+engine loads its model once per run. Setting `WD_VOICE_BATCH_SIZE` splits them
+into sessions of at most that many texts, of which up to `WD_VOICE_WORKERS`
+(default: the CPU count) run at once. Each cached asset is hard-linked
+(copied across filesystems) into the project as `voice/<scene_id>.<fmt>` with its
+metadata sidecar, and the resulting `VoiceManifest` records the probed durations
+from the voice metadata.
+
+The adapter caches narration per sentence and composes each scene asset from its
+sentences, so a narration edit resynthesizes only the changed sentences. The
+sidecar's `segments` map gives each sentence's offset within the scene audio.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Iterable
+
+from pydantic import ValidationError
+
+from .contracts.media_pipeline import VoiceAssetRef, VoiceManifest, load_manifest_file, load_voice_manifest
+from .contracts.runtime_pipeline import SceneManifest
+from .render_cache import link_or_copy
+
+_voice_contracts = importlib.import_module("wet_donkey_voice.contracts")
+VoiceMetadata = _voice_contracts.VoiceMetadata
+text_digest = _voice_contracts.text_digest
+get_tts_service = importlib.import_module("wet_donkey_voice.service_factory").get_tts_service
+_voice_backends = importlib.import_module("wet_donkey_voice.backends")
+DEFAULT_SYNTHESIS_BACKEND = _voice_backends.DEFAULT_SYNTHESIS_BACKEND
+load_synthesis_backend = _voice_backends.load_synthesis_backend
+
+VOICE_BACKEND_ENV_VAR = "WD_VOICE_BACKEND"
+VOICE_WORKERS_ENV_VAR = "WD_VOICE_WORKERS"
+VOICE_BATCH_SIZE_ENV_VAR = "WD_VOICE_BATCH_SIZE"
+VOICE_CACHE_DIR_ENV_VAR = "WD_VOICE_CACHE_DIR"
+VOICE_CACHE_MAX_BYTES_ENV_VAR = "WD_VOICE_CACHE_MAX_BYTES"
+VOICE_CACHE_MAX_AGE_ENV_VAR = "WD_VOICE_CACHE_MAX_AGE_SECONDS"
+DEFAULT_VOICE_CACHE_DIR = Path(__file__).resolve().parents[2] / "projects" / "voice_cache"
+VOICE_OUTPUT_DIR = "voice"
+
+
+def optional_env_int(name: str) -> int | None:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return None
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise PermissionError(f"{name} must be an integer: {raw!r}") from exc
+    if value < 1:
+        raise PermissionError(f"{name} must be >= 1, got {value}")
+    return value
+
+
+def voice_cache_dir() -> Path:
+    return Path(os.getenv(VOICE_CACHE_DIR_ENV_VAR, "").strip() or DEFAULT_VOICE_CACHE_DIR)
+
+
+def voice_synthesis_backend(requested: str | None = None):
+    """Explicit backend spec, else `WD_VOICE_BACKEND`, else the silent stub."""
+    if requested is not None:
+        backend = load_synthesis_backend(requested)
+    else:
+        raw = os.getenv(VOICE_BACKEND_ENV_VAR, "").strip() or DEFAULT_SYNTHESIS_BACKEND
+        try:
+            backend = load_synthesis_backend(raw)
+        except ValueError as exc:
+            raise PermissionError(f"{VOICE_BACKEND_ENV_VAR}: {exc}") from exc
+    if backend.name == DEFAULT_SYNTHESIS_BACKEND:
+        print(
+            f"Warning: voice backend '{backend.name}' writes placeholder silence; "
+            f"set {VOICE_BACKEND_ENV_VAR} or --backend for real narration",
+            file=sys.stderr,
+        )
+    return backend
+
+
+def voice_service_from_env(*, backend: str | None = None, **kwargs: Any):
+    """The sentence-segmenting `qwen_cached` adapter on the shared `WD_VOICE_CACHE_DIR` cache."""
+    kwargs.setdefault("segment_sentences", True)
+    kwargs["backend"] = voice_synthesis_backend(backend)
+    return get_tts_service(
+        "qwen_cached",
+        cache_dir=str(voice_cache_dir()),
+        max_cache_bytes=optional_env_int(VOICE_CACHE_MAX_BYTES_ENV_VAR),
+        max_cache_age_seconds=optional_env_int(VOICE_CACHE_MAX_AGE_ENV_VAR),
+        **kwargs,
+    )
+
+
+def voice_worker_count(requested: int | None = None) -> int:
+    """Explicit request, else `WD_VOICE_WORKERS`, else the number of CPU cores."""
+    if requested is not None:
+        if requested < 1:
+            raise ValueError(f"voice workers must be >= 1, got {requested}")
+        return requested
+
+    raw = os.getenv(VOICE_WORKERS_ENV_VAR, "").strip()
+    if not raw:
+        return max(1, os.cpu_count() or 1)
+    try:
+        workers = int(raw)
+    except ValueError as exc:
+        raise PermissionError(f"{VOICE_WORKERS_ENV_VAR} must be an integer: {raw!r}") from exc
+    if workers < 1:
+        raise PermissionError(f"{VOICE_WORKERS_ENV_VAR} must be >= 1, got {workers}")
+    return workers
+
+
+def voice_batch_size() -> int | None:
+    """`WD_VOICE_BATCH_SIZE`, or None to send all cache misses as one backend session."""
+    return optional_env_int(VOICE_BATCH_SIZE_ENV_VAR)
+
+
+def link_voice_asset(project_dir: Path, scene_id: str, result) -> VoiceAssetRef:
+    audio_format = result.metadata.audio_format
+    audio_rel = f"{VOICE_OUTPUT_DIR}/{scene_id}.{audio_format}"
+    metadata_rel = f"{audio_rel}.json"
+    link_or_copy(Path(result.audio_path), project_dir / audio_rel)
+    link_or_copy(Path(result.metadata_path), project_dir / metadata_rel)
+    return VoiceAssetRef(
+        scene_id=scene_id,
+        audio_path=audio_rel,
+        metadata_path=metadata_rel,
+        cache_key=result.metadata.cache_key,
+        duration_seconds=result.metadata.duration_seconds,
+        generation_mode=result.metadata.generation_mode,
+        degraded=result.metadata.degraded,
+    )
+
+
+def precache_voiceovers(
+    project_dir: Path,
+    scene_manifest: SceneManifest,
+    *,
+    service,
+    workers: int | None = None,
+    batch_size: int | None = None,
+) -> VoiceManifest:
+    """Synthesize every scene's narration as one batch; assets follow manifest order."""
+    scenes = scene_manifest.scenes
+    max_workers = min(voice_worker_count(workers), len(scenes))
+    print(f"precaching {len(scenes)} voiceover(s) with {max_workers} worker(s)", file=sys.stderr)
+    results = service.synthesize_batch(
+        [entry.narration_text for entry in scenes],
+        batch_size=batch_size if batch_size is not None else voice_batch_size(),
+        workers=max_workers,
+        project=str(project_dir.resolve()),
+    )
+    assets = [link_voice_asset(project_dir, entry.scene_id, result) for entry, result in zip(scenes, results)]
+
+    hits = sum(1 for asset in assets if asset.generation_mode == "cache_hit")
+    print(f"voice cache: {hits} hit(s), {len(assets) - hits} synthesized", file=sys.stderr)
+    return VoiceManifest(voice_id=service.voice_id, fallback_allowed=service.fallback_enabled, assets=assets)
+
+
+def voice_manifest_matches_scenes(project_dir: Path, manifest: VoiceManifest, scene_manifest: SceneManifest) -> bool:
+    """True when the manifest covers the scene manifest in order and each sidecar matches its narration."""
+    if [asset.scene_id for asset in manifest.assets] != [entry.scene_id for entry in scene_manifest.scenes]:
+        return False
+    for asset, entry in zip(manifest.assets, scene_manifest.scenes):
+        metadata = VoiceMetadata.model_validate(load_manifest_file(_project_path(project_dir, asset.metadata_path)))
+        if metadata.text_sha256 != text_digest(entry.narration_text):
+            return False
+    return True
+
+
+def voice_manifest_path(project_dir: Path) -> Path:
+    return project_dir / "artifacts" / "voice_manifest.json"
+
+
+def live_voice_cache_keys(project_dirs: Iterable[Path]) -> tuple[set[str], set[str]]:
+    """
+    Cache keys referenced by the projects' voice manifests, and the projects that have one.
+
+    The sentence keys in each asset's segment map are referenced too, so composed scenes
+    keep their sentences. A manifest that cannot be read pins nothing, but its project
+    still counts as live.
+    """
+    keys: set[str] = set()
+    live: set[str] = set()
+    for project_dir in project_dirs:
+        manifest_file = voice_manifest_path(project_dir)
+        if not manifest_file.exists():
+            continue
+        live.add(str(project_dir.resolve()))
+        try:
+            manifest = load_voice_manifest(manifest_file)
+        except (ValidationError, ValueError, OSError) as exc:
+            print(f"Skipping unreadable voice manifest {manifest_file}: {exc}", file=sys.stderr)
+            continue
+        for asset in manifest.assets:
+            keys.add(asset.cache_key)
+            keys.update(segment.cache_key for segment in _asset_segments(project_dir, asset))
+    return keys, live
+
+
+def _project_path(project_dir: Path, raw: str) -> Path:
+    path = Path(raw)
+    return path if path.is_absolute() else project_dir / path
+
+
+def _asset_segments(project_dir: Path, asset: VoiceAssetRef) -> list:
+    metadata_path = _project_path(project_dir, asset.metadata_path)
+    try:
+        return VoiceMetadata.model_validate(load_manifest_file(metadata_path)).segments
+    except (ValidationError, ValueError, OSError):
+        return []
+
+
+def write_voice_manifest(project_dir: Path, manifest: VoiceManifest) -> Path:
+    path = voice_manifest_path(project_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+        tmp.write(json.dumps(manifest.model_dump(mode="json"), indent=2))
+        tmp_path = Path(tmp.name)
+    tmp_path.replace(path)
+    return path
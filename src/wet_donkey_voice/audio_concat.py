@@ -0,0 +1,74 @@
+"""
+Concatenation of cached sentence audio into one scene voiceover.
+
+RIFF/WAVE inputs with matching sample rate, channels and sample width are joined
+natively with the `wave` module. Anything else is decoded and re-encoded through
+ffmpeg's concat filter (`WD_FFMPEG_BIN`). Stream-copying compressed audio would
+carry each input's encoder delay and frame padding into the joined file and
+shift every later sentence away from the offsets its segment map records;
+decoding first keeps the output timeline equal to the sum of the input
+durations.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import wave
+from pathlib import Path
+from typing import Sequence
+
+from .probe import is_wav_file
+
+FFMPEG_BIN_ENV_VAR = "WD_FFMPEG_BIN"
+DEFAULT_FFMPEG_BIN = "ffmpeg"
+
+
+def ffmpeg_bin() -> str:
+    return os.getenv(FFMPEG_BIN_ENV_VAR, "").strip() or DEFAULT_FFMPEG_BIN
+
+
+def concat_wav_files(inputs: Sequence[Path], output: Path) -> None:
+    with wave.open(str(inputs[0]), "rb") as first:
+        params = first.getparams()
+    with wave.open(str(output), "wb") as writer:
+        writer.setnchannels(params.nchannels)
+        writer.setsampwidth(params.sampwidth)
+        writer.setframerate(params.framerate)
+        for path in inputs:
+            with wave.open(str(path), "rb") as reader:
+                layout = (reader.getnchannels(), reader.getsampwidth(), reader.getframerate())
+                if layout != (params.nchannels, params.sampwidth, params.framerate):
+                    raise ValueError(f"cannot concatenate WAV files with different formats: {inputs[0]} and {path}")
+                writer.writeframes(reader.readframes(reader.getnframes()))
+
+
+def concat_command(inputs: Sequence[Path], output: Path) -> list[str]:
+    command = [ffmpeg_bin(), "-y", "-v", "error"]
+    for path in inputs:
+        command += ["-i", str(path)]
+    streams = "".join(f"[{index}:a]" for index in range(len(inputs)))
+    return command + [
+        "-filter_complex",
+        f"{streams}concat=n={len(inputs)}:v=0:a=1[audio]",
+        "-map",
+        "[audio]",
+        str(output),
+    ]
+
+
+def concat_with_ffmpeg(inputs: Sequence[Path], output: Path) -> None:
+    result = subprocess.run(concat_command(inputs, output), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"ffmpeg concat failed for {output} (exit {result.returncode}): {result.stderr.strip()}")
+
+
+def concat_audio(inputs: Sequence[Path], output: Path) -> None:
+    """Write `inputs` back to back into `output`; ValueError when they cannot be joined."""
+    if not inputs:
+        raise ValueError("cannot concatenate an empty list of audio files")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if all(is_wav_file(path) for path in inputs):
+        concat_wav_files(inputs, output)
+    else:
+        concat_with_ffmpeg(inputs, output)
@@ -0,0 +1,80 @@
+"""
+Synthesis backends behind the cached voice adapter.
+
+A backend turns a batch of normalized narration texts into audio files at paths
+chosen by the adapter. One `synthesize_batch` call is one backend session, so real
+engines load and warm up their model once per batch rather than once per
+utterance. Caching, deduplication, metadata and validation stay in
+`QwenCachedTTS`, so a provider engine only has to implement `SynthesisBackend`.
+Backends must be safe to call from several threads at once; the adapter never
+hands two calls the same output path.
+
+`load_synthesis_backend` resolves a backend by name: a built-in one from
+`SYNTHESIS_BACKENDS`, or any engine importable as `package.module:ClassName`
+that constructs without arguments.
+"""
+
+from __future__ import annotations
+
+import importlib
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol, Sequence
+
+
+@dataclass(frozen=True)
+class SynthesisRequest:
+    text: str
+    output_path: Path
+
+
+class SynthesisBackend(Protocol):
+    name: str
+    audio_format: str
+    """Container the backend writes; the adapter stores its output under this extension."""
+
+    def synthesize_batch(self, requests: Sequence[SynthesisRequest], *, sample_rate_hz: int, channels: int) -> None:
+        """Write audio for every request's text to its `output_path` in one session."""
+        ...
+
+
+class SilentWavBackend:
+    """Local stub engine: silent 16-bit PCM WAV, 0.4 s per word (minimum 0.2 s)."""
+
+    name = "silent_wav"
+    audio_format = "wav"
+    seconds_per_word = 0.4
+
+    def duration_seconds(self, text: str) -> float:
+        return max(0.2, len(text.split()) * self.seconds_per_word)
+
+    def synthesize_batch(self, requests: Sequence[SynthesisRequest], *, sample_rate_hz: int, channels: int) -> None:
+        for request in requests:
+            request.output_path.parent.mkdir(parents=True, exist_ok=True)
+            frames = round(self.duration_seconds(request.text) * sample_rate_hz)
+            with wave.open(str(request.output_path), "wb") as handle:
+                handle.setnchannels(channels)
+                handle.setsampwidth(2)
+                handle.setframerate(sample_rate_hz)
+                handle.writeframes(b"\x00\x00" * channels * frames)
+
+
+SYNTHESIS_BACKENDS: dict[str, type] = {SilentWavBackend.name: SilentWavBackend}
+DEFAULT_SYNTHESIS_BACKEND = SilentWavBackend.name
+
+
+def load_synthesis_backend(spec: str) -> SynthesisBackend:
+    """Built-in backend name or `package.module:ClassName`; ValueError when it cannot be loaded."""
+    spec = spec.strip()
+    if spec in SYNTHESIS_BACKENDS:
+        return SYNTHESIS_BACKENDS[spec]()
+    module_name, _, class_name = spec.partition(":")
+    if not module_name or not class_name:
+        known = ", ".join(sorted(SYNTHESIS_BACKENDS))
+        raise ValueError(f"unknown synthesis backend {spec!r}: use one of {known} or 'package.module:ClassName'")
+    try:
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"cannot load synthesis backend {spec!r}: {exc}") from exc
+    return backend_class()
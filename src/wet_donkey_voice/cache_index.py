@@ -0,0 +1,354 @@
+"""
+Index of the shared voice cache with size- and age-bounded LRU eviction.
+
+`<cache_dir>/.cache_index.json` records every cached asset's key, audio file,
+size, last access, voice id and the projects that used it. The adapter resolves
+cache hits against the index instead of probing the directory. Hits are noted in
+memory by `record` and merged by `flush`, once per batch, in the same write as
+that batch's eviction. Read-modify-write cycles hold an exclusive `fcntl` lock on
+`.cache_index.lock`, so processes sharing one cache volume do not lose each
+other's updates.
+
+In-flight batches hold a lease (`.leases/<id>.json`) on the keys they are
+resolving, and eviction never removes a leased key, so a concurrent `gc` cannot
+delete an asset between its cache-hit check and its use. A lease left behind by
+a crashed process expires after `LEASE_TTL_SECONDS`.
+
+A cache directory without an index (e.g. one written before the index existed)
+is indexed from its files on first use. Last access is then the audio mtime.
+`audio_file` is relative to the cache root: `ab/cd/<key>.<fmt>` in the sharded
+layout, or `<key>.<fmt>` for flat entries that `migrate_flat_layout` has not
+moved yet.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager, suppress
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Callable, Iterable, Iterator
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .contracts import metadata_sidecar_path, voice_cache_relpath
+
+VOICE_CACHE_INDEX_CONTRACT_VERSION = "2.0.0"
+INDEX_FILENAME = ".cache_index.json"
+LOCK_FILENAME = ".cache_index.lock"
+LEASE_DIRNAME = ".leases"
+LEASE_TTL_SECONDS = 6 * 3600
+
+_AUDIO_NAME_RE = re.compile(r"^(?P<key>[0-9a-f]{64})\.(?P<fmt>[a-z0-9]+)$")
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class VoiceCacheIndexEntry(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    cache_key: str
+    audio_file: str
+    size_bytes: int = Field(ge=0)
+    last_access: str
+    voice_id: str
+    projects: list[str] = Field(default_factory=list)
+
+
+class VoiceCacheLease:
+    """Keys one in-flight batch is resolving; written to its lease file under the index lock."""
+
+    def __init__(self, index: VoiceCacheIndex, path: Path) -> None:
+        self.index = index
+        self.path = path
+        self.keys: set[str] = set()
+
+    def extend(self, keys: Iterable[str]) -> None:
+        self.keys.update(keys)
+        payload = {"pid": os.getpid(), "keys": sorted(self.keys)}
+        with self.index._exclusive():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile("w", dir=self.path.parent, delete=False, suffix=".tmp", encoding="utf-8") as tmp:
+                tmp.write(json.dumps(payload))
+                tmp_path = Path(tmp.name)
+            # The lease file's mtime is its last renewal on the index clock, which `_leased_keys` expires against.
+            renewed = self.index._clock()
+            os.utime(tmp_path, (renewed, renewed))
+            tmp_path.replace(self.path)
+
+
+class VoiceCacheIndex:
+    def __init__(self, cache_dir: str | Path, *, clock: Callable[[], float] = time.time) -> None:
+        self.cache_dir = Path(cache_dir)
+        self._clock = clock
+        self._pending: dict[str, VoiceCacheIndexEntry] = {}
+        self._pending_lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / INDEX_FILENAME
+
+    def _timestamp(self, epoch: float | None = None) -> str:
+        moment = self._clock() if epoch is None else epoch
+        return datetime.fromtimestamp(moment, tz=timezone.utc).strftime(_TIMESTAMP_FORMAT)
+
+    def _age_seconds(self, entry: VoiceCacheIndexEntry) -> float:
+        accessed = datetime.strptime(entry.last_access, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        return self._clock() - accessed.timestamp()
+
+    def _audio_files(self, *, flat_only: bool = False) -> Iterator[tuple[str, str, Path]]:
+        """`(cache_key, audio_format, path)` for every cached audio file, sharded ones last."""
+        patterns = ("*",) if flat_only else ("*", "??/??/*")
+        for pattern in patterns:
+            for audio_path in sorted(self.cache_dir.glob(pattern)):
+                match = _AUDIO_NAME_RE.match(audio_path.name)
+                if match is not None and audio_path.is_file():
+                    yield match["key"], match["fmt"], audio_path
+
+    def _scan(self) -> dict[str, VoiceCacheIndexEntry]:
+        entries: dict[str, VoiceCacheIndexEntry] = {}
+        for cache_key, _, audio_path in self._audio_files():
+            voice_id = "unknown"
+            with suppress(OSError, ValueError, KeyError, TypeError):
+                sidecar = json.loads(metadata_sidecar_path(audio_path).read_text(encoding="utf-8"))
+                voice_id = str(sidecar["voice_id"])
+            stat = audio_path.stat()
+            entries[cache_key] = VoiceCacheIndexEntry(
+                cache_key=cache_key,
+                audio_file=audio_path.relative_to(self.cache_dir).as_posix(),
+                size_bytes=stat.st_size,
+                last_access=self._timestamp(stat.st_mtime),
+                voice_id=voice_id,
+            )
+        return entries
+
+    def _read(self) -> dict[str, VoiceCacheIndexEntry]:
+        if not self.index_path.exists():
+            return self._scan() if self.cache_dir.exists() else {}
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self._scan()
+        if payload.get("contract_version") != VOICE_CACHE_INDEX_CONTRACT_VERSION:
+            return self._scan()
+        return {key: VoiceCacheIndexEntry.model_validate(raw) for key, raw in payload.get("entries", {}).items()}
+
+    def _write(self, entries: dict[str, VoiceCacheIndexEntry]) -> None:
+        payload = {
+            "contract_version": VOICE_CACHE_INDEX_CONTRACT_VERSION,
+            "entries": {key: entry.model_dump(mode="json") for key, entry in sorted(entries.items())},
+        }
+        with NamedTemporaryFile("w", dir=self.cache_dir, delete=False, suffix=".tmp", encoding="utf-8") as tmp:
+            tmp.write(json.dumps(payload, indent=2))
+            tmp_path = Path(tmp.name)
+        tmp_path.replace(self.index_path)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with (self.cache_dir / LOCK_FILENAME).open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _locked(self) -> Iterator[dict[str, VoiceCacheIndexEntry]]:
+        with self._exclusive():
+            entries = self._read()
+            yield entries
+            self._write(entries)
+
+    def entries(self) -> dict[str, VoiceCacheIndexEntry]:
+        return self._read()
+
+    def keys(self) -> set[str]:
+        with self._pending_lock:
+            pending = set(self._pending)
+        return set(self._read()) | pending
+
+    def record(self, assets: Iterable[tuple[str, Path, str]], *, project: str | None = None) -> None:
+        """
+        Note `(cache_key, audio_path, voice_id)` assets as accessed now, optionally by
+        `project`. Nothing is written until `flush`.
+        """
+        now = self._timestamp()
+        noted = [
+            VoiceCacheIndexEntry(
+                cache_key=cache_key,
+                audio_file=audio_path.relative_to(self.cache_dir).as_posix(),
+                size_bytes=audio_path.stat().st_size,
+                last_access=now,
+                voice_id=voice_id,
+                projects=[project] if project is not None else [],
+            )
+            for cache_key, audio_path, voice_id in assets
+        ]
+        with self._pending_lock:
+            for entry in noted:
+                previous = self._pending.get(entry.cache_key)
+                if previous is not None:
+                    projects = previous.projects + [p for p in entry.projects if p not in previous.projects]
+                    entry = entry.model_copy(update={"projects": projects})
+                self._pending[entry.cache_key] = entry
+
+    def flush(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_age_seconds: int | None = None,
+        protected: Iterable[str] = (),
+    ) -> list[str]:
+        """
+        Merge the recorded accesses into the index and, when limits are given, evict
+        in the same locked write. Keys recorded since the last flush are protected.
+        Returns the evicted keys, oldest first.
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        limited = max_bytes is not None or max_age_seconds is not None
+        if not pending and not limited:
+            return []
+        with self._locked() as entries:
+            for cache_key, entry in pending.items():
+                previous = entries.get(cache_key)
+                if previous is not None:
+                    projects = previous.projects + [p for p in entry.projects if p not in previous.projects]
+                    entry = entry.model_copy(update={"projects": projects})
+                entries[cache_key] = entry
+            if not limited:
+                return []
+            return self._evict_entries(
+                entries,
+                max_bytes=max_bytes,
+                max_age_seconds=max_age_seconds,
+                protected=set(protected) | set(pending),
+            )
+
+    @contextmanager
+    def lease(self, keys: Iterable[str]) -> Iterator[VoiceCacheLease]:
+        """Protect `keys` (and any added with `VoiceCacheLease.extend`) from eviction for the block."""
+        lease = VoiceCacheLease(self, self.cache_dir / LEASE_DIRNAME / f"{os.getpid()}-{uuid.uuid4().hex}.json")
+        lease.extend(keys)
+        try:
+            yield lease
+        finally:
+            lease.path.unlink(missing_ok=True)
+
+    def _leased_keys(self) -> set[str]:
+        """Keys held by live leases; expired leases are removed. Call with the index lock held."""
+        leased: set[str] = set()
+        for path in sorted((self.cache_dir / LEASE_DIRNAME).glob("*.json")):
+            try:
+                if self._clock() - path.stat().st_mtime > LEASE_TTL_SECONDS:
+                    path.unlink(missing_ok=True)
+                    continue
+                leased.update(json.loads(path.read_text(encoding="utf-8")).get("keys", []))
+            except (OSError, ValueError, AttributeError):
+                continue
+        return leased
+
+    def _remove_files(self, entry: VoiceCacheIndexEntry) -> None:
+        audio_path = self.cache_dir / entry.audio_file
+        for path in (audio_path, metadata_sidecar_path(audio_path)):
+            with suppress(FileNotFoundError):
+                path.unlink()
+
+    def evict(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_age_seconds: int | None = None,
+        protected: Iterable[str] = (),
+        dry_run: bool = False,
+    ) -> list[str]:
+        """
+        Drop entries idle for longer than `max_age_seconds`, then the least recently
+        used ones until the cache fits in `max_bytes`. Protected and leased keys are
+        never removed. Returns the evicted keys, oldest first.
+        """
+        with self._locked() as entries:
+            return self._evict_entries(
+                entries,
+                max_bytes=max_bytes,
+                max_age_seconds=max_age_seconds,
+                protected=set(protected),
+                dry_run=dry_run,
+            )
+
+    def _evict_entries(
+        self,
+        entries: dict[str, VoiceCacheIndexEntry],
+        *,
+        max_bytes: int | None,
+        max_age_seconds: int | None,
+        protected: set[str],
+        dry_run: bool = False,
+    ) -> list[str]:
+        keep = protected | self._leased_keys()
+        candidates = sorted(
+            (entry for key, entry in entries.items() if key not in keep),
+            key=lambda entry: entry.last_access,
+        )
+        evicted: dict[str, VoiceCacheIndexEntry] = {}
+        if max_age_seconds is not None:
+            evicted = {entry.cache_key: entry for entry in candidates if self._age_seconds(entry) > max_age_seconds}
+        if max_bytes is not None:
+            total = sum(entry.size_bytes for key, entry in entries.items() if key not in evicted)
+            for entry in candidates:
+                if total <= max_bytes:
+                    break
+                if entry.cache_key not in evicted:
+                    evicted[entry.cache_key] = entry
+                    total -= entry.size_bytes
+        if not dry_run:
+            for entry in evicted.values():
+                self._remove_files(entry)
+                del entries[entry.cache_key]
+        return [entry.cache_key for entry in sorted(evicted.values(), key=lambda entry: entry.last_access)]
+
+    def forget_projects(self, live_projects: Iterable[str]) -> None:
+        """Drop project references that are no longer live."""
+        live = set(live_projects)
+        with self._locked() as entries:
+            for key, entry in entries.items():
+                entries[key] = entry.model_copy(update={"projects": [p for p in entry.projects if p in live]})
+
+    def migrate_flat_layout(self, *, dry_run: bool = False) -> list[str]:
+        """
+        Move flat `<key>.<fmt>` assets and their sidecars into the sharded layout.
+
+        Each file is moved with a rename, so an interrupted migration leaves every
+        asset readable in one layout or the other and can simply be rerun. A flat
+        copy of an asset that already exists sharded is dropped. Returns the migrated
+        keys.
+        """
+        migrated: list[str] = []
+        with self._locked() as entries:
+            for cache_key, audio_format, flat_path in list(self._audio_files(flat_only=True)):
+                migrated.append(cache_key)
+                if dry_run:
+                    continue
+                target = self.cache_dir / voice_cache_relpath(cache_key, audio_format)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # Sidecar first: an interrupted run then always leaves the flat audio behind to retry.
+                moves = ((metadata_sidecar_path(flat_path), metadata_sidecar_path(target)), (flat_path, target))
+                for source, destination in moves:
+                    if not source.exists():
+                        continue
+                    if destination.exists():
+                        source.unlink()
+                    else:
+                        os.replace(source, destination)
+                if cache_key in entries:
+                    entries[cache_key] = entries[cache_key].model_copy(
+                        update={"audio_file": target.relative_to(self.cache_dir).as_posix()}
+                    )
+        return migrated
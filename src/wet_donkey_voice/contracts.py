@@ -4,6 +4,7 @@ import hashlib
 import json
 import re
 from pathlib import Path
+from tempfile import NamedTemporaryFile
 from typing import Any, Literal, Mapping
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -13,6 +14,13 @@ SUPPORTED_AUDIO_FORMATS = {"mp3", "wav", "m4a", "aac", "ogg", "flac"}
 
 GenerationMode = Literal["cache_hit", "generated", "fallback_generated"]
 
+_SENTENCE_BOUNDARY_RE = re.compile(r"[.!?][\"')\]]?\s+")
+# A period after one of these (or after a single-letter initial) does not end a sentence.
+_ABBREVIATIONS = frozenset(
+    {"approx.", "cf.", "dr.", "e.g.", "etc.", "fig.", "i.e.", "jr.", "mr.", "mrs.", "ms.", "no.", "prof.", "sr.", "st.", "vs."}
+)
+_INITIAL_RE = re.compile(r"[a-z]\.")
+
 
 def _normalize_whitespace(value: str) -> str:
     return " ".join(value.strip().split())
@@ -25,6 +33,29 @@ def normalize_narration_text(text: str) -> str:
     return normalized
 
 
+def _ends_sentence(text: str, boundary: re.Match[str]) -> bool:
+    word = text[: boundary.end()].split()[-1].lstrip("\"'([").lower()
+    return word not in _ABBREVIATIONS and not _INITIAL_RE.fullmatch(word)
+
+
+def split_narration_sentences(text: str) -> list[str]:
+    """
+    Normalized narration split after sentence-ending punctuation; never empty.
+
+    A period after an abbreviation ("e.g.", "Dr.") or an initial does not end a
+    sentence, and decimals ("3.5") never do since no space follows the point.
+    """
+    normalized = normalize_narration_text(text)
+    sentences: list[str] = []
+    start = 0
+    for boundary in _SENTENCE_BOUNDARY_RE.finditer(normalized):
+        if _ends_sentence(normalized, boundary):
+            sentences.append(normalized[start : boundary.end()].rstrip())
+            start = boundary.end()
+    sentences.append(normalized[start:])
+    return sentences
+
+
 def _stable_json(mapping: Mapping[str, Any]) -> str:
     return json.dumps(mapping, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
 
@@ -54,6 +85,17 @@ def text_digest(text: str) -> str:
     return hashlib.sha256(normalize_narration_text(text).encode("utf-8")).hexdigest()
 
 
+class VoiceSegment(BaseModel):
+    """One independently cached sentence inside a composed voice asset."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    cache_key: str
+    text_sha256: str
+    offset_seconds: float = Field(ge=0)
+    duration_seconds: float = Field(gt=0)
+
+
 class VoiceMetadata(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -67,6 +109,7 @@ class VoiceMetadata(BaseModel):
     sample_rate_hz: int = Field(gt=0)
     channels: int = Field(gt=0)
     text_sha256: str
+    segments: list[VoiceSegment] = Field(default_factory=list)
 
     @field_validator("contract_version")
     @classmethod
@@ -112,10 +155,18 @@ def metadata_sidecar_path(audio_path: str | Path) -> Path:
     return path.with_suffix(f"{path.suffix}.json")
 
 
+def voice_cache_relpath(cache_key: str, audio_format: str) -> Path:
+    """Sharded location of a cached asset under the cache root: `ab/cd/<cache_key>.<fmt>`."""
+    return Path(cache_key[:2], cache_key[2:4], f"{cache_key}.{audio_format.lower().lstrip('.')}")
+
+
 def write_metadata_sidecar(result: VoiceSynthesisResult) -> Path:
     sidecar = Path(result.metadata_path)
     sidecar.parent.mkdir(parents=True, exist_ok=True)
-    sidecar.write_text(json.dumps(result.metadata.model_dump(mode="json"), indent=2), encoding="utf-8")
+    with NamedTemporaryFile("w", dir=sidecar.parent, delete=False, suffix=".tmp", encoding="utf-8") as tmp:
+        tmp.write(json.dumps(result.metadata.model_dump(mode="json"), indent=2))
+        tmp_path = Path(tmp.name)
+    tmp_path.replace(sidecar)
     return sidecar
 
 
@@ -0,0 +1,179 @@
+"""
+Measured media properties with a stat-keyed probe cache.
+
+Durations, sample rates and channel counts are read from the files themselves:
+RIFF/WAVE audio natively with the `wave` module, everything else with ffprobe
+(`WD_FFPROBE_BIN`). Results are cached per path together with the file's size,
+mtime and inode, so an unchanged file is never probed twice; any rewrite or
+replacement of the file invalidates its entry. A cache constructed with a
+`cache_path` persists entries as JSON so separate processes share them.
+
+New entries stay in memory until `flush()`, which callers run once per batch of
+work. A flush merges them into the file under an exclusive `fcntl` lock on
+`<cache_path>.lock`, so concurrent processes keep each other's entries. It also
+drops entries whose files no longer exist, which keeps the shared cache bounded
+by the media actually on disk.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import subprocess
+import threading
+import wave
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Callable
+
+FFPROBE_BIN_ENV_VAR = "WD_FFPROBE_BIN"
+DEFAULT_FFPROBE_BIN = "ffprobe"
+PROBE_CACHE_CONTRACT_VERSION = "1.0.0"
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    duration_seconds: float
+    sample_rate_hz: int | None = None
+    channels: int | None = None
+
+
+MediaReader = Callable[[Path], MediaInfo]
+
+
+def ffprobe_bin() -> str:
+    return os.getenv(FFPROBE_BIN_ENV_VAR, "").strip() or DEFAULT_FFPROBE_BIN
+
+
+def is_wav_file(path: Path) -> bool:
+    with path.open("rb") as handle:
+        header = handle.read(12)
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+
+def read_wav_info(path: Path) -> MediaInfo:
+    try:
+        with wave.open(str(path), "rb") as handle:
+            frames = handle.getnframes()
+            sample_rate = handle.getframerate()
+            channels = handle.getnchannels()
+    except (wave.Error, EOFError) as exc:
+        raise ValueError(f"unreadable WAV file {path}: {exc}") from exc
+    if sample_rate <= 0:
+        raise ValueError(f"WAV file has no sample rate: {path}")
+    return MediaInfo(duration_seconds=frames / sample_rate, sample_rate_hz=sample_rate, channels=channels)
+
+
+def ffprobe_media_command(path: Path) -> list[str]:
+    return [
+        ffprobe_bin(),
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration:stream=codec_type,sample_rate,channels",
+        "-of",
+        "json",
+        str(path),
+    ]
+
+
+def read_ffprobe_info(path: Path) -> MediaInfo:
+    result = subprocess.run(ffprobe_media_command(path), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"ffprobe failed for {path} (exit {result.returncode}): {result.stderr.strip()}")
+    try:
+        payload = json.loads(result.stdout)
+        duration = float(payload["format"]["duration"])
+    except (json.JSONDecodeError, LookupError, TypeError, ValueError) as exc:
+        raise ValueError(f"ffprobe returned no duration for {path}") from exc
+
+    audio = next((stream for stream in payload.get("streams", []) if stream.get("codec_type") == "audio"), None)
+    if audio is None:
+        return MediaInfo(duration_seconds=duration)
+    return MediaInfo(
+        duration_seconds=duration,
+        sample_rate_hz=int(audio["sample_rate"]) if audio.get("sample_rate") else None,
+        channels=int(audio["channels"]) if audio.get("channels") else None,
+    )
+
+
+def read_media_info(path: Path) -> MediaInfo:
+    """Measured properties of `path`; ValueError when they cannot be read."""
+    if not path.exists():
+        raise ValueError(f"cannot probe missing media file: {path}")
+    info = read_wav_info(path) if is_wav_file(path) else read_ffprobe_info(path)
+    if info.duration_seconds <= 0:
+        raise ValueError(f"media file has non-positive duration: {path} ({info.duration_seconds})")
+    return info
+
+
+class MediaProbe:
+    def __init__(self, cache_path: str | Path | None = None, *, reader: MediaReader = read_media_info) -> None:
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.reader = reader
+        self.probe_count = 0
+        self._entries: dict[str, dict] | None = None
+        self._dirty: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _read_file(self) -> dict[str, dict]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            payload = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if payload.get("contract_version") != PROBE_CACHE_CONTRACT_VERSION:
+            return {}
+        return dict(payload.get("entries", {}))
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = self._read_file()
+        return self._entries
+
+    def flush(self) -> None:
+        """Merge new entries into the cache file and prune entries for deleted files."""
+        with self._lock:
+            if self.cache_path is None or not self._dirty:
+                return
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.cache_path.with_name(f"{self.cache_path.name}.lock").open("a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    merged = {**self._read_file(), **self._dirty}
+                    merged = {key: entry for key, entry in merged.items() if os.path.exists(key)}
+                    payload = {"contract_version": PROBE_CACHE_CONTRACT_VERSION, "entries": merged}
+                    with NamedTemporaryFile("w", dir=self.cache_path.parent, delete=False, encoding="utf-8") as tmp:
+                        tmp.write(json.dumps(payload, indent=2, sort_keys=True))
+                        tmp_path = Path(tmp.name)
+                    tmp_path.replace(self.cache_path)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+            self._entries = merged
+            self._dirty = {}
+
+    def probe(self, path: Path) -> MediaInfo:
+        if not path.exists():
+            raise ValueError(f"cannot probe missing media file: {path}")
+        key = str(path.resolve())
+        stat = path.stat()
+        signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is not None and entry["signature"] == signature:
+                return MediaInfo(**entry["info"])
+
+        info = self.reader(path)
+        with self._lock:
+            self.probe_count += 1
+            entry = {"signature": signature, "info": asdict(info)}
+            self._load()[key] = entry
+            self._dirty[key] = entry
+        return info
+
+    def duration_seconds(self, path: Path) -> float:
+        return self.probe(path).duration_seconds
@@ -1,22 +1,63 @@
 from __future__ import annotations
 
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Literal, Mapping
+from typing import Any, Literal, Mapping, Sequence
 
+from .audio_concat import concat_audio
+from .backends import SilentWavBackend, SynthesisBackend, SynthesisRequest
+from .cache_index import VoiceCacheIndex, VoiceCacheLease
 from .contracts import (
     VoiceMetadata,
+    VoiceSegment,
     VoiceSynthesisResult,
     build_voice_cache_key,
     metadata_sidecar_path,
     normalize_narration_text,
+    split_narration_sentences,
     text_digest,
     validate_voice_result,
+    voice_cache_relpath,
     write_metadata_sidecar,
 )
+from .probe import MediaInfo, MediaProbe
+
+PROBE_CACHE_FILENAME = ".probe_cache.json"
 
 
 class QwenCachedTTS:
-    """Deterministic cached TTS adapter with explicit metadata contracts."""
+    """
+    Deterministic cached TTS adapter with explicit metadata contracts.
+
+    Cache misses are synthesized by a pluggable `SynthesisBackend` (default: the
+    local `SilentWavBackend` stub); `synthesize_batch` groups them into backend
+    sessions. Both entry points are safe to call from several threads. The audio
+    format of the cache entries is the container the backend writes; requesting a
+    different `audio_format` is an error rather than a mislabelled file.
+
+    Duration, sample rate and channels in `VoiceMetadata` are probed from the cached
+    audio file. Probe results are cached in the voice cache directory, keyed by the
+    file's path, size, mtime and inode.
+
+    Assets are sharded by cache key as `<cache_dir>/ab/cd/<cache_key>.<fmt>` with the
+    sidecar beside them. Audio and sidecar are staged in the shard directory and moved
+    into place with a rename, so readers never see a partial file. Flat caches from
+    before sharding are moved over by `VoiceCacheIndex.migrate_flat_layout`.
+
+    With `segment_sentences`, each narration is split into sentences that are cached
+    on their own, and the scene asset is their concatenation with a segment map of
+    per-sentence offsets in `VoiceMetadata.segments`. Editing one sentence then costs
+    one sentence of synthesis. Composed assets use a cache key that includes the
+    segmentation mode, so they never collide with whole-text assets.
+
+    Cache hits are resolved against the `VoiceCacheIndex` while the batch holds a lease
+    on its keys. The batch's accesses are written in one index flush at the end. When
+    `max_cache_bytes` or `max_cache_age_seconds` is set, that same flush evicts,
+    sparing the keys the batch just used.
+    """
 
     def __init__(
         self,
@@ -25,9 +66,15 @@ class QwenCachedTTS:
         voice_id: str = "qwen-default",
         synthesis_settings: Mapping[str, Any] | None = None,
         fallback_enabled: bool = False,
-        audio_format: str = "mp3",
+        audio_format: str | None = None,
         sample_rate_hz: int = 24000,
         channels: int = 1,
+        probe: MediaProbe | None = None,
+        backend: SynthesisBackend | None = None,
+        index: VoiceCacheIndex | None = None,
+        max_cache_bytes: int | None = None,
+        max_cache_age_seconds: int | None = None,
+        segment_sentences: bool = False,
     ) -> None:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -35,36 +82,201 @@ class QwenCachedTTS:
         self.voice_id = voice_id
         self.synthesis_settings = dict(synthesis_settings or {})
         self.fallback_enabled = fallback_enabled
-        self.audio_format = audio_format.lower().lstrip(".")
         self.sample_rate_hz = sample_rate_hz
         self.channels = channels
+        self.probe = probe or MediaProbe(self.cache_dir / PROBE_CACHE_FILENAME)
+        self.backend = backend or SilentWavBackend()
+        # The cache file's extension and metadata must name the container the backend writes.
+        self.audio_format = self.backend.audio_format.lower().lstrip(".")
+        if audio_format is not None and audio_format.lower().lstrip(".") != self.audio_format:
+            raise ValueError(
+                f"synthesis backend '{self.backend.name}' writes {self.audio_format} audio, not {audio_format}"
+            )
+        self.index = index or VoiceCacheIndex(self.cache_dir)
+        self.max_cache_bytes = max_cache_bytes
+        self.max_cache_age_seconds = max_cache_age_seconds
+        self.segment_sentences = segment_sentences
 
     def synthesize(self, text: str, *, degraded: bool = False) -> VoiceSynthesisResult:
-        normalized_text = normalize_narration_text(text)
-        cache_key = build_voice_cache_key(
-            text=normalized_text,
-            voice_id=self.voice_id,
-            synthesis_settings=self.synthesis_settings,
+        return self.synthesize_batch([text], degraded=degraded)[0]
+
+    def synthesize_batch(
+        self,
+        texts: Sequence[str],
+        *,
+        degraded: bool = False,
+        batch_size: int | None = None,
+        workers: int = 1,
+        project: str | None = None,
+    ) -> list[VoiceSynthesisResult]:
+        """
+        Synthesize many texts, returning results in input order.
+
+        Texts that normalize to the same cache key are synthesized once. Cache hits are
+        resolved in one pass, and only misses reach the backend, as one session by
+        default. Setting `batch_size` opts into splitting the misses into sessions of at
+        most that many texts, of which up to `workers` run concurrently. With `segment_sentences`, the same applies
+        to the sentences of every scene that is not already composed. `project` is
+        recorded as a user of every key in the cache index.
+        """
+        if workers < 1:
+            raise ValueError(f"voice workers must be >= 1, got {workers}")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"voice batch size must be >= 1, got {batch_size}")
+
+        keyed, order = self._keyed(texts, segmented=self.segment_sentences)
+        with self.index.lease(keyed) as lease:
+            indexed = self.index.keys()
+            if self.segment_sentences:
+                results, sentence_results = self._resolve_segmented(
+                    keyed, indexed, degraded=degraded, batch_size=batch_size, workers=workers, lease=lease
+                )
+                used = {**sentence_results, **results}
+            else:
+                results = self._resolve(keyed, indexed, degraded=degraded, batch_size=batch_size, workers=workers)
+                used = results
+
+            self.index.record(
+                ((cache_key, Path(result.audio_path), self.voice_id) for cache_key, result in used.items()),
+                project=project,
+            )
+            self.index.flush(max_bytes=self.max_cache_bytes, max_age_seconds=self.max_cache_age_seconds)
+        self.probe.flush()
+        return [results[cache_key] for cache_key in order]
+
+    def _keyed(self, texts: Sequence[str], *, segmented: bool = False) -> tuple[dict[str, str], list[str]]:
+        """Normalized text per distinct cache key, and the key of every input text in order."""
+        settings = {**self.synthesis_settings, "segmentation": "sentence"} if segmented else self.synthesis_settings
+        keyed: dict[str, str] = {}
+        order: list[str] = []
+        for text in texts:
+            normalized_text = normalize_narration_text(text)
+            cache_key = build_voice_cache_key(
+                text=normalized_text,
+                voice_id=self.voice_id,
+                synthesis_settings=settings,
+            )
+            keyed.setdefault(cache_key, normalized_text)
+            order.append(cache_key)
+        return keyed, order
+
+    def _resolve(
+        self,
+        keyed: Mapping[str, str],
+        indexed: set[str],
+        *,
+        degraded: bool,
+        batch_size: int | None,
+        workers: int,
+    ) -> dict[str, VoiceSynthesisResult]:
+        misses = [
+            cache_key
+            for cache_key in keyed
+            if degraded or cache_key not in indexed or self._probe_or_none(self._audio_path(cache_key)) is None
+        ]
+        if misses:
+            size = batch_size or len(misses)
+            sessions = [misses[index : index + size] for index in range(0, len(misses), size)]
+            with ThreadPoolExecutor(max_workers=min(workers, len(sessions)), thread_name_prefix="wd-tts") as executor:
+                futures = [executor.submit(self._generate_session, session, keyed) for session in sessions]
+            for future in futures:
+                future.result()
+
+        generated = set(misses)
+        return {
+            cache_key: self._build_result(
+                cache_key,
+                normalized_text,
+                generated=cache_key in generated,
+                degraded=degraded,
+            )
+            for cache_key, normalized_text in keyed.items()
+        }
+
+    def _resolve_segmented(
+        self,
+        keyed: Mapping[str, str],
+        indexed: set[str],
+        *,
+        degraded: bool,
+        batch_size: int | None,
+        workers: int,
+        lease: VoiceCacheLease,
+    ) -> tuple[dict[str, VoiceSynthesisResult], dict[str, VoiceSynthesisResult]]:
+        """
+        Scene results composed from independently cached sentences, and the sentence results.
+
+        A composed scene asset with an intact segment map is a cache hit. Otherwise every
+        missing sentence of every missed scene goes to the backend as one batch, and the
+        scene is re-concatenated from its sentence assets.
+        """
+        results: dict[str, VoiceSynthesisResult] = {}
+        plans: dict[str, list[str]] = {}
+        sentences: dict[str, str] = {}
+        for cache_key, normalized_text in keyed.items():
+            segments = None if degraded or cache_key not in indexed else self._cached_segments(cache_key)
+            if segments is not None:
+                results[cache_key] = self._build_result(
+                    cache_key, normalized_text, generated=False, degraded=False, segments=segments
+                )
+                continue
+            sentence_keyed, plans[cache_key] = self._keyed(split_narration_sentences(normalized_text))
+            for sentence_key, sentence_text in sentence_keyed.items():
+                sentences.setdefault(sentence_key, sentence_text)
+
+        lease.extend(sentences)
+        sentence_results = (
+            self._resolve(sentences, indexed, degraded=degraded, batch_size=batch_size, workers=workers)
+            if sentences
+            else {}
         )
-        audio_path = self.cache_dir / f"{cache_key}.{self.audio_format}"
+        for cache_key, sentence_keys in plans.items():
+            parts = [sentence_results[sentence_key] for sentence_key in sentence_keys]
+            results[cache_key] = self._build_result(
+                cache_key,
+                keyed[cache_key],
+                generated=any(part.metadata.generation_mode != "cache_hit" for part in parts),
+                degraded=degraded,
+                segments=self._compose(cache_key, parts),
+            )
+        return results, sentence_results
+
+    def generate_audio(self, text: str) -> tuple[str, float]:
+        """Backwards-compatible tuple return used by older call sites."""
+        result = self.synthesize(text)
+        return result.audio_path, result.metadata.duration_seconds
 
+    def _audio_path(self, cache_key: str) -> Path:
+        return self.cache_dir / voice_cache_relpath(cache_key, self.audio_format)
+
+    def _build_result(
+        self,
+        cache_key: str,
+        normalized_text: str,
+        *,
+        generated: bool,
+        degraded: bool,
+        segments: Sequence[VoiceSegment] = (),
+    ) -> VoiceSynthesisResult:
         generation_mode: Literal["cache_hit", "generated", "fallback_generated"]
-        if audio_path.exists() and not degraded:
+        if not generated:
             generation_mode = "cache_hit"
         else:
             generation_mode = "fallback_generated" if degraded else "generated"
-            self._write_mock_audio(audio_path)
 
+        audio_path = self._audio_path(cache_key)
+        info = self.probe.probe(audio_path)
         metadata = VoiceMetadata(
             voice_id=self.voice_id,
             cache_key=cache_key,
             generation_mode=generation_mode,
             degraded=degraded,
-            duration_seconds=self._estimate_duration_seconds(normalized_text),
+            duration_seconds=info.duration_seconds,
             audio_format=self.audio_format,
-            sample_rate_hz=self.sample_rate_hz,
-            channels=self.channels,
+            sample_rate_hz=info.sample_rate_hz or self.sample_rate_hz,
+            channels=info.channels or self.channels,
             text_sha256=text_digest(normalized_text),
+            segments=list(segments),
         )
 
         result = VoiceSynthesisResult(
@@ -75,17 +287,68 @@ class QwenCachedTTS:
         write_metadata_sidecar(result)
         return validate_voice_result(result, fallback_enabled=self.fallback_enabled)
 
-    def generate_audio(self, text: str) -> tuple[str, float]:
-        """Backwards-compatible tuple return used by older call sites."""
-        result = self.synthesize(text)
-        return result.audio_path, result.metadata.duration_seconds
+    def _probe_or_none(self, audio_path: Path) -> MediaInfo | None:
+        # Missing or unreadable cache entries (e.g. truncated writes) are regenerated, not trusted.
+        if not audio_path.exists():
+            return None
+        try:
+            return self.probe.probe(audio_path)
+        except ValueError:
+            return None
+
+    def _cached_segments(self, cache_key: str) -> list[VoiceSegment] | None:
+        """Segment map of an intact composed asset, or None when it must be recomposed."""
+        audio_path = self._audio_path(cache_key)
+        if self._probe_or_none(audio_path) is None:
+            return None
+        try:
+            payload = json.loads(metadata_sidecar_path(audio_path).read_text(encoding="utf-8"))
+            metadata = VoiceMetadata.model_validate(payload)
+        except (OSError, ValueError):
+            return None
+        return metadata.segments or None
+
+    def _compose(self, cache_key: str, parts: Sequence[VoiceSynthesisResult]) -> list[VoiceSegment]:
+        audio_path = self._audio_path(cache_key)
+        # Keep the audio suffix last so ffmpeg can infer the container of the staging file.
+        staging = audio_path.with_name(f".{os.getpid()}.{threading.get_ident()}.{audio_path.name}")
+        try:
+            concat_audio([Path(part.audio_path) for part in parts], staging)
+            os.replace(staging, audio_path)
+        finally:
+            staging.unlink(missing_ok=True)
 
-    @staticmethod
-    def _estimate_duration_seconds(text: str) -> float:
-        word_count = len(text.split())
-        return max(0.2, word_count * 0.4)
+        segments: list[VoiceSegment] = []
+        offset = 0.0
+        for part in parts:
+            segments.append(
+                VoiceSegment(
+                    cache_key=part.metadata.cache_key,
+                    text_sha256=part.metadata.text_sha256,
+                    offset_seconds=round(offset, 6),
+                    duration_seconds=part.metadata.duration_seconds,
+                )
+            )
+            offset += part.metadata.duration_seconds
+        return segments
 
-    @staticmethod
-    def _write_mock_audio(audio_path: Path) -> None:
-        audio_path.parent.mkdir(parents=True, exist_ok=True)
-        audio_path.write_bytes(b"MOCKAUDIO")
+    def _generate_session(self, cache_keys: list[str], texts: Mapping[str, str]) -> None:
+        # Concurrent callers may share a cache key; each writes its own staging file.
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        staged = {
+            cache_key: self._audio_path(cache_key).with_name(f".{self._audio_path(cache_key).name}.{suffix}")
+            for cache_key in cache_keys
+        }
+        for staging in staged.values():
+            staging.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.backend.synthesize_batch(
+                [SynthesisRequest(text=texts[cache_key], output_path=staged[cache_key]) for cache_key in cache_keys],
+                sample_rate_hz=self.sample_rate_hz,
+                channels=self.channels,
+            )
+            for cache_key, staging in staged.items():
+                os.replace(staging, self._audio_path(cache_key))
+        finally:
+            for staging in staged.values():
+                staging.unlink(missing_ok=True)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run(script: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / script), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_assemble_video_reuses_verified_final_output(tmp_path) -> None:
+    project_dir = tmp_path / "fixture_project"
+    seeded = _run("seed_phase5_fixture.py", "--project-dir", str(project_dir), "--phase", "assemble")
+    assert seeded.returncode == 0, seeded.stderr
+
+    result = _run("assemble_video.py", "--project-dir", str(project_dir))
+
+    assert result.returncode == 0, result.stderr
+    payload = json.loads(result.stdout.strip().splitlines()[-1])
+    assert payload["status"] == "skipped"
+
+
+def test_assemble_video_requires_render_manifest(tmp_path) -> None:
+    result = _run("assemble_video.py", "--project-dir", str(tmp_path))
+
+    assert result.returncode == 2
+    assert "render_manifest.json" in result.stderr
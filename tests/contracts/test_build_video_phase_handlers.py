@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+import subprocess
 from pathlib import Path
 
 
@@ -26,3 +28,31 @@ def test_init_handler_requires_training_corpus_and_dedicated_management_key() ->
     assert "phase start after project bootstrap" in script
     assert "CURRENT_PHASE_ATTEMPT" in script
     assert "requires a dedicated XAI_MANAGEMENT_API_KEY" in script
+
+
+def _shell_functions(*names: str) -> str:
+    root = Path(__file__).resolve().parents[2]
+    script = (root / "scripts" / "build_video.sh").read_text(encoding="utf-8")
+    bodies = []
+    for name in names:
+        match = re.search(rf"^{re.escape(name)}\(\) \{{\n.*?^\}}\n", script, re.MULTILINE | re.DOTALL)
+        assert match is not None, name
+        bodies.append(match.group(0))
+    return "\n".join(bodies)
+
+
+def test_daemon_exit_trap_chains_and_unknown_rpc_methods_fail() -> None:
+    functions = _shell_functions("harness_rpc", "add_exit_trap")
+    program = f"""set -Eeuo pipefail
+log_error() {{ echo "$1" >&2; }}
+{functions}
+trap 'echo existing' EXIT
+add_exit_trap 'echo daemon'
+if harness_rpc rm_rf --all; then echo unexpected; fi
+"""
+
+    result = subprocess.run(["bash", "-c", program], capture_output=True, text=True, check=False)
+
+    assert result.returncode == 0
+    assert result.stdout == "existing\ndaemon\n"
+    assert "Unknown harness RPC method: rm_rf" in result.stderr
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from harness.exit_codes import (
+    BUDGET_EXEMPT_EXIT_CODES,
     EXIT_CODE_POLICIES,
     HarnessExitCode,
     get_exit_code_policy,
@@ -17,9 +18,20 @@ def test_exit_code_table_contains_all_canonical_codes() -> None:
         HarnessExitCode.SCHEMA_VIOLATION,
         HarnessExitCode.POLICY_VIOLATION,
         HarnessExitCode.MANUAL_GATE_REQUIRED,
+        HarnessExitCode.THROTTLED,
     }
 
 
+def test_throttled_is_retryable_and_budget_exempt() -> None:
+    policy = get_exit_code_policy(HarnessExitCode.THROTTLED, phase="build_scenes")
+
+    assert policy.retryable is True
+    assert policy.gate == "runtime"
+    assert policy.owner_component == "harness"
+    assert HarnessExitCode.THROTTLED in BUDGET_EXEMPT_EXIT_CODES
+    assert HarnessExitCode.INFRASTRUCTURE_ERROR not in BUDGET_EXEMPT_EXIT_CODES
+
+
 def test_schema_violation_retryability_is_phase_specific() -> None:
     assert is_retryable_for_phase(HarnessExitCode.SCHEMA_VIOLATION, "plan") is True
     assert is_retryable_for_phase(HarnessExitCode.SCHEMA_VIOLATION, "build_scenes") is True
@@ -9,8 +9,10 @@ from pydantic import ValidationError
 from harness.contracts.media_pipeline import (
     AssemblyManifest,
     RenderManifest,
+    RENDER_PROFILES,
     RenderPreconditions,
     VoiceManifest,
+    resolve_render_profile,
     validate_assembly_inputs,
     validate_render_manifest,
     validate_render_preconditions,
@@ -208,3 +210,62 @@ def test_assembly_verification_rejects_duration_outside_tolerance(tmp_path) -> N
 
     with pytest.raises(ValueError, match="outside tolerance"):
         verify_final_output(assembly_manifest, project_dir=tmp_path)
+
+
+def test_render_profiles_validate_overrides_against_documented_ranges() -> None:
+    assert (RENDER_PROFILES["draft"].resolution, RENDER_PROFILES["draft"].fps) == ("854x480", 15)
+    assert (RENDER_PROFILES["final"].resolution, RENDER_PROFILES["final"].fps) == ("2560x1440", 60)
+
+    profile = resolve_render_profile("final", {"width": 1920, "height": 1080, "fps": 30})
+    assert (profile.name, profile.resolution, profile.fps, profile.codec) == ("final", "1920x1080", 30, "libx264")
+    assert "name" not in profile.settings()
+
+    for overrides in ({"fps": 120}, {"width": 7680}, {"height": 1081}, {"codec": "prores"}):
+        with pytest.raises(ValidationError):
+            resolve_render_profile("draft", overrides)
+    with pytest.raises(ValueError, match="unknown render profile"):
+        resolve_render_profile("preview")
+
+
+def test_assembly_segment_index_must_be_contiguous_and_follow_scene_order() -> None:
+    def manifest(segments: list[dict], stream_path: str | None = "artifacts/assembly/segments.ts") -> dict:
+        return {
+            "run_id": "run-003",
+            "output_path": "final_video.mp4",
+            "scene_order": ["scene_01", "scene_02"],
+            "inputs": [
+                {
+                    "scene_id": scene_id,
+                    "video_path": f"render/{scene_id}.mp4",
+                    "audio_path": f"voice/{scene_id}.mp3",
+                    "duration_seconds": 2.0,
+                }
+                for scene_id in ("scene_01", "scene_02")
+            ],
+            "expected_duration_seconds": 4.0,
+            "actual_duration_seconds": 4.0,
+            "duration_tolerance_seconds": 0.5,
+            "segment_stream_path": stream_path,
+            "segments": segments,
+        }
+
+    def segment(scene_id: str, offset: int, length: int = 100) -> dict:
+        return {
+            "scene_id": scene_id,
+            "input_sha256": "a" * 64,
+            "segment_sha256": "b" * 64,
+            "byte_offset": offset,
+            "byte_length": length,
+            "duration_seconds": 2.0,
+        }
+
+    AssemblyManifest.model_validate(manifest([segment("scene_01", 0), segment("scene_02", 100)]))
+
+    invalid = (
+        manifest([segment("scene_01", 0), segment("scene_02", 120)]),
+        manifest([segment("scene_02", 0), segment("scene_01", 100)]),
+        manifest([segment("scene_01", 0), segment("scene_02", 100)], stream_path=None),
+    )
+    for payload in invalid:
+        with pytest.raises(ValidationError):
+            AssemblyManifest.model_validate(payload)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run(script: str, *args: str, env: dict[str, str] | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / script), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        env=env,
+    )
+
+
+def test_precache_voiceovers_reuses_matching_voice_manifest(tmp_path) -> None:
+    project_dir = tmp_path / "fixture_project"
+    seeded = _run("seed_phase5_fixture.py", "--project-dir", str(project_dir), "--phase", "precache_voiceovers")
+    assert seeded.returncode == 0, seeded.stderr
+
+    result = _run("precache_voiceovers.py", "--project-dir", str(project_dir))
+
+    assert result.returncode == 0, result.stderr
+    payload = json.loads(result.stdout.strip().splitlines()[-1])
+    assert payload["status"] == "skipped"
+    assert payload["voice_manifest"].endswith("artifacts/voice_manifest.json")
+
+
+def test_precache_voiceovers_keeps_stdout_to_the_json_status_line(tmp_path) -> None:
+    project_dir = tmp_path / "fixture_project"
+    seeded = _run("seed_phase5_fixture.py", "--project-dir", str(project_dir), "--phase", "precache_voiceovers")
+    assert seeded.returncode == 0, seeded.stderr
+    env = dict(os.environ, WD_VOICE_CACHE_DIR=str(tmp_path / "voice_cache"))
+
+    result = _run("precache_voiceovers.py", "--project-dir", str(project_dir), "--force", "--workers", "2", env=env)
+
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert len(lines) == 1, result.stdout
+    assert json.loads(lines[0])["status"] == "ok"
+    assert "precaching " in result.stderr
+    assert "voice cache: " in result.stderr
+
+
+def test_precache_voiceovers_requires_scene_manifest(tmp_path) -> None:
+    result = _run("precache_voiceovers.py", "--project-dir", str(tmp_path))
+
+    assert result.returncode == 2
+    assert "scene_manifest.json" in result.stderr
+
+
+def test_precache_voiceovers_rejects_an_unknown_backend(tmp_path) -> None:
+    project_dir = tmp_path / "fixture_project"
+    seeded = _run("seed_phase5_fixture.py", "--project-dir", str(project_dir), "--phase", "precache_voiceovers")
+    assert seeded.returncode == 0, seeded.stderr
+
+    result = _run("precache_voiceovers.py", "--project-dir", str(project_dir), "--force", "--backend", "nope")
+
+    assert result.returncode == 2
+    assert "unknown synthesis backend 'nope'" in result.stderr
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import shutil
+
 import pytest
 
 from harness.contracts.prompt_manifest import (
@@ -11,7 +14,7 @@ from harness.contracts.prompt_manifest import (
     validate_manifest_template_alignment,
     validate_manifest_tool_policy,
 )
-from harness.prompts import compose_prompts, validate_prompt_contracts
+from harness.prompts import PROMPTS_DIR, PromptRegistry, compose_prompts, validate_prompt_contracts
 
 
 def test_all_prompt_contracts_validate() -> None:
@@ -78,3 +81,23 @@ def test_compose_prompts_includes_manifest_tool_contract_block() -> None:
     assert "Required tools: collections_search, code_execution" in system
     assert "`collections_search`:" in system
     assert "`code_execution`:" in system
+
+
+def test_prompt_registry_reuses_compiled_phase_until_assets_change(tmp_path) -> None:
+    prompts_dir = tmp_path / "prompts"
+    shutil.copytree(PROMPTS_DIR, prompts_dir)
+    registry = PromptRegistry(prompts_dir)
+
+    assert registry.warm() == sorted(path.name for path in PROMPTS_DIR.iterdir() if path.is_dir())
+    first = registry.get("00_plan")
+    assert registry.get("00_plan") is first
+
+    user_template = prompts_dir / "00_plan" / "user.md"
+    user_template.write_text(user_template.read_text(encoding="utf-8") + "\nExtra guidance.\n", encoding="utf-8")
+    stat = user_template.stat()
+    os.utime(user_template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    refreshed = registry.get("00_plan")
+    assert refreshed is not first
+    assert refreshed.fingerprint != first.fingerprint
+    assert "Extra guidance." in refreshed.user_template.render(topic="t", retry_context=None)
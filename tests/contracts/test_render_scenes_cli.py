@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run(script: str, *args: str, env: dict[str, str] | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / script), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        env=env,
+    )
+
+
+def test_render_scenes_reuses_valid_render_manifest(tmp_path) -> None:
+    project_dir = tmp_path / "fixture_project"
+    seeded = _run("seed_phase5_fixture.py", "--project-dir", str(project_dir), "--phase", "final_render")
+    assert seeded.returncode == 0, seeded.stderr
+
+    result = _run("render_scenes.py", "--project-dir", str(project_dir))
+
+    assert result.returncode == 0, result.stderr
+    payload = json.loads(result.stdout.strip().splitlines()[-1])
+    assert payload["status"] == "skipped"
+    assert payload["render_manifest"].endswith("artifacts/render_manifest.json")
+
+
+def test_render_scenes_rebuilds_a_manifest_without_recorded_cache_keys(tmp_path) -> None:
+    project_dir = tmp_path / "fixture_project"
+    seeded = _run("seed_phase5_fixture.py", "--project-dir", str(project_dir), "--phase", "final_render")
+    assert seeded.returncode == 0, seeded.stderr
+    (project_dir / "artifacts" / "render_cache_keys.json").unlink()
+    env = dict(os.environ, WD_MANIM_BIN="false", WD_RENDER_CACHE_DIR=str(tmp_path / "cache"))
+
+    result = _run("render_scenes.py", "--project-dir", str(project_dir), "--workers", "2", env=env)
+
+    assert result.returncode == 2
+    assert '"status": "skipped"' not in result.stdout
+    assert "scene(s) failed to render" in result.stderr
+
+
+def test_render_scenes_keeps_stdout_to_the_json_status_line(tmp_path) -> None:
+    project_dir = tmp_path / "fixture_project"
+    seeded = _run("seed_phase5_fixture.py", "--project-dir", str(project_dir), "--phase", "final_render")
+    assert seeded.returncode == 0, seeded.stderr
+    env = dict(os.environ, WD_MANIM_BIN="false", WD_RENDER_CACHE_DIR=str(tmp_path / "cache"))
+
+    result = _run("render_scenes.py", "--project-dir", str(project_dir), "--profile", "draft", "--workers", "2", env=env)
+
+    assert result.returncode == 2
+    lines = result.stdout.splitlines()
+    assert len(lines) == 1, result.stdout
+    assert json.loads(lines[0])["type"] == "draft_render"
+    assert "rendering " in result.stderr
+
+
+def test_render_scenes_requires_render_preconditions(tmp_path) -> None:
+    result = _run("render_scenes.py", "--project-dir", str(tmp_path))
+
+    assert result.returncode == 2
+    assert "render_preconditions.json" in result.stderr
@@ -4,8 +4,11 @@ from harness.contracts.state import (
     DEFAULT_MAX_ATTEMPTS,
     LOOP_SIGNATURE_REPEAT_BLOCK_THRESHOLD,
     clear_phase_failures,
+    advance_scene_stage,
     create_initial_state,
+    get_scene_ledger,
     record_phase_failure,
+    record_scene_failure,
     transition_state,
 )
 
@@ -150,3 +153,41 @@ def test_non_retryable_failure_blocks_immediately() -> None:
     assert payload["phase_status"] == "blocked"
     assert payload["failure_context"]["retryable"] is False
     assert payload["failure_context"]["blocked_reason"] == "NON_RETRYABLE_FAILURE"
+
+
+def test_scene_failures_are_tracked_and_blocked_per_scene() -> None:
+    state = _state_at_phase("build_scenes")
+    state = advance_scene_stage(state, "scene_01", "scaffolded")
+    state = advance_scene_stage(state, "scene_02", "scaffolded")
+
+    failure = {"phase": "build_scenes", "error_code": "VALIDATION_ERROR", "error_message": "missing timing"}
+    state = record_scene_failure(state, "scene_01", **failure)
+    state = record_scene_failure(state, "scene_02", **failure, attempt_delta="prompt tightened")
+    ledger = get_scene_ledger(state)
+    assert ledger["scene_01"].status == "failed"
+    assert ledger["scene_01"].attempts == 1
+    assert ledger["scene_01"].stage == "scaffolded"
+
+    # Same signature again without new evidence: only that scene is blocked.
+    state = record_scene_failure(state, "scene_01", **failure)
+    ledger = get_scene_ledger(state)
+    assert ledger["scene_01"].status == "blocked"
+    assert ledger["scene_01"].blocked_reason == "NO_NEW_EVIDENCE"
+    assert ledger["scene_02"].status == "failed"
+    assert state.phase_status == "active"
+
+    state = advance_scene_stage(state, "scene_02", "built", artifact_hashes={"scene_file": "abc"})
+    entry = get_scene_ledger(state)["scene_02"]
+    assert (entry.status, entry.attempts, entry.artifact_hashes) == ("ok", 0, {"scene_file": "abc"})
+
+
+def test_scene_failure_can_rewind_the_scene_and_keeps_its_attempts() -> None:
+    state = _state_at_phase("scene_qc")
+    state = advance_scene_stage(state, "scene_01", "qc_passed")
+
+    failure = {"phase": "scene_qc", "error_code": "VALIDATION_ERROR", "error_message": "timing drift"}
+    state = record_scene_failure(state, "scene_01", **failure, rewind_to="built")
+    state = record_scene_failure(state, "scene_01", **failure, attempt_delta="pacing shortened", rewind_to="built")
+
+    entry = get_scene_ledger(state)["scene_01"]
+    assert (entry.stage, entry.status, entry.attempts) == ("built", "failed", 2)
@@ -7,9 +7,13 @@ import pytest
 from harness.contracts.state import (
     CONTRACT_VERSION,
     PhaseTransitionError,
+    advance_scene_stage,
     create_initial_state,
+    get_scene_ledger,
     load_state,
+    reset_scene_ledger,
     save_state_atomic,
+    scene_stage_reached,
     transition_state,
 )
 
@@ -71,3 +75,22 @@ def test_legacy_state_payload_is_normalized(tmp_path) -> None:
 
     assert loaded.contract_version == CONTRACT_VERSION
     assert loaded.phase_status == "active"
+
+
+def test_scene_ledger_only_moves_scenes_forward(tmp_path) -> None:
+    state = create_initial_state("demo-project", "Standing waves")
+    state = advance_scene_stage(state, "scene_02", "built")
+    state = advance_scene_stage(state, "scene_01", "narrated")
+
+    assert advance_scene_stage(state, "scene_02", "scaffolded") is state
+    assert scene_stage_reached(state, "scene_02", "scaffolded") is True
+    assert scene_stage_reached(state, "scene_02", "qc_passed") is False
+    assert scene_stage_reached(state, "scene_03", "narrated") is False
+
+    state_file = tmp_path / "project_state.json"
+    save_state_atomic(state_file, state)
+    ledger = get_scene_ledger(load_state(state_file))
+    assert list(ledger) == ["scene_01", "scene_02"]
+    assert ledger["scene_02"].stage == "built"
+
+    assert get_scene_ledger(reset_scene_ledger(state)) == {}
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from harness.contracts.runtime_pipeline import SceneManifest
+from harness.voice_precache import precache_voiceovers, write_voice_manifest
+from wet_donkey_voice.qwen_cached import QwenCachedTTS
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "voice_cache.py"), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_voice_cache_gc_keeps_assets_referenced_by_live_voice_manifests(tmp_path) -> None:
+    cache_dir = tmp_path / "voice_cache"
+    project_dir = tmp_path / "projects" / "demo"
+    service = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav")
+    scene_manifest = SceneManifest.model_validate(
+        {
+            "generated_at": "2026-01-01T00:00:00Z",
+            "scenes": [
+                {
+                    "scene_id": "scene_01",
+                    "scene_index": 1,
+                    "scene_title": "Scene 1",
+                    "scene_description": "A scene.",
+                    "scene_file": "scenes/scene_01.py",
+                    "narration_text": "A line that a live project uses",
+                    "narration_duration_seconds": 2.8,
+                    "visual_ideas": ["idea"],
+                }
+            ],
+        }
+    )
+    write_voice_manifest(project_dir, precache_voiceovers(project_dir, scene_manifest, service=service, workers=1))
+    orphan = service.synthesize("A line nobody references any more")
+
+    dry = _run("gc", "--cache-dir", str(cache_dir), "--projects-root", str(tmp_path / "projects"), "--dry-run")
+    assert dry.returncode == 0, dry.stderr
+    assert json.loads(dry.stdout)["evicted_entries"] == 1
+    assert Path(orphan.audio_path).exists()
+
+    result = _run("gc", "--cache-dir", str(cache_dir), "--projects-root", str(tmp_path / "projects"))
+
+    assert result.returncode == 0, result.stderr
+    payload = json.loads(result.stdout)
+    assert (payload["live_projects"], payload["protected_entries"], payload["evicted_entries"]) == (1, 1, 1)
+    assert not Path(orphan.audio_path).exists()
+    assert (project_dir / "voice" / "scene_01.wav").exists()
+    assert len(list(cache_dir.glob("??/??/*.wav"))) == 1
+
+
+def test_voice_cache_migrate_shards_a_flat_cache(tmp_path) -> None:
+    cache_dir = tmp_path / "voice_cache"
+    result = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav").synthesize("A line from the flat days")
+    flat_audio = cache_dir / Path(result.audio_path).name
+    Path(result.audio_path).replace(flat_audio)
+    Path(result.metadata_path).replace(cache_dir / Path(result.metadata_path).name)
+
+    migrated = _run("migrate", "--cache-dir", str(cache_dir))
+
+    assert migrated.returncode == 0, migrated.stderr
+    assert json.loads(migrated.stdout)["migrated_entries"] == 1
+    assert Path(result.audio_path).exists()
+    assert Path(result.metadata_path).exists()
+    assert not flat_audio.exists()
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import json
+import os
+import wave
 from pathlib import Path
 
 import pytest
 
-from wet_donkey_voice.contracts import build_voice_cache_key
+from wet_donkey_voice.contracts import (
+    build_voice_cache_key,
+    metadata_sidecar_path,
+    split_narration_sentences,
+    voice_cache_relpath,
+)
+from wet_donkey_voice.audio_concat import concat_command
+from wet_donkey_voice.backends import SilentWavBackend, SynthesisRequest
+from wet_donkey_voice.cache_index import LEASE_TTL_SECONDS, VoiceCacheIndex
+from wet_donkey_voice.probe import MediaInfo, MediaProbe
 from wet_donkey_voice.qwen_cached import QwenCachedTTS
 
 
@@ -36,6 +48,14 @@ def test_qwen_cached_service_writes_metadata_and_returns_cache_hit(tmp_path) ->
 
     assert Path(first.audio_path).exists()
     assert Path(first.metadata_path).exists()
+    assert Path(first.audio_path).suffix == ".wav"
+    assert first.metadata.audio_format == "wav"
+    assert Path(first.audio_path).read_bytes()[:4] == b"RIFF"
+
+
+def test_audio_format_must_match_the_backend_container(tmp_path) -> None:
+    with pytest.raises(ValueError, match="writes wav audio, not mp3"):
+        QwenCachedTTS(cache_dir=str(tmp_path / "voice_cache"), audio_format="mp3")
 
 
 def test_degraded_voice_generation_requires_explicit_fallback_enablement(tmp_path) -> None:
@@ -49,3 +69,291 @@ def test_degraded_voice_generation_requires_explicit_fallback_enablement(tmp_pat
 
     assert degraded.metadata.generation_mode == "fallback_generated"
     assert degraded.metadata.degraded is True
+
+
+def test_voice_metadata_durations_are_probed_from_cached_audio(tmp_path) -> None:
+    service = QwenCachedTTS(cache_dir=str(tmp_path / "voice_cache"), audio_format="wav", sample_rate_hz=16000)
+
+    first = service.synthesize("Four words of narration")
+    second = service.synthesize("Four words of narration")
+
+    assert first.metadata.duration_seconds == pytest.approx(1.6)
+    assert (first.metadata.sample_rate_hz, first.metadata.channels) == (16000, 1)
+    assert second.metadata.generation_mode == "cache_hit"
+    assert service.probe.probe_count == 1
+
+
+def test_media_probe_cache_is_keyed_by_file_stat_and_persists(tmp_path) -> None:
+    audio_path = tmp_path / "line.wav"
+    cache_path = tmp_path / "probe_cache.json"
+
+    def write_wav(seconds: float) -> None:
+        with wave.open(str(audio_path), "wb") as handle:
+            handle.setnchannels(2)
+            handle.setsampwidth(2)
+            handle.setframerate(8000)
+            handle.writeframes(b"\x00\x00" * 2 * int(seconds * 8000))
+
+    write_wav(2.0)
+    probe = MediaProbe(cache_path)
+    assert probe.probe(audio_path) == MediaInfo(duration_seconds=2.0, sample_rate_hz=8000, channels=2)
+    probe.probe(audio_path)
+    assert probe.probe_count == 1
+    assert not cache_path.exists()
+    probe.flush()
+
+    reloaded = MediaProbe(cache_path)
+    assert reloaded.duration_seconds(audio_path) == 2.0
+    assert reloaded.probe_count == 0
+
+    write_wav(3.0)
+    assert reloaded.duration_seconds(audio_path) == 3.0
+    assert reloaded.probe_count == 1
+
+    with pytest.raises(ValueError, match="missing media file"):
+        reloaded.probe(tmp_path / "absent.wav")
+
+
+class RecordingBackend(SilentWavBackend):
+    def __init__(self) -> None:
+        self.sessions: list[list[str]] = []
+
+    def synthesize_batch(self, requests, *, sample_rate_hz: int, channels: int) -> None:
+        self.sessions.append([request.text for request in requests])
+        super().synthesize_batch(requests, sample_rate_hz=sample_rate_hz, channels=channels)
+
+
+def test_synthesize_batch_dedupes_texts_and_sends_only_misses_to_the_backend(tmp_path) -> None:
+    backend = RecordingBackend()
+    service = QwenCachedTTS(cache_dir=str(tmp_path / "voice_cache"), audio_format="wav", backend=backend)
+    service.synthesize("Already cached line")
+
+    results = service.synthesize_batch(
+        ["First new line", "Already cached line", "First   new line", "Second new line"]
+    )
+
+    assert backend.sessions == [["Already cached line"], ["First new line", "Second new line"]]
+    assert [result.metadata.generation_mode for result in results] == ["generated", "cache_hit", "generated", "generated"]
+    assert results[0].metadata.cache_key == results[2].metadata.cache_key
+    assert results[3].metadata.duration_seconds == pytest.approx(1.2)
+
+    service.synthesize_batch(["Third line here", "Fourth line here", "Fifth line here"], batch_size=2)
+    assert backend.sessions[2:] == [["Third line here", "Fourth line here"], ["Fifth line here"]]
+
+
+def test_probe_cache_flush_merges_concurrent_writers_and_prunes_deleted_files(tmp_path) -> None:
+    cache_path = tmp_path / "probe_cache.json"
+    paths = {name: tmp_path / f"{name}.wav" for name in ("kept", "other", "deleted", "new")}
+    SilentWavBackend().synthesize_batch(
+        [SynthesisRequest(text=name, output_path=path) for name, path in paths.items()], sample_rate_hz=8000, channels=1
+    )
+
+    first, second = MediaProbe(cache_path), MediaProbe(cache_path)
+    first.probe(paths["kept"])
+    first.probe(paths["deleted"])
+    second.probe(paths["other"])
+    first.flush()
+    second.flush()
+    assert len(json.loads(cache_path.read_text(encoding="utf-8"))["entries"]) == 3
+
+    paths["deleted"].unlink()
+    third = MediaProbe(cache_path)
+    third.probe(paths["kept"])
+    assert third.probe_count == 0
+    third.probe(paths["new"])
+    third.flush()
+
+    entries = json.loads(cache_path.read_text(encoding="utf-8"))["entries"]
+    assert sorted(Path(key).name for key in entries) == ["kept.wav", "new.wav", "other.wav"]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_750_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_voice_cache_index_evicts_by_age_then_lru_size_sparing_protected_keys(tmp_path) -> None:
+    clock = FakeClock()
+    cache_dir = tmp_path / "voice_cache"
+    index = VoiceCacheIndex(cache_dir, clock=clock)
+    service = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav", index=index, sample_rate_hz=8000)
+
+    keys = {}
+    for text in ("oldest line", "middle line", "newest line", "pinned line"):
+        keys[text] = service.synthesize(text).metadata.cache_key
+        clock.now += 3600
+    service.synthesize_batch(["oldest line"], project="/projects/demo")
+    entry = index.entries()[keys["oldest line"]]
+    assert (entry.voice_id, entry.projects) == ("qwen-default", ["/projects/demo"])
+
+    clock.now += 3600
+    assert index.evict(max_age_seconds=3 * 3600 + 60, protected={keys["pinned line"]}) == [keys["middle line"]]
+    middle = cache_dir / voice_cache_relpath(keys["middle line"], "wav")
+    assert not middle.exists()
+    assert not metadata_sidecar_path(middle).exists()
+
+    one_entry = index.entries()[keys["newest line"]].size_bytes
+    evicted = index.evict(max_bytes=one_entry * 2, protected={keys["pinned line"]})
+    assert evicted == [keys["newest line"]]
+    assert set(index.keys()) == {keys["oldest line"], keys["pinned line"]}
+
+
+def test_voice_cache_index_records_in_memory_until_flush(tmp_path) -> None:
+    cache_dir = tmp_path / "voice_cache"
+    audio = cache_dir / voice_cache_relpath("a" * 64, "wav")
+    audio.parent.mkdir(parents=True)
+    audio.write_bytes(b"RIFF")
+    index = VoiceCacheIndex(cache_dir)
+
+    index.record([("a" * 64, audio, "qwen-default")], project="/projects/one")
+    index.record([("a" * 64, audio, "qwen-default")], project="/projects/two")
+
+    assert not (cache_dir / ".cache_index.json").exists()
+    assert "a" * 64 in index.keys()
+    assert index.flush() == []
+    assert VoiceCacheIndex(cache_dir).entries()["a" * 64].projects == ["/projects/one", "/projects/two"]
+
+
+def test_leased_keys_survive_a_concurrent_gc_until_the_lease_ends(tmp_path) -> None:
+    cache_dir = tmp_path / "voice_cache"
+    service = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav", sample_rate_hz=8000)
+    key = service.synthesize("Leased line").metadata.cache_key
+    gc_index = VoiceCacheIndex(cache_dir)
+
+    with service.index.lease([key]):
+        assert gc_index.evict(max_bytes=0) == []
+    assert gc_index.evict(max_bytes=0) == [key]
+
+    # A lease left behind by a crashed process stops protecting its keys once it expires.
+    key = service.synthesize("Orphaned line").metadata.cache_key
+    with service.index.lease([key]) as lease:
+        os.utime(lease.path, (0, 0))
+        assert gc_index.evict(max_bytes=0) == [key]
+        assert not lease.path.exists()
+
+
+def test_lease_expiry_uses_the_index_clock(tmp_path) -> None:
+    clock = FakeClock()
+    cache_dir = tmp_path / "voice_cache"
+    index = VoiceCacheIndex(cache_dir, clock=clock)
+    service = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav", index=index, sample_rate_hz=8000)
+    key = service.synthesize("Clocked line").metadata.cache_key
+
+    with index.lease([key]) as lease:
+        clock.now += LEASE_TTL_SECONDS - 60
+        assert index.evict(max_bytes=0) == []
+        clock.now += 120
+        assert index.evict(max_bytes=0) == [key]
+        assert not lease.path.exists()
+
+
+def test_voice_cache_index_is_rebuilt_from_an_unindexed_cache(tmp_path) -> None:
+    cache_dir = tmp_path / "voice_cache"
+    backend = RecordingBackend()
+    first = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav", backend=backend).synthesize("Legacy line")
+    (cache_dir / ".cache_index.json").unlink()
+
+    again = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav", backend=backend).synthesize("Legacy line")
+
+    assert again.metadata.generation_mode == "cache_hit"
+    assert len(backend.sessions) == 1
+    assert VoiceCacheIndex(cache_dir).entries()[first.metadata.cache_key].voice_id == "qwen-default"
+
+
+def test_voice_cache_assets_are_sharded_by_cache_key(tmp_path) -> None:
+    cache_dir = tmp_path / "voice_cache"
+    result = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav").synthesize("Sharded line")
+    key = result.metadata.cache_key
+
+    assert Path(result.audio_path) == cache_dir / key[:2] / key[2:4] / f"{key}.wav"
+    assert Path(result.metadata_path) == metadata_sidecar_path(result.audio_path)
+    assert VoiceCacheIndex(cache_dir).entries()[key].audio_file == f"{key[:2]}/{key[2:4]}/{key}.wav"
+    assert not list(Path(result.audio_path).parent.glob("*.tmp"))
+
+
+def test_migrate_flat_layout_moves_legacy_assets_into_shards(tmp_path) -> None:
+    cache_dir = tmp_path / "voice_cache"
+    backend = RecordingBackend()
+    first = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav", backend=backend).synthesize("Flat line")
+    key = first.metadata.cache_key
+    flat_audio = cache_dir / f"{key}.wav"
+    Path(first.audio_path).replace(flat_audio)
+    Path(first.metadata_path).replace(metadata_sidecar_path(flat_audio))
+    (cache_dir / ".cache_index.json").unlink()
+
+    index = VoiceCacheIndex(cache_dir)
+    assert index.entries()[key].audio_file == flat_audio.name
+    assert index.migrate_flat_layout(dry_run=True) == [key]
+    assert flat_audio.exists()
+
+    assert index.migrate_flat_layout() == [key]
+    assert not flat_audio.exists()
+    assert index.entries()[key].audio_file == voice_cache_relpath(key, "wav").as_posix()
+    assert index.migrate_flat_layout() == []
+
+    again = QwenCachedTTS(cache_dir=str(cache_dir), audio_format="wav", backend=backend).synthesize("Flat line")
+    assert again.metadata.generation_mode == "cache_hit"
+    assert again.audio_path == first.audio_path
+    assert len(backend.sessions) == 1
+
+
+def test_split_narration_sentences_breaks_after_terminal_punctuation() -> None:
+    assert split_narration_sentences('  Waves move.  Do they?\n"Yes!" they do  ') == [
+        "Waves move.",
+        "Do they?",
+        '"Yes!"',
+        "they do",
+    ]
+    assert split_narration_sentences("No terminal punctuation") == ["No terminal punctuation"]
+
+
+def test_split_narration_sentences_keeps_abbreviations_initials_and_decimals() -> None:
+    text = "Dr. Smith measured 3.5 volts, e.g. with a probe. J. R. Doe agreed (i.e. mostly.) Then it rose."
+    assert split_narration_sentences(text) == [
+        "Dr. Smith measured 3.5 volts, e.g. with a probe.",
+        "J. R. Doe agreed (i.e. mostly.)",
+        "Then it rose.",
+    ]
+
+
+def test_compressed_sentence_audio_is_decoded_and_reencoded_on_concat(tmp_path) -> None:
+    inputs = [tmp_path / "one.mp3", tmp_path / "two.mp3"]
+
+    command = concat_command(inputs, tmp_path / "scene.mp3")
+
+    assert command[command.index("-filter_complex") + 1] == "[0:a][1:a]concat=n=2:v=0:a=1[audio]"
+    assert [command[index + 1] for index, arg in enumerate(command) if arg == "-i"] == [str(path) for path in inputs]
+    assert "copy" not in command
+
+
+def test_segmented_synthesis_resynthesizes_only_edited_sentences(tmp_path) -> None:
+    backend = RecordingBackend()
+    service = QwenCachedTTS(
+        cache_dir=str(tmp_path / "voice_cache"),
+        audio_format="wav",
+        backend=backend,
+        segment_sentences=True,
+    )
+
+    first = service.synthesize("One two. Three four five. Six.")
+    assert backend.sessions == [["One two.", "Three four five.", "Six."]]
+    assert [(segment.offset_seconds, segment.duration_seconds) for segment in first.metadata.segments] == [
+        (0.0, 0.8),
+        (0.8, 1.2),
+        (2.0, 0.4),
+    ]
+    assert first.metadata.duration_seconds == pytest.approx(2.4)
+
+    edited = service.synthesize("One two. Three four five six. Six.")
+    assert backend.sessions[1:] == [["Three four five six."]]
+    assert edited.metadata.generation_mode == "generated"
+    assert edited.metadata.segments[0].cache_key == first.metadata.segments[0].cache_key
+    assert edited.metadata.segments[2].offset_seconds == pytest.approx(2.4)
+
+    again = service.synthesize("One two.   Three four five. Six.")
+    assert again.metadata.generation_mode == "cache_hit"
+    assert again.metadata.segments == first.metadata.segments
+    assert len(backend.sessions) == 2
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import pytest
+
+from harness.schemas.plan import Plan, Scene
+
+
+@pytest.fixture
+def plan() -> Plan:
+    """A valid 12-scene plan titled `Scene 01` .. `Scene 12`."""
+    return Plan(
+        title="Fixture Plan",
+        description="fixture",
+        target_duration_seconds=600,
+        scenes=[
+            Scene(
+                title=f"Scene {index:02d}",
+                description=f"Description {index:02d}",
+                estimated_duration_seconds=30,
+                visual_ideas=["idea"],
+            )
+            for index in range(1, 13)
+        ],
+    )
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+
+from harness.assembly import (
+    AssemblyError,
+    SceneMuxJob,
+    assemble_video,
+    mux_scenes,
+    write_assembly_manifest,
+)
+from harness.contracts.media_pipeline import RENDER_PROFILES, RenderManifest, validate_assembly_inputs
+from harness.media_probe import VideoStreamProfile
+
+H264_1440 = VideoStreamProfile("h264", 2560, 1440, "60/1", "yuv420p")
+
+
+def _render_manifest(project_dir: Path, count: int = 3) -> RenderManifest:
+    scenes = []
+    for index in range(1, count + 1):
+        scene_id = f"scene_{index:02d}"
+        for rel, payload in ((f"render/{scene_id}.mp4", b"VIDEO"), (f"voice/{scene_id}.mp3", b"VOICE")):
+            (project_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+            (project_dir / rel).write_bytes(payload)
+        scenes.append(
+            {
+                "scene_id": scene_id,
+                "video_path": f"render/{scene_id}.mp4",
+                "audio_path": f"voice/{scene_id}.mp3",
+                "video_duration_seconds": 10.0,
+                "audio_duration_seconds": 9.8,
+            }
+        )
+    return RenderManifest(run_id="run-1", scene_order=[scene["scene_id"] for scene in scenes], scenes=scenes)
+
+
+class FakeFfmpeg:
+    def __init__(self, returncode: int = 0, mux_barrier: threading.Barrier | None = None) -> None:
+        self.returncode = returncode
+        self.mux_barrier = mux_barrier
+        self.commands: list[list[str]] = []
+
+    def __call__(self, command: list[str]) -> subprocess.CompletedProcess:
+        self.commands.append(command)
+        if self.mux_barrier is not None and "apad" in command:
+            self.mux_barrier.wait(timeout=5)
+        if self.returncode == 0:
+            first_input = Path(command[command.index("-i") + 1])
+            if "apad" in command:
+                payload = b"MUX[" + first_input.read_bytes() + b"]"
+            elif "mpegts" in command:
+                payload = b"TS[" + first_input.read_bytes() + b"]"
+            elif first_input.suffix == ".ts":
+                payload = first_input.read_bytes()
+            else:
+                payload = b"FINAL"
+            Path(command[-1]).write_bytes(payload)
+        return subprocess.CompletedProcess(command, self.returncode, "", "Invalid data found when processing input\n")
+
+
+def _probe(path: Path) -> float:
+    return 30.2 if path.name == "final_video.mp4" else 10.0
+
+
+def test_matching_codec_profiles_assemble_with_stream_copy_segments(tmp_path) -> None:
+    render_manifest = _render_manifest(tmp_path)
+    ffmpeg = FakeFfmpeg()
+
+    result = assemble_video(
+        tmp_path,
+        render_manifest,
+        profile=RENDER_PROFILES["final"],
+        runner=ffmpeg,
+        probe=_probe,
+        profile_probe=lambda path: H264_1440,
+    )
+
+    assert result.stream_copy is True
+    assert result.reused_scene_ids == ()
+    mux_commands = [command for command in ffmpeg.commands if "apad" in command]
+    assert len(mux_commands) == 3
+    assert all(command[command.index("-c:v") + 1] == "copy" for command in mux_commands)
+    assert all(command[command.index("-t") + 1] == "10.000" for command in mux_commands)
+    *segment_commands, remux = [command for command in ffmpeg.commands if "apad" not in command]
+    assert all(command[command.index("-c") + 1] == "copy" for command in [*segment_commands, remux])
+    assert not any("-filter_complex" in command for command in ffmpeg.commands)
+
+    manifest = result.manifest
+    assert (tmp_path / "final_video.mp4").read_bytes() == b"TS[MUX[VIDEO]]" * 3
+    assert [(segment.byte_offset, segment.byte_length) for segment in manifest.segments] == [
+        (0, 14),
+        (14, 14),
+        (28, 14),
+    ]
+    assert manifest.segment_stream_path == "artifacts/assembly/segments.ts"
+    for staging_dir in ("segments", "muxed"):
+        assert not list((tmp_path / "artifacts" / "assembly" / staging_dir).iterdir())
+    assert (manifest.expected_duration_seconds, manifest.actual_duration_seconds) == (30.0, 30.2)
+    validate_assembly_inputs(manifest, render_manifest=render_manifest, project_dir=tmp_path)
+
+
+def test_reassembly_rebuilds_only_changed_segments(tmp_path) -> None:
+    render_manifest = _render_manifest(tmp_path)
+    first = assemble_video(
+        tmp_path,
+        render_manifest,
+        profile=RENDER_PROFILES["final"],
+        runner=FakeFfmpeg(),
+        probe=_probe,
+        profile_probe=lambda path: H264_1440,
+    )
+    write_assembly_manifest(tmp_path, first.manifest)
+    (tmp_path / "render" / "scene_02.mp4").write_bytes(b"VIDEO-REPAIRED")
+    ffmpeg = FakeFfmpeg()
+
+    second = assemble_video(
+        tmp_path,
+        render_manifest,
+        profile=RENDER_PROFILES["final"],
+        runner=ffmpeg,
+        probe=_probe,
+        profile_probe=lambda path: H264_1440,
+    )
+
+    assert second.reused_scene_ids == ("scene_01", "scene_03")
+    [mux_command, _, _] = ffmpeg.commands
+    assert mux_command[mux_command.index("-i") + 1].endswith("scene_02.mp4")
+    assert (tmp_path / "final_video.mp4").read_bytes() == b"TS[MUX[VIDEO]]TS[MUX[VIDEO-REPAIRED]]TS[MUX[VIDEO]]"
+    assert [(segment.byte_offset, segment.byte_length) for segment in second.manifest.segments] == [
+        (0, 14),
+        (14, 23),
+        (37, 14),
+    ]
+    assert second.manifest.segments[1].input_sha256 != first.manifest.segments[1].input_sha256
+
+
+def test_scenes_mux_in_parallel(tmp_path) -> None:
+    ffmpeg = FakeFfmpeg(mux_barrier=threading.Barrier(3))
+
+    muxed = mux_scenes(
+        tmp_path,
+        [SceneMuxJob.from_asset(tmp_path, scene) for scene in _render_manifest(tmp_path).scenes],
+        workers=3,
+        runner=ffmpeg,
+        probe=lambda path: 10.0,
+    )
+
+    assert sorted(muxed) == ["scene_01", "scene_02", "scene_03"]
+    assert muxed["scene_02"].path.read_bytes() == b"MUX[VIDEO]"
+    assert (tmp_path / "log" / "assembly" / "mux" / "scene_02.log").exists()
+
+
+def test_mux_rejects_durations_outside_tolerance(tmp_path) -> None:
+    render_manifest = _render_manifest(tmp_path)
+    drifted = render_manifest.scenes[0].model_copy(update={"audio_duration_seconds": 8.0})
+    with pytest.raises(ValueError, match="video duration for scene 'scene_01' against its narration"):
+        mux_scenes(tmp_path, [SceneMuxJob.from_asset(tmp_path, drifted)], runner=FakeFfmpeg())
+
+    with pytest.raises(ValueError, match="3 scene mux"):
+        assemble_video(
+            tmp_path,
+            render_manifest,
+            profile=RENDER_PROFILES["final"],
+            runner=FakeFfmpeg(),
+            probe=lambda path: 7.0,
+            profile_probe=lambda path: H264_1440,
+        )
+
+
+def test_mismatched_profiles_fall_back_to_single_reencode_and_verify_output(tmp_path) -> None:
+    render_manifest = _render_manifest(tmp_path)
+    profiles = {"scene_02": VideoStreamProfile("h264", 1920, 1080, "30/1", "yuv420p")}
+    ffmpeg = FakeFfmpeg()
+
+    result = assemble_video(
+        tmp_path,
+        render_manifest,
+        profile=RENDER_PROFILES["final"],
+        runner=ffmpeg,
+        probe=lambda path: 30.0,
+        profile_probe=lambda path: profiles.get(path.stem, H264_1440),
+    )
+
+    assert result.stream_copy is False
+    [command] = ffmpeg.commands
+    assert command[command.index("-c:v") + 1] == "libx264"
+    filter_graph = command[command.index("-filter_complex") + 1]
+    assert "[0:v][1:a]" not in filter_graph
+    assert "[3:a]aresample=48000,aformat=channel_layouts=stereo,apad,atrim=duration=10.000" in filter_graph
+    assert filter_graph.endswith("[v0][a0][v1][a1][v2][a2]concat=n=3:v=1:a=1[vout][aout]")
+    assert command[command.index("-map") + 1 : command.index("-map") + 4] == ["[vout]", "-map", "[aout]"]
+    assert "concat" not in command[: command.index("-filter_complex")]
+
+    with pytest.raises(ValueError, match="outside tolerance"):
+        assemble_video(
+            tmp_path,
+            render_manifest,
+            profile=RENDER_PROFILES["final"],
+            runner=FakeFfmpeg(),
+            probe=lambda path: 25.0 if path.name == "final_video.mp4" else 10.0,
+            profile_probe=lambda path: H264_1440,
+        )
+    with pytest.raises(AssemblyError, match="reproduce with: ffmpeg"):
+        assemble_video(
+            tmp_path,
+            render_manifest,
+            profile=RENDER_PROFILES["final"],
+            runner=FakeFfmpeg(returncode=1),
+            profile_probe=lambda path: H264_1440,
+        )
+
+
+
+def test_reassembly_rebuilds_segments_whose_bytes_no_longer_match(tmp_path) -> None:
+    render_manifest = _render_manifest(tmp_path)
+    kwargs = dict(profile=RENDER_PROFILES["final"], probe=_probe, profile_probe=lambda path: H264_1440)
+    first = assemble_video(tmp_path, render_manifest, runner=FakeFfmpeg(), **kwargs)
+    write_assembly_manifest(tmp_path, first.manifest)
+    stream = tmp_path / "artifacts" / "assembly" / "segments.ts"
+    # Same total size, but the middle segment's bytes are corrupted.
+    data = bytearray(stream.read_bytes())
+    data[21:26] = b"XXXXX"
+    stream.write_bytes(bytes(data))
+
+    second = assemble_video(tmp_path, render_manifest, runner=FakeFfmpeg(), **kwargs)
+
+    assert second.reused_scene_ids == ("scene_01", "scene_03")
+    assert (tmp_path / "final_video.mp4").read_bytes() == b"TS[MUX[VIDEO]]" * 3
+
+    write_assembly_manifest(tmp_path, second.manifest)
+    forced = assemble_video(tmp_path, render_manifest, runner=FakeFfmpeg(), reuse_segments=False, **kwargs)
+    assert forced.reused_scene_ids == ()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from harness import async_client
+from harness.parser import SemanticValidationError
+from harness.schemas.plan import Plan
+from harness.schemas.scene_build import SceneBuild
+from harness.session import AsyncPipelineTrainingSession
+
+
+def _async_session(response) -> MagicMock:
+    session = MagicMock()
+    chat = MagicMock()
+    chat.sample = AsyncMock(return_value=response)
+    session.create_chat.return_value = chat
+    return session
+
+
+def test_async_generate_plan_shares_validation_and_updates_session(plan: Plan) -> None:
+    response = MagicMock(content=plan.model_dump_json(), id="resp_async_plan")
+    session = _async_session(response)
+
+    result = asyncio.run(async_client.generate_plan(session, "a topic"))
+
+    assert isinstance(result, Plan)
+    session.create_chat.assert_called_once_with(phase="plan", response_format=Plan)
+    session.update_response_id.assert_called_once_with("resp_async_plan")
+
+
+def test_async_generate_scene_enforces_timing_validation() -> None:
+    response = MagicMock(
+        content=SceneBuild(scene_body="self.add(Dot())", reasoning="r").model_dump_json(),
+        id="resp_scene",
+        server_side_tool_usage={},
+    )
+    session = _async_session(response)
+
+    with pytest.raises(SemanticValidationError):
+        asyncio.run(async_client.generate_scene(session, {"title": "t", "description": "d", "visual_ideas": ["v"]}))
+
+    session.update_response_id.assert_not_called()
+
+
+def test_async_calls_multiplex_on_one_event_loop() -> None:
+    active = 0
+    peak = 0
+
+    async def slow_sample():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return MagicMock(
+            content=SceneBuild(scene_body="self.wait(1)", reasoning="r").model_dump_json(),
+            id="resp",
+            server_side_tool_usage={"SERVER_SIDE_TOOL_CODE_EXECUTION": 1},
+        )
+
+    session = MagicMock()
+    session.create_chat.side_effect = lambda **_: MagicMock(sample=slow_sample)
+    spec = {"title": "t", "description": "d", "visual_ideas": ["v"], "narration_duration": 3.0}
+
+    async def run_all():
+        return await asyncio.gather(*(async_client.generate_scene(session, spec) for _ in range(8)))
+
+    results = asyncio.run(run_all())
+
+    assert len(results) == 8
+    assert peak == 8
+
+
+def test_async_session_uses_async_client_and_shared_chat_options() -> None:
+    with (
+        patch("harness.session.AsyncClient") as mock_async_client,
+        patch("harness.session.Client") as mock_client,
+        patch("harness.session.collections_search", return_value="collections_tool"),
+        patch("harness.session.code_execution", return_value="code_tool"),
+        patch("harness.session.web_search", return_value="web_tool"),
+        patch.dict(os.environ, {"FH_ENABLE_TRAINING_CORPUS": "1"}, clear=False),
+    ):
+        session = AsyncPipelineTrainingSession(project_dir="/tmp/test_project", collection_ids=["coll_a"])
+        session.create_chat("build_scenes")
+
+        mock_client.assert_not_called()
+        kwargs = mock_async_client.return_value.chat.create.call_args.kwargs
+        assert kwargs == session.chat_options("build_scenes")
+        assert kwargs["tools"] == ["collections_tool", "code_tool"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+from harness.client_pool import KEEPALIVE_CHANNEL_OPTIONS, ClientPool
+from harness.session import PipelineTrainingSession
+
+
+def test_pool_reuses_one_client_per_host_and_key() -> None:
+    pool = ClientPool()
+    factory = MagicMock(__name__="Client", side_effect=lambda **_: object())
+
+    first = pool.acquire(factory, api_key="key-a", api_host="api.x.ai")
+    second = pool.acquire(factory, api_key="key-a", api_host="api.x.ai")
+    other_host = pool.acquire(factory, api_key="key-a", api_host="eu.api.x.ai")
+    other_key = pool.acquire(factory, api_key="key-b", api_host="api.x.ai")
+
+    assert first is second
+    assert factory.call_count == 3
+    assert other_host is not first
+    assert other_key is not first
+    factory.assert_any_call(api_key="key-a", api_host="api.x.ai", channel_options=list(KEEPALIVE_CHANNEL_OPTIONS))
+
+    stats = {(entry["api_host"], entry["created"], entry["reused"]) for entry in pool.stats()}
+    assert ("api.x.ai", 1, 1) in stats
+    assert ("eu.api.x.ai", 1, 0) in stats
+
+
+def test_pool_creates_single_client_under_concurrent_acquire() -> None:
+    pool = ClientPool()
+    factory = MagicMock(__name__="Client", side_effect=lambda **_: object())
+    clients: list[object] = []
+    barrier = threading.Barrier(8)
+
+    def acquire() -> None:
+        barrier.wait()
+        clients.append(pool.acquire(factory, api_key="key", api_host="api.x.ai"))
+
+    threads = [threading.Thread(target=acquire) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert factory.call_count == 1
+    assert len({id(client) for client in clients}) == 1
+    assert pool.stats()[0]["reused"] == 7
+
+
+def test_sessions_share_pooled_client(tmp_path) -> None:
+    with (
+        patch("harness.session.Client") as mock_client,
+        patch.dict(os.environ, {"XAI_API_KEY": "pool-test-key"}, clear=False),
+    ):
+        first = PipelineTrainingSession(project_dir=tmp_path, collection_ids=[])
+        second = PipelineTrainingSession(project_dir=tmp_path, collection_ids=[])
+
+    assert first.client is second.client
+    mock_client.assert_called_once()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from harness.contracts.state import create_initial_state, save_state_atomic
+from harness.daemon import (
+    JSONRPC_INVALID_PARAMS,
+    JSONRPC_METHOD_NOT_FOUND,
+    HarnessDaemon,
+    HarnessDaemonServer,
+)
+from harness.exit_codes import HarnessExitCode
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def _request(method: str, **params) -> bytes:
+    return json.dumps({"jsonrpc": "2.0", "id": 7, "method": method, "params": params}).encode("utf-8")
+
+
+def _seed_state(project_dir: Path) -> None:
+    project_dir.mkdir(parents=True, exist_ok=True)
+    save_state_atomic(project_dir / "project_state.json", create_initial_state("daemon", "topic"))
+
+
+@pytest.fixture(scope="module")
+def harness_daemon() -> HarnessDaemon:
+    daemon = HarnessDaemon()
+    daemon.warm()
+    return daemon
+
+
+def test_daemon_runs_state_verbs_in_process(harness_daemon, tmp_path) -> None:
+    _seed_state(tmp_path)
+
+    response = harness_daemon.handle_request(
+        _request("update_project_state", argv=["get", "--project-dir", str(tmp_path), "--key", "phase"])
+    )
+
+    assert response["id"] == 7
+    assert response["result"] == {"exit_code": 0, "stdout": "init\n", "stderr": ""}
+
+
+def test_daemon_maps_system_exit_codes_and_captures_stderr(harness_daemon, tmp_path) -> None:
+    response = harness_daemon.handle_request(
+        _request("runtime_phase_contracts", argv=["validate-build-scenes", "--project-dir", str(tmp_path / "missing")])
+    )
+
+    result = response["result"]
+    assert result["exit_code"] == int(HarnessExitCode.POLICY_VIOLATION)
+    assert "project directory not found" in result["stderr"]
+
+
+def test_daemon_applies_caller_env_and_restores_its_own(harness_daemon, tmp_path) -> None:
+    os.environ.pop("FH_HARNESS", None)
+    env = dict(os.environ, FH_HARNESS="legacy")
+
+    response = harness_daemon.handle_request(
+        _request(
+            "harness.cli",
+            argv=["--phase", "plan", "--project-dir", str(tmp_path), "--topic", "t", "--dry-run"],
+            env=env,
+            cwd=str(tmp_path),
+        )
+    )
+
+    assert response["result"]["exit_code"] == int(HarnessExitCode.POLICY_VIOLATION)
+    assert "FH_HARNESS" not in os.environ
+    assert os.getcwd() != str(tmp_path)
+
+
+def test_daemon_rejects_unknown_methods_and_bad_params(harness_daemon) -> None:
+    unknown = harness_daemon.handle_request(_request("rm_rf", argv=[]))
+    assert unknown["error"]["code"] == JSONRPC_METHOD_NOT_FOUND
+
+    bad = harness_daemon.handle_request(_request("update_project_state", argv="get"))
+    assert bad["error"]["code"] == JSONRPC_INVALID_PARAMS
+
+
+def test_wd_rpc_client_round_trips_through_socket_and_falls_back(harness_daemon, tmp_path) -> None:
+    _seed_state(tmp_path)
+    socket_path = Path(tempfile.mkdtemp(dir="/tmp")) / "wd.sock"
+    server = HarnessDaemonServer(socket_path, harness_daemon)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    command = [
+        sys.executable,
+        str(ROOT_DIR / "scripts" / "wd_rpc.py"),
+        "--socket",
+        str(socket_path),
+        "update_project_state",
+        "get",
+        "--project-dir",
+        str(tmp_path),
+        "--key",
+        "phase",
+    ]
+    env = dict(os.environ, PYTHONPATH=str(ROOT_DIR / "src"))
+    try:
+        via_daemon = subprocess.run(command, capture_output=True, text=True, env=env, check=False)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert via_daemon.returncode == 0
+    assert via_daemon.stdout == "init\n"
+    assert not socket_path.exists()
+
+    fallback = subprocess.run(command, capture_output=True, text=True, env=env, check=False)
+    assert fallback.returncode == 0
+    assert fallback.stdout == "init\n"
+    assert "running update_project_state directly" in fallback.stderr
+
+
+def _barrier_daemon(parties: int) -> HarnessDaemon:
+    barrier = threading.Barrier(parties, timeout=5)
+
+    def entry_point(argv: list[str]) -> int:
+        barrier.wait()
+        worker = threading.Thread(target=print, args=(f"worker {argv[0]}",))
+        worker.start()
+        worker.join()
+        print(f"request {argv[0]} cwd={os.getcwd()}")
+        return 0
+
+    daemon = HarnessDaemon()
+    daemon._entry_points = {"probe": entry_point}
+    return daemon
+
+
+def _run_concurrently(daemon: HarnessDaemon, requests: list[bytes]) -> list[dict]:
+    responses: list[dict] = [{} for _ in requests]
+
+    def call(index: int) -> None:
+        responses[index] = daemon.handle_request(requests[index])
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return responses
+
+
+def test_daemon_runs_same_context_requests_concurrently_with_separate_output(tmp_path) -> None:
+    daemon = _barrier_daemon(2)
+    env = dict(os.environ)
+
+    responses = _run_concurrently(
+        daemon,
+        [_request("probe", argv=[name], env=env, cwd=str(tmp_path)) for name in ("a", "b")],
+    )
+
+    for name, response in zip(("a", "b"), responses):
+        assert response["result"]["exit_code"] == 0
+        assert response["result"]["stdout"] == f"worker {name}\nrequest {name} cwd={tmp_path}\n"
+    assert os.getcwd() != str(tmp_path)
+
+
+def test_daemon_runs_requests_with_different_contexts_one_at_a_time(tmp_path) -> None:
+    lock = threading.Lock()
+    running: list[int] = [0, 0]
+
+    def entry_point(argv: list[str]) -> int:
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.2)
+        print(os.getcwd())
+        with lock:
+            running[0] -= 1
+        return 0
+
+    daemon = HarnessDaemon()
+    daemon._entry_points = {"probe": entry_point}
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+
+    responses = _run_concurrently(
+        daemon,
+        [_request("probe", argv=[], cwd=str(first)), _request("probe", argv=[], cwd=str(second))],
+    )
+
+    assert [response["result"]["stdout"] for response in responses] == [f"{first}\n", f"{second}\n"]
+    assert running[1] == 1
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from harness import cli
+from harness.client import stream_narration
+from harness.contracts.state import create_initial_state, save_state_atomic, transition_state, update_state_key
+from harness.parser import NarrationStreamParser
+from harness.schemas.narration import Narration, NarrationScene
+from harness.schemas.plan import Plan
+
+
+def _narration(plan: Plan) -> Narration:
+    return Narration(
+        scenes=[
+            NarrationScene(scene_title=scene.title, narration_text=f'Say "{scene.title}" {{braces}} [x]\\n')
+            for scene in plan.scenes
+        ]
+    )
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[offset:offset + size] for offset in range(0, len(text), size)]
+
+
+def _stream_session(project_dir: Path, narration: Narration, chunk_size: int, seen: list) -> MagicMock:
+    content = narration.model_dump_json()
+    final = SimpleNamespace(id="resp_narration", content=content, usage=None, server_side_tool_usage={})
+
+    def stream():
+        for delta in _chunks(content, chunk_size):
+            seen.append(("chunk", delta))
+            yield final, SimpleNamespace(content=delta)
+
+    session = MagicMock()
+    session.project_dir = project_dir
+    session.response_id = None
+    session.create_chat.return_value.stream.side_effect = stream
+    return session
+
+
+def test_parser_emits_scenes_as_elements_close_for_any_chunking(plan: Plan) -> None:
+    narration = _narration(plan)
+    content = json.dumps(narration.model_dump(mode="json"), indent=2)
+
+    for size in (1, 7, len(content)):
+        parser = NarrationStreamParser()
+        emitted = [scene for delta in _chunks(content, size) for scene in parser.feed(delta)]
+        assert emitted == narration.scenes
+
+    parser = NarrationStreamParser()
+    # The first "}" in the document sits inside a narration string, not at the element end.
+    first_end = content.index("\n    }") + len("\n    }")
+    assert parser.feed(content[:first_end - 1]) == []
+    assert parser.feed(content[first_end - 1:first_end]) == narration.scenes[:1]
+
+
+def test_parser_selects_the_scenes_array_by_key_not_by_string_value() -> None:
+    scene = {"scene_title": "Only", "narration_text": "Real scene"}
+    document = json.dumps(
+        {"section": "scenes", "outline": [{"scene_title": "Decoy", "narration_text": "Not a scene"}], "scenes": [scene]}
+    )
+    parser = NarrationStreamParser()
+
+    for char in document:
+        parser.feed(char)
+
+    assert [item.scene_title for item in parser.scenes] == ["Only"]
+
+
+def test_stream_narration_reports_scenes_before_stream_ends(tmp_path, plan: Plan) -> None:
+    narration = _narration(plan)
+    events: list = []
+    session = _stream_session(tmp_path, narration, 40, events)
+
+    result = stream_narration(session, plan, lambda index, scene: events.append(("scene", index)))
+
+    assert result == narration
+    scene_events = [item for item in events if item[0] == "scene"]
+    assert [index for _, index in scene_events] == list(range(len(plan.scenes)))
+    assert events.index(("scene", 0)) < len(events) - len(plan.scenes)
+    session.update_response_id.assert_called_once_with("resp_narration")
+
+
+def test_cli_stream_persists_progress_and_partial_narration_script(tmp_path, plan: Plan) -> None:
+    narration = _narration(plan)
+    state = create_initial_state("stream", "topic")
+    for phase in ("plan", "review", "narration"):
+        state = transition_state(state, phase)
+    state = update_state_key(state, "plan", plan.model_dump(mode="json"))
+    save_state_atomic(tmp_path / "project_state.json", state)
+
+    snapshots: list[tuple[int, str]] = []
+    writer = cli.NarrationProgressWriter
+
+    class RecordingWriter(writer):
+        def __call__(self, index, scene) -> None:
+            super().__call__(index, scene)
+            payload = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))
+            script = (tmp_path / "narration_script.py").read_text(encoding="utf-8")
+            snapshots.append((payload["narration_progress"]["completed_scenes"], script))
+
+    session = _stream_session(tmp_path, narration, 64, [])
+    with (
+        patch("harness.cli.PipelineTrainingSession.from_project", return_value=session),
+        patch("harness.cli.NarrationProgressWriter", RecordingWriter),
+    ):
+        rc = cli.main(["--phase", "narration", "--project-dir", str(tmp_path), "--stream"])
+
+    assert rc == 0
+    assert [count for count, _ in snapshots] == list(range(1, len(plan.scenes) + 1))
+    assert '"scene_01"' in snapshots[0][1]
+    assert '"scene_02"' not in snapshots[0][1]
+
+    payload = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))
+    assert payload["narration"] == narration.model_dump(mode="json")
+    assert "narration_progress" not in payload
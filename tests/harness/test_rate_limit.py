@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+
+import grpc
+import pytest
+
+from harness.batch import BatchResult, SceneOutcome, record_batch_failure
+from harness.contracts.state import create_initial_state, save_state_atomic, transition_state
+from harness.exit_codes import HarnessExitCode
+from harness.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    ThrottledError,
+    get_rate_limiter,
+    reset_rate_limiter,
+    TokenBucket,
+    backoff_delay,
+    is_throttle_error,
+    retry_after_seconds,
+)
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode, details: str = "", metadata=()) -> None:
+        self._code = code
+        self._details = details
+        self._metadata = metadata
+
+    def code(self) -> grpc.StatusCode:
+        return self._code
+
+    def details(self) -> str:
+        return self._details
+
+    def trailing_metadata(self):
+        return self._metadata
+
+
+def _throttle(details: str = "rate limit exceeded", metadata=()) -> FakeRpcError:
+    return FakeRpcError(grpc.StatusCode.RESOURCE_EXHAUSTED, details, metadata)
+
+
+def test_throttle_detection_and_retry_after_parsing() -> None:
+    assert is_throttle_error(_throttle()) is True
+    assert is_throttle_error(FakeRpcError(grpc.StatusCode.UNAVAILABLE)) is False
+    assert is_throttle_error(ValueError("RESOURCE_EXHAUSTED")) is False
+
+    assert retry_after_seconds(_throttle(metadata=(("retry-after", "7"),))) == 7.0
+    assert retry_after_seconds(_throttle("Too many requests, retry after 1500ms")) == 1.5
+    assert retry_after_seconds(_throttle("Too many requests")) is None
+
+
+def test_backoff_is_exponential_jittered_and_respects_retry_after() -> None:
+    assert backoff_delay(0, rng=lambda: 0.5) == pytest.approx(2.0)
+    assert backoff_delay(2, rng=lambda: 0.5) == pytest.approx(8.0)
+    assert backoff_delay(2, rng=lambda: 1.0) == pytest.approx(9.6)
+    assert backoff_delay(10, rng=lambda: 0.5) == pytest.approx(60.0)
+    assert backoff_delay(0, retry_after=30, rng=lambda: 0.5) == pytest.approx(30.0)
+
+
+def test_aimd_window_halves_on_throttle_and_grows_additively() -> None:
+    limiter = AdaptiveConcurrencyLimiter(8)
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 4
+
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(succeeded=True)
+    assert limiter.limit == 5
+
+    for _ in range(5):
+        assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is False
+
+
+def test_token_bucket_paces_after_burst() -> None:
+    now = [0.0]
+    bucket = TokenBucket(2.0, capacity=2, clock=lambda: now[0])
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    now[0] += 1.0
+    assert bucket.reserve() == pytest.approx(0.0)
+
+
+def test_rate_limiter_retries_throttling_with_shared_backoff() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(max_concurrency=4, clock=lambda: now[0], sleep=sleep, rng=lambda: 0.5)
+    responses = iter([_throttle(metadata=(("retry-after", "5"),)), _throttle(), "ok"])
+
+    def flaky():
+        item = next(responses)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    assert limiter.call(flaky) == "ok"
+    assert sleeps == [pytest.approx(5.0), pytest.approx(4.0)]
+    assert limiter.throttle_events == 2
+    # 4 -> 2 -> 1 on the two throttles, then +1/1 after the successful call.
+    assert limiter.concurrency.limit == 2
+
+
+def test_rate_limiter_raises_throttled_after_budget_and_passes_other_errors() -> None:
+    limiter = RateLimiter(max_throttle_retries=2, sleep=lambda _: None, rng=lambda: 0.5)
+
+    def always_throttled():
+        raise _throttle()
+
+    with pytest.raises(ThrottledError):
+        limiter.call(always_throttled)
+
+    calls = []
+
+    def unavailable():
+        calls.append(1)
+        raise FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+
+    with pytest.raises(grpc.RpcError):
+        limiter.call(unavailable)
+    assert len(calls) == 1
+
+
+def test_rate_limiter_follows_environment_changes_in_a_long_lived_process(monkeypatch) -> None:
+    reset_rate_limiter()
+    monkeypatch.setenv("WD_XAI_MAX_CONCURRENCY", "4")
+    first = get_rate_limiter()
+    assert get_rate_limiter() is first
+    assert first.concurrency.maximum == 4
+
+    monkeypatch.setenv("WD_XAI_MAX_CONCURRENCY", "2")
+    second = get_rate_limiter()
+    assert second is not first
+    assert second.concurrency.maximum == 2
+
+    monkeypatch.setenv("WD_XAI_MAX_CONCURRENCY", "4")
+    assert get_rate_limiter() is first
+    reset_rate_limiter()
+
+
+def test_throttle_only_batch_does_not_consume_retry_budget(tmp_path) -> None:
+    state = create_initial_state("throttle", "topic")
+    for phase in ("plan", "review", "narration", "build_scenes"):
+        state = transition_state(state, phase)
+    save_state_atomic(tmp_path / "project_state.json", state)
+
+    throttled = BatchResult(
+        phase="build_scenes",
+        outcomes=(
+            SceneOutcome("scene_01", HarnessExitCode.SUCCESS),
+            SceneOutcome("scene_02", HarnessExitCode.THROTTLED, "ThrottledError: slow down"),
+        ),
+    )
+    assert throttled.exit_code is HarnessExitCode.THROTTLED
+    assert record_batch_failure(tmp_path, throttled) is False
+    payload = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))
+    assert payload["attempt_counters"] == {}
+
+    mixed = BatchResult(
+        phase="build_scenes",
+        outcomes=throttled.outcomes + (SceneOutcome("scene_03", HarnessExitCode.VALIDATION_ERROR, "bad"),),
+    )
+    assert mixed.exit_code is HarnessExitCode.VALIDATION_ERROR
+    record_batch_failure(tmp_path, mixed)
+    payload = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))
+    assert payload["attempt_counters"] == {"build_scenes": 1}
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+
+from harness.contracts.media_pipeline import VoiceManifest, validate_render_manifest
+from harness.contracts.runtime_pipeline import build_scene_manifest, ensure_scene_scaffolds
+from harness.render import (
+    DRAFT_PROFILE,
+    RENDER_WORKERS_ENV_VAR,
+    RenderBatchError,
+    build_render_manifest,
+    draft_gate_failures,
+    draft_timings,
+    invalidate_draft_renders,
+    render_cache_keys,
+    render_profile_from_env,
+    render_scenes,
+    render_worker_count,
+)
+from harness.render_cache import RenderCache
+from harness.schemas.narration import Narration, NarrationScene
+from harness.schemas.plan import Plan, Scene
+
+
+def _scene_manifest(project_dir: Path):
+    plan = Plan(
+        title="Render Plan",
+        description="fixture",
+        target_duration_seconds=600,
+        scenes=[
+            Scene(
+                title=f"Scene {index:02d}",
+                description="d",
+                estimated_duration_seconds=30,
+                visual_ideas=["v"],
+            )
+            for index in range(1, 13)
+        ],
+    )
+    narration = Narration(
+        scenes=[NarrationScene(scene_title=scene.title, narration_text=f"Narration for {scene.title}") for scene in plan.scenes]
+    )
+    manifest = build_scene_manifest(plan, narration)
+    ensure_scene_scaffolds(project_dir, manifest)
+    return manifest
+
+
+def _voice_manifest(project_dir: Path, scene_ids: list[str]) -> VoiceManifest:
+    assets = []
+    for scene_id in scene_ids:
+        audio = project_dir / "voice" / f"{scene_id}.mp3"
+        audio.parent.mkdir(parents=True, exist_ok=True)
+        audio.write_bytes(b"VOICE")
+        (project_dir / "voice" / f"{scene_id}.mp3.json").write_text("{}", encoding="utf-8")
+        assets.append(
+            {
+                "scene_id": scene_id,
+                "audio_path": f"voice/{scene_id}.mp3",
+                "metadata_path": f"voice/{scene_id}.mp3.json",
+                "cache_key": f"cache-{scene_id}",
+                "duration_seconds": 3.5,
+                "generation_mode": "generated",
+            }
+        )
+    return VoiceManifest(voice_id="qwen-default", assets=assets)
+
+
+class FakeManim:
+    """Writes the video where manim would put it, optionally waiting for `parallel` peers."""
+
+    def __init__(self, *, parallel: int = 1, fail: frozenset[str] = frozenset()) -> None:
+        self.barrier = threading.Barrier(parallel) if parallel > 1 else None
+        self.fail = fail
+        self.commands: list[list[str]] = []
+        self.envs: list[dict[str, str]] = []
+
+    def __call__(self, command: list[str], cwd: Path, env: dict[str, str]) -> subprocess.CompletedProcess:
+        self.commands.append(command)
+        self.envs.append(env)
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        scene_id = command[command.index("--output_file") + 1]
+        if scene_id in self.fail:
+            return subprocess.CompletedProcess(command, 1, "", "Traceback...\nNameError: name 'Axes3' is not defined\n")
+        media_dir = Path(command[command.index("--media_dir") + 1])
+        output = media_dir / "videos" / scene_id / "1440p60" / f"{scene_id}.mp4"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(b"VIDEO")
+        return subprocess.CompletedProcess(command, 0, "File ready", "")
+
+
+def test_render_farm_renders_scenes_in_parallel_with_stable_outputs(tmp_path) -> None:
+    manifest = _scene_manifest(tmp_path)
+    scene_ids = [scene.scene_id for scene in manifest.scenes]
+    voice_manifest = _voice_manifest(tmp_path, scene_ids)
+    runner = FakeManim(parallel=4)
+
+    rendered = render_scenes(tmp_path, manifest, workers=4, runner=runner, probe=lambda path: 3.6)
+
+    assert [scene.scene_id for scene in rendered] == scene_ids
+    assert rendered[0].video_path == tmp_path / "render" / "scene_01.mp4"
+    assert all(scene.video_path.read_bytes() == b"VIDEO" for scene in rendered)
+    first = runner.commands[0]
+    assert first[first.index("--resolution") + 1] == "2560,1440"
+    assert first[-2:] == [str(tmp_path / manifest.scenes[0].scene_file), "Scene01Scene01"]
+    assert str(tmp_path) in runner.envs[0]["PYTHONPATH"].split(":")
+
+    render_manifest = build_render_manifest(tmp_path, rendered, voice_manifest, run_id="run-1")
+    validate_render_manifest(render_manifest, voice_manifest=voice_manifest, project_dir=tmp_path)
+    row = render_manifest.scenes[0]
+    assert (row.video_path, row.video_duration_seconds, row.audio_duration_seconds) == ("render/scene_01.mp4", 3.6, 3.5)
+
+
+def test_render_failures_keep_other_scenes_and_attach_diagnostics(tmp_path) -> None:
+    manifest = _scene_manifest(tmp_path)
+
+    with pytest.raises(RenderBatchError) as excinfo:
+        render_scenes(tmp_path, manifest, workers=3, runner=FakeManim(fail=frozenset({"scene_03"})), probe=lambda path: 2.0)
+
+    [failure] = excinfo.value.failures
+    assert failure.scene_id == "scene_03"
+    assert [scene.scene_id for scene in excinfo.value.rendered] == [
+        scene.scene_id for scene in manifest.scenes if scene.scene_id != "scene_03"
+    ]
+    assert "NameError" in str(failure)
+    assert "reproduce with: manim render" in str(failure)
+    assert "exit code: 1" in failure.log_path.read_text(encoding="utf-8")
+    assert (tmp_path / "render" / "scene_04.mp4").exists()
+    assert not (tmp_path / "render" / "scene_03.mp4").exists()
+
+
+def test_render_worker_count_defaults_to_cpu_cores(monkeypatch) -> None:
+    monkeypatch.delenv(RENDER_WORKERS_ENV_VAR, raising=False)
+    monkeypatch.setattr("harness.render.os.cpu_count", lambda: 6)
+    assert render_worker_count() == 6
+    assert render_worker_count(2) == 2
+
+    monkeypatch.setenv(RENDER_WORKERS_ENV_VAR, "3")
+    assert render_worker_count() == 3
+    monkeypatch.setenv(RENDER_WORKERS_ENV_VAR, "many")
+    with pytest.raises(PermissionError):
+        render_worker_count()
+
+
+def test_render_cache_only_rerenders_scenes_with_changed_inputs(tmp_path) -> None:
+    project_dir = tmp_path / "project"
+    manifest = _scene_manifest(project_dir)
+    voice_manifest = _voice_manifest(project_dir, [scene.scene_id for scene in manifest.scenes])
+    cache = RenderCache(tmp_path / "render_cache")
+
+    def render(runner: FakeManim, probed: list[Path]):
+        keys = render_cache_keys(project_dir, manifest, voice_manifest)
+        return render_scenes(
+            project_dir,
+            manifest,
+            workers=4,
+            runner=runner,
+            probe=lambda path: probed.append(path) or 4.0,
+            cache=cache,
+            cache_keys=keys,
+        )
+
+    render(FakeManim(), [])
+
+    # A repaired scene source and a re-voiced scene are the only renders on the next run.
+    repaired = project_dir / manifest.scenes[1].scene_file
+    repaired.write_text(repaired.read_text(encoding="utf-8") + "# repaired\n", encoding="utf-8")
+    voice_manifest.assets[2].cache_key = "cache-scene_03-revoiced"
+    (project_dir / "render" / "scene_01.mp4").unlink()
+    runner, probed = FakeManim(), []
+
+    rendered = render(runner, probed)
+
+    assert sorted(command[command.index("--output_file") + 1] for command in runner.commands) == ["scene_02", "scene_03"]
+    assert len(probed) == 2
+    hits = [scene for scene in rendered if scene.cache_hit]
+    assert len(hits) == 10
+    assert hits[0].scene_id == "scene_01" and hits[0].duration_seconds == 4.0
+    assert (project_dir / "render" / "scene_01.mp4").read_bytes() == b"VIDEO"
+
+
+def test_draft_profile_renders_separately_and_never_feeds_the_render_manifest(tmp_path, monkeypatch) -> None:
+    manifest = _scene_manifest(tmp_path)
+    voice_manifest = _voice_manifest(tmp_path, [scene.scene_id for scene in manifest.scenes])
+    runner = FakeManim()
+    durations = {"scene_02": 40.0}
+
+    rendered = render_scenes(
+        tmp_path,
+        manifest,
+        workers=2,
+        runner=runner,
+        probe=lambda path: durations.get(path.stem, 2.0),
+        profile=DRAFT_PROFILE,
+    )
+
+    command = runner.commands[0]
+    assert (command[command.index("--resolution") + 1], command[command.index("--frame_rate") + 1]) == ("854,480", "15")
+    assert rendered[0].video_path == tmp_path / "render" / "draft" / "scene_01.mp4"
+    assert not (tmp_path / "render" / "scene_01.mp4").exists()
+
+    drifted = [timing.scene_id for timing in draft_timings(manifest, rendered) if not timing.within_tolerance]
+    assert drifted == ["scene_02"]
+    with pytest.raises(ValueError, match="only final renders"):
+        build_render_manifest(tmp_path, rendered, voice_manifest, run_id="run-1")
+
+    draft_keys = render_cache_keys(tmp_path, manifest, profile=DRAFT_PROFILE)
+    assert draft_keys["scene_01"] != render_cache_keys(tmp_path, manifest, voice_manifest)["scene_01"]
+
+    monkeypatch.setenv("WD_RENDER_FINAL_RESOLUTION", "1920x1080")
+    assert render_profile_from_env("final").resolution == "1920x1080"
+    monkeypatch.setenv("WD_RENDER_FINAL_FPS", "120")
+    with pytest.raises(PermissionError):
+        render_profile_from_env("final")
+
+
+def test_draft_gate_failures_drop_their_cached_drafts_so_the_retry_rerenders(tmp_path) -> None:
+    project_dir = tmp_path / "project"
+    manifest = _scene_manifest(project_dir)
+    cache = RenderCache(tmp_path / "render_cache")
+    keys = render_cache_keys(project_dir, manifest, profile=DRAFT_PROFILE)
+
+    def render(runner: FakeManim):
+        return render_scenes(
+            project_dir,
+            manifest,
+            workers=4,
+            runner=runner,
+            probe=lambda path: 40.0 if path.stem == "scene_02" else 2.0,
+            cache=cache,
+            cache_keys=keys,
+            profile=DRAFT_PROFILE,
+        )
+
+    # One scene crashes and another drifts: both fail the gate in the same pass.
+    with pytest.raises(RenderBatchError) as excinfo:
+        render(FakeManim(fail=frozenset({"scene_05"})))
+    rendered = excinfo.value.rendered
+    assert "scene_05" not in {scene.scene_id for scene in rendered}
+    timings = draft_timings(manifest, rendered)
+    failed = draft_gate_failures(timings, excinfo.value.failures)
+
+    assert len(timings) == len(manifest.scenes) - 1
+    assert list(failed) == ["scene_02", "scene_05"]
+    assert failed["scene_02"].startswith("timing drift: draft 40.00s")
+    assert failed["scene_05"].startswith("draft render failed: ")
+
+    invalidate_draft_renders(project_dir, list(failed), cache=cache, cache_keys=keys)
+    assert cache.lookup(keys["scene_02"]) is None
+    assert not (project_dir / "render" / "draft" / "scene_02.mp4").exists()
+
+    runner = FakeManim()
+    render(runner)
+    assert sorted(command[command.index("--output_file") + 1] for command in runner.commands) == ["scene_02", "scene_05"]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.client import generate_plan, repair_scene, run_scene_qc
+from harness.response_cache import ResponseCache, response_cache_key
+from harness.schemas.plan import Plan
+
+PROMPTS = {"system": "system prompt", "user": "user prompt"}
+
+
+def _key(**overrides) -> str:
+    params = {
+        "phase": "plan",
+        "prompts": PROMPTS,
+        "schema_name": "Plan",
+        "tools": ["collections_tool"],
+        "model": "grok-test",
+    }
+    params.update(overrides)
+    return response_cache_key(**params)
+
+
+def _session(tmp_path, response_id: str, plan: Plan) -> MagicMock:
+    session = MagicMock()
+    session.project_dir = tmp_path
+    session.chat_options.return_value = {
+        "model": "grok-test",
+        "tools": ["collections_tool"],
+        "store_messages": True,
+        "previous_response_id": None,
+        "response_format": Plan,
+    }
+    session.create_chat.return_value.sample.return_value = MagicMock(
+        content=plan.model_dump_json(),
+        id=response_id,
+    )
+    return session
+
+
+def test_cache_key_covers_every_request_input() -> None:
+    base = _key()
+    assert base == _key(tools=["collections_tool"])
+    assert base != _key(phase="narration")
+    assert base != _key(prompts={"system": "system prompt", "user": "other"})
+    assert base != _key(schema_name="Narration")
+    assert base != _key(tools=["collections_tool", "code_tool"])
+    assert base != _key(model="grok-other")
+    assert base != _key(previous_response_id="resp_earlier")
+
+
+def test_cache_entries_expire_after_ttl(tmp_path) -> None:
+    now = [1_800_000_000.0]
+    cache = ResponseCache(tmp_path, ttl_seconds=60, clock=lambda: now[0])
+    key = _key()
+    cache.put(key, phase="plan", schema_name="Plan", model="m", response_id="resp_1", payload={"a": 1})
+
+    now[0] += 59
+    assert cache.get(key).response_id == "resp_1"
+
+    now[0] += 2
+    assert cache.get(key) is None
+    assert not (tmp_path / f"{key}.json").exists()
+
+
+def test_cache_evicts_least_recently_used_entries_beyond_max_bytes(tmp_path) -> None:
+    now = [1_800_000_000.0]
+    cache = ResponseCache(tmp_path, clock=lambda: now[0])
+    keys = [_key(model=f"model-{index}") for index in range(3)]
+
+    for key in keys[:2]:
+        now[0] += 1
+        cache.put(key, phase="plan", schema_name="Plan", model="m", response_id="r", payload={})
+    # Room for two entries of this size, not three.
+    cache.max_bytes = (tmp_path / f"{keys[0]}.json").stat().st_size * 5 // 2
+    now[0] += 1
+    assert cache.get(keys[0]) is not None
+
+    now[0] += 1
+    cache.put(keys[2], phase="plan", schema_name="Plan", model="m", response_id="r", payload={})
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_generate_plan_replays_cached_payload(monkeypatch, tmp_path, plan: Plan) -> None:
+    monkeypatch.setenv("WD_RESPONSE_CACHE", "1")
+    first = _session(tmp_path, "resp_live", plan)
+    generate_plan(first, "topic")
+    first.create_chat.assert_called_once()
+
+    second = _session(tmp_path, "resp_unused", plan)
+    result = generate_plan(second, "topic")
+
+    assert result == plan
+    second.create_chat.assert_not_called()
+    second.update_response_id.assert_called_once_with("resp_live")
+
+
+def test_generate_plan_retry_context_bypasses_cache(monkeypatch, tmp_path, plan: Plan) -> None:
+    monkeypatch.setenv("WD_RESPONSE_CACHE", "1")
+    generate_plan(_session(tmp_path, "resp_live", plan), "topic", retry_context="previous failure")
+
+    retry = _session(tmp_path, "resp_retry", plan)
+    generate_plan(retry, "topic", retry_context="previous failure")
+
+    retry.create_chat.assert_called_once()
+    retry.update_response_id.assert_called_once_with("resp_retry")
+
+
+def test_cache_is_disabled_by_default(monkeypatch, tmp_path) -> None:
+    monkeypatch.delenv("WD_RESPONSE_CACHE", raising=False)
+    assert ResponseCache.from_env(tmp_path) is None
+
+    monkeypatch.setenv("WD_RESPONSE_CACHE", "1")
+    monkeypatch.setenv("WD_RESPONSE_CACHE_TTL_SECONDS", "0")
+    with pytest.raises(PermissionError):
+        ResponseCache.from_env(tmp_path)
+
+
+def test_repair_calls_skip_cache_reads_by_default(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("WD_RESPONSE_CACHE", "1")
+    scene_file = tmp_path / "scene_01.py"
+    scene_file.write_text("# scene\n", encoding="utf-8")
+    calls: list[bool] = []
+    monkeypatch.setattr(
+        "harness.client.run_phase",
+        lambda session, phase, prompts, *, bypass_cache=False: calls.append(bypass_cache),
+    )
+
+    repair_scene(MagicMock(), str(scene_file), "NameError")
+    run_scene_qc(MagicMock(), str(scene_file))
+    run_scene_qc(MagicMock(), str(scene_file), bypass_cache=True)
+
+    assert calls == [True, False, True]
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from harness import cli
+from harness.batch import (
+    BATCH_SCOPE,
+    build_scenes_batch,
+    clear_scene_ledger,
+    record_batch_failure,
+    scene_qc_batch,
+)
+from harness.build_fingerprint import scene_build_fingerprint
+from harness.contracts.runtime_pipeline import (
+    build_scene_manifest,
+    build_scene_spec,
+    ensure_scene_scaffolds,
+    write_scene_manifest,
+)
+from harness.contracts.state import (
+    create_initial_state,
+    load_state,
+    record_scene_failure,
+    save_state_atomic,
+    transition_state,
+)
+from harness.exit_codes import HarnessExitCode
+from harness.parser import SemanticValidationError
+from harness.schemas.narration import Narration, NarrationScene
+from harness.schemas.plan import Plan, Scene
+from harness.schemas.scene_build import SceneBuild
+from harness.schemas.scene_qc import SceneQC
+
+
+def _seed_project(project_dir: Path, scene_count: int = 12):
+    plan = Plan(
+        title="Batch Fixture",
+        description="fixture",
+        target_duration_seconds=600,
+        scenes=[
+            Scene(
+                title=f"Scene {index:02d}",
+                description=f"Description {index:02d}",
+                estimated_duration_seconds=30,
+                visual_ideas=["idea"],
+            )
+            for index in range(1, scene_count + 1)
+        ],
+    )
+    narration = Narration(
+        scenes=[
+            NarrationScene(scene_title=f"Scene {index:02d}", narration_text=f"Narration {index:02d}")
+            for index in range(1, scene_count + 1)
+        ]
+    )
+    manifest = build_scene_manifest(plan, narration)
+    write_scene_manifest(project_dir, manifest)
+    ensure_scene_scaffolds(project_dir, manifest)
+
+    state = create_initial_state("batch", "topic")
+    for phase in ("plan", "review", "narration", "build_scenes"):
+        state = transition_state(state, phase)
+    save_state_atomic(project_dir / "project_state.json", state)
+    return manifest
+
+
+def test_build_scenes_batch_runs_concurrently_and_injects_each_scene(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def fake_generate_scene(session, scene_spec, retry_context=None):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return SceneBuild(scene_body=f"self.wait(1)  # {scene_spec['title']}", reasoning="r")
+
+    with patch("harness.batch.generate_scene", side_effect=fake_generate_scene):
+        result = build_scenes_batch(MagicMock(), tmp_path, manifest, max_concurrency=3)
+
+    assert result.exit_code is HarnessExitCode.SUCCESS
+    assert [outcome.scene_id for outcome in result.outcomes] == [scene.scene_id for scene in manifest.scenes]
+    assert 1 < peak <= 3
+    for scene in manifest.scenes:
+        content = (tmp_path / scene.scene_file).read_text(encoding="utf-8")
+        assert f"self.wait(1)  # {scene.scene_title}" in content
+
+
+def test_build_scenes_batch_isolates_scene_failures(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+
+    def fake_generate_scene(session, scene_spec, retry_context=None):
+        if scene_spec["title"] == "Scene 03":
+            raise SemanticValidationError("missing timing validation")
+        return SceneBuild(scene_body="self.wait(1)", reasoning="r")
+
+    with patch("harness.batch.generate_scene", side_effect=fake_generate_scene):
+        result = build_scenes_batch(MagicMock(), tmp_path, manifest, max_concurrency=4)
+
+    assert [outcome.scene_id for outcome in result.failures] == ["scene_03"]
+    assert result.exit_code is HarnessExitCode.VALIDATION_ERROR
+    built = [outcome for outcome in result.outcomes if outcome.succeeded]
+    assert len(built) == len(manifest.scenes) - 1
+
+
+def test_build_scenes_retry_reruns_only_failed_scenes_and_blocks_repeat_offender(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+    calls: list[str] = []
+
+    def fake_generate_scene(session, scene_spec, retry_context=None):
+        calls.append(scene_spec["title"])
+        if scene_spec["title"] == "Scene 03":
+            raise SemanticValidationError("missing timing validation")
+        return SceneBuild(scene_body="self.wait(1)", reasoning="r")
+
+    with patch("harness.batch.generate_scene", side_effect=fake_generate_scene):
+        first = build_scenes_batch(MagicMock(), tmp_path, manifest)
+        assert record_batch_failure(tmp_path, first) is False
+        calls.clear()
+        second = build_scenes_batch(MagicMock(), tmp_path, manifest)
+        blocked = record_batch_failure(tmp_path, second)
+
+    assert calls == ["Scene 03"]
+    assert blocked is True
+    payload = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))
+    ledger = payload["scene_ledger"]
+    assert ledger["scene_03"]["status"] == "blocked"
+    assert ledger["scene_03"]["attempts"] == 2
+    assert ledger["scene_01"]["stage"] == "built"
+    assert len(ledger["scene_01"]["artifact_hashes"]["scene_file"]) == 64
+    assert "blocked scene(s): scene_03" in payload["failure_context"]["error_message"]
+
+
+def test_build_scenes_batch_rebuilds_only_scenes_whose_inputs_changed(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+    calls: list[str] = []
+
+    def fake_generate_scene(session, scene_spec, retry_context=None):
+        calls.append(scene_spec["title"])
+        return SceneBuild(scene_body="self.wait(1)", reasoning="r")
+
+    edited = manifest.model_copy(deep=True)
+    edited.scenes[1].narration_duration_seconds += 2
+    emptied = edited.scenes[2]
+    scene_file = tmp_path / emptied.scene_file
+
+    with patch("harness.batch.generate_scene", side_effect=fake_generate_scene):
+        build_scenes_batch(MagicMock(), tmp_path, manifest)
+        calls.clear()
+        # A fresh narration clears the ledger; unchanged fingerprints still skip the rebuild.
+        clear_scene_ledger(tmp_path)
+        scene_file.write_text(scene_file.read_text(encoding="utf-8").replace("self.wait(1)", "pass"), encoding="utf-8")
+        result = build_scenes_batch(MagicMock(), tmp_path, edited)
+        assert sorted(calls) == ["Scene 02", "Scene 03"]
+        assert result.exit_code is HarnessExitCode.SUCCESS
+
+        calls.clear()
+        build_scenes_batch(MagicMock(), tmp_path, edited, force=True)
+        assert len(calls) == len(manifest.scenes)
+
+    assert scene_build_fingerprint(build_scene_spec(manifest.scenes[0])) != scene_build_fingerprint(
+        build_scene_spec(manifest.scenes[0]), model="other-model"
+    )
+
+
+def test_scene_qc_batch_writes_reports_and_marks_scenes_passed(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+
+    def fake_run_scene_qc(session, scene_file, bypass_cache=False):
+        return SceneQC(scene_title=Path(scene_file).stem, passed=True, score=0.9, issues=[])
+
+    with patch("harness.batch.run_scene_qc", side_effect=fake_run_scene_qc):
+        result = scene_qc_batch(MagicMock(), tmp_path, manifest, max_concurrency=4)
+
+    assert result.exit_code is HarnessExitCode.SUCCESS
+    ledger = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))["scene_ledger"]
+    assert {entry["stage"] for entry in ledger.values()} == {"qc_passed"}
+    for scene in manifest.scenes:
+        report = tmp_path / "qc" / f"{Path(scene.scene_file).stem}_qc.json"
+        assert json.loads(report.read_text(encoding="utf-8"))["scene_id"] == scene.scene_id
+
+
+def test_scene_qc_batch_bypasses_the_response_cache_for_retried_scenes(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+    state_file = tmp_path / "project_state.json"
+    state = record_scene_failure(
+        load_state(state_file),
+        "scene_02",
+        phase="scene_qc",
+        error_code="VALIDATION_ERROR",
+        error_message="timing drift",
+        rewind_to="built",
+    )
+    save_state_atomic(state_file, state)
+    bypassed: dict[str, bool] = {}
+
+    def fake_run_scene_qc(session, scene_file, bypass_cache=False):
+        bypassed[Path(scene_file).stem] = bypass_cache
+        return SceneQC(scene_title="t", passed=True, score=0.9, issues=[])
+
+    with patch("harness.batch.run_scene_qc", side_effect=fake_run_scene_qc):
+        scene_qc_batch(MagicMock(), tmp_path, manifest, max_concurrency=4)
+
+    assert [stem for stem, bypass in bypassed.items() if bypass] == [Path(manifest.scenes[1].scene_file).stem]
+
+
+def test_scene_qc_batch_charges_threshold_failures_to_the_scene(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+    state_file = tmp_path / "project_state.json"
+    save_state_atomic(state_file, transition_state(load_state(state_file), "scene_qc"))
+
+    def fake_run_scene_qc(session, scene_file, bypass_cache=False):
+        score = 0.5 if "scene_04" in scene_file else 0.9
+        return SceneQC(scene_title="t", passed="scene_07" not in scene_file, score=score, issues=[])
+
+    with patch("harness.batch.run_scene_qc", side_effect=fake_run_scene_qc):
+        result = scene_qc_batch(MagicMock(), tmp_path, manifest, max_concurrency=4, min_score=0.7)
+
+    assert result.exit_code is HarnessExitCode.VALIDATION_ERROR
+    assert [outcome.scene_id for outcome in result.failures] == ["scene_04", "scene_07"]
+    assert "score below threshold" in result.failures[0].error_message
+    assert "passed=false" in result.failures[1].error_message
+
+    record_batch_failure(tmp_path, result)
+    ledger = json.loads(state_file.read_text(encoding="utf-8"))["scene_ledger"]
+    assert ledger["scene_04"]["attempts"] == 1
+    assert ledger["scene_07"]["attempts"] == 1
+    assert ledger["scene_01"]["stage"] == "qc_passed"
+    assert BATCH_SCOPE not in ledger
+
+
+def test_scene_qc_batch_rechecks_skipped_scenes_against_their_report(tmp_path) -> None:
+    manifest = _seed_project(tmp_path)
+
+    def fake_run_scene_qc(session, scene_file, bypass_cache=False):
+        return SceneQC(scene_title="t", passed=True, score=0.9, issues=[])
+
+    with patch("harness.batch.run_scene_qc", side_effect=fake_run_scene_qc):
+        scene_qc_batch(MagicMock(), tmp_path, manifest, max_concurrency=4)
+    (tmp_path / "qc" / f"{Path(manifest.scenes[2].scene_file).stem}_qc.json").unlink()
+
+    with patch("harness.batch.run_scene_qc", side_effect=fake_run_scene_qc) as rerun:
+        result = scene_qc_batch(MagicMock(), tmp_path, manifest, max_concurrency=4)
+
+    rerun.assert_not_called()
+    assert [outcome.scene_id for outcome in result.failures] == ["scene_03"]
+    assert "missing QC report" in result.failures[0].error_message
+
+
+@patch("harness.cli.PipelineTrainingSession.from_project")
+def test_cli_all_scenes_records_single_phase_failure(mock_from_project, monkeypatch, tmp_path) -> None:
+    _seed_project(tmp_path)
+    mock_from_project.return_value = MagicMock()
+
+    def fake_generate_scene(session, scene_spec, retry_context=None):
+        if scene_spec["title"] in {"Scene 02", "Scene 05"}:
+            raise SemanticValidationError(f"bad scene {scene_spec['title']}")
+        return SceneBuild(scene_body="self.wait(1)", reasoning="r")
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["harness.cli", "--phase", "build_scenes", "--project-dir", str(tmp_path), "--all-scenes"],
+    )
+    with patch("harness.batch.generate_scene", side_effect=fake_generate_scene):
+        rc = cli.main()
+
+    assert rc == int(HarnessExitCode.VALIDATION_ERROR)
+    state = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))
+    assert state["attempt_counters"] == {"build_scenes": 1}
+    assert state["failure_context"]["error_code"] == "VALIDATION_ERROR"
+    assert "scene_02" in state["failure_context"]["error_message"]
+    assert "scene_05" in state["failure_context"]["error_message"]
+
+    events = (tmp_path / "log" / "events.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(events[-1])["event_type"] == "phase_failure"
+
+
+def test_cli_all_scenes_rejects_unsupported_phase(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["harness.cli", "--phase", "plan", "--project-dir", str(tmp_path), "--all-scenes"],
+    )
+    assert cli.main() == int(HarnessExitCode.POLICY_VIOLATION)
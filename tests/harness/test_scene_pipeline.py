@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from harness.batch import build_scenes_batch
+from harness.contracts.runtime_pipeline import build_scene_manifest
+from harness.contracts.state import (
+    create_initial_state,
+    get_scene_ledger,
+    load_state,
+    save_state_atomic,
+    transition_state,
+    update_state_key,
+)
+from harness.parser import SemanticValidationError
+from harness.pipeline import ScenePipeline
+from harness.schemas.narration import Narration, NarrationScene
+from harness.schemas.plan import Plan
+from harness.schemas.scene_build import SceneBuild
+from harness.schemas.scene_qc import SceneQC
+
+
+def _seed_project(project_dir: Path, plan: Plan) -> None:
+    state = create_initial_state("pipeline", "topic")
+    for phase in ("plan", "review", "narration"):
+        state = transition_state(state, phase)
+    save_state_atomic(project_dir / "project_state.json", update_state_key(state, "plan", plan.model_dump(mode="json")))
+
+
+def _streaming_session(
+    project_dir: Path,
+    narration: Narration,
+    build_started: threading.Event,
+    stream_done: threading.Event,
+) -> MagicMock:
+    content = narration.model_dump_json()
+    final = SimpleNamespace(id="resp_narration", content=content, usage=None, server_side_tool_usage={})
+
+    def stream():
+        for offset in range(0, len(content), 50):
+            if offset > len(content) // 2:
+                # Hold the second half of the stream until a scene build is in flight.
+                assert build_started.wait(timeout=5)
+            yield final, SimpleNamespace(content=content[offset:offset + 50])
+        stream_done.set()
+
+    session = MagicMock()
+    session.project_dir = project_dir
+    session.response_id = None
+    session.create_chat.return_value.stream.side_effect = stream
+    return session
+
+
+def _qc(scene_file: str) -> SceneQC:
+    return SceneQC(scene_title=Path(scene_file).stem, passed=True, score=0.9, issues=[])
+
+
+def test_pipeline_builds_scenes_while_narration_streams(tmp_path, plan: Plan) -> None:
+    narration = Narration(
+        scenes=[NarrationScene(scene_title=scene.title, narration_text=f"Narration for {scene.title}") for scene in plan.scenes]
+    )
+    _seed_project(tmp_path, plan)
+    build_started = threading.Event()
+    stream_done = threading.Event()
+    built_during_stream: list[str] = []
+
+    def fake_generate_scene(_session, scene_spec, retry_context=None):
+        build_started.set()
+        if not stream_done.is_set():
+            built_during_stream.append(scene_spec["title"])
+        if scene_spec["title"] == "Scene 05":
+            raise SemanticValidationError("missing timing evidence")
+        return SceneBuild(scene_body="self.wait(1)", reasoning="r")
+
+    session = _streaming_session(tmp_path, narration, build_started, stream_done)
+    with (
+        patch("harness.pipeline.generate_scene", side_effect=fake_generate_scene),
+        patch("harness.pipeline.run_scene_qc", side_effect=lambda _session, scene_file: _qc(scene_file)),
+    ):
+        result, outcomes = ScenePipeline(session, tmp_path, plan, max_concurrency=4).run()
+
+    assert result == narration
+    assert built_during_stream, "no scene build started before the narration stream finished"
+    assert [outcome.scene_id for outcome in outcomes if not outcome.succeeded] == ["scene_05"]
+
+    state = load_state(tmp_path / "project_state.json")
+    assert state.phase == "narration"
+    ledger = get_scene_ledger(state)
+    assert ledger["scene_01"].stage == "qc_passed"
+    assert ledger["scene_05"].stage == "scaffolded"
+    assert (tmp_path / "qc" / "scene_01_scene_01_qc.json").exists()
+    assert '"scene_12"' in (tmp_path / "narration_script.py").read_text(encoding="utf-8")
+
+    # The regular build_scenes batch only picks up the deferred scene.
+    state = transition_state(state, "build_scenes")
+    save_state_atomic(tmp_path / "project_state.json", state)
+    with patch("harness.batch.generate_scene", return_value=SceneBuild(scene_body="self.wait(1)", reasoning="r")) as batch_build:
+        batch = build_scenes_batch(MagicMock(), tmp_path, build_scene_manifest(plan, narration))
+
+    assert batch.failures == []
+    assert [call.args[1]["title"] for call in batch_build.call_args_list] == ["Scene 05"]
+    payload = json.loads((tmp_path / "project_state.json").read_text(encoding="utf-8"))
+    assert payload["scene_ledger"]["scene_05"]["stage"] == "built"
+
+
+def test_replayed_narration_stream_does_not_resubmit_started_scenes(tmp_path, plan: Plan) -> None:
+    narration = Narration(
+        scenes=[NarrationScene(scene_title=scene.title, narration_text=f"Narration for {scene.title}") for scene in plan.scenes]
+    )
+    _seed_project(tmp_path, plan)
+
+    def replaying_stream(_session, _plan, on_scene):
+        # The first attempt is throttled after three scenes; the retry streams everything again.
+        for index, scene in enumerate(narration.scenes[:3]):
+            on_scene(index, scene)
+        for index, scene in enumerate(narration.scenes):
+            on_scene(index, scene)
+        return narration
+
+    built: list[str] = []
+    build_lock = threading.Lock()
+
+    def fake_generate_scene(_session, scene_spec, retry_context=None):
+        with build_lock:
+            built.append(scene_spec["title"])
+        return SceneBuild(scene_body="self.wait(1)", reasoning="r")
+
+    with (
+        patch("harness.pipeline.stream_narration", side_effect=replaying_stream),
+        patch("harness.pipeline.generate_scene", side_effect=fake_generate_scene),
+        patch("harness.pipeline.run_scene_qc", side_effect=lambda _session, scene_file: _qc(scene_file)),
+    ):
+        result, outcomes = ScenePipeline(MagicMock(), tmp_path, plan, max_concurrency=4).run()
+
+    assert result == narration
+    assert sorted(built) == [scene.title for scene in plan.scenes]
+    assert len(outcomes) == 12 and all(outcome.succeeded for outcome in outcomes)
+
+
+def test_pipelined_qc_below_threshold_is_charged_to_the_scene(tmp_path, plan: Plan) -> None:
+    narration = Narration(
+        scenes=[NarrationScene(scene_title=scene.title, narration_text=f"Narration for {scene.title}") for scene in plan.scenes]
+    )
+    _seed_project(tmp_path, plan)
+
+    def streaming(_session, _plan, on_scene):
+        for index, scene in enumerate(narration.scenes):
+            on_scene(index, scene)
+        return narration
+
+    def fake_run_scene_qc(_session, scene_file):
+        score = 0.4 if "scene_03" in scene_file else 0.9
+        return SceneQC(scene_title=Path(scene_file).stem, passed=True, score=score, issues=[])
+
+    with (
+        patch("harness.pipeline.stream_narration", side_effect=streaming),
+        patch("harness.pipeline.generate_scene", return_value=SceneBuild(scene_body="self.wait(1)", reasoning="r")),
+        patch("harness.pipeline.run_scene_qc", side_effect=fake_run_scene_qc),
+    ):
+        _, outcomes = ScenePipeline(MagicMock(), tmp_path, plan, max_concurrency=4, min_score=0.7).run()
+
+    assert [outcome.scene_id for outcome in outcomes if not outcome.succeeded] == ["scene_03"]
+    ledger = get_scene_ledger(load_state(tmp_path / "project_state.json"))
+    assert ledger["scene_03"].stage == "built"
+    assert ledger["scene_03"].attempts == 1
+    assert ledger["scene_04"].stage == "qc_passed"
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from harness.client import generate_plan, generate_scene
+from harness.contracts.observability import read_events
+from harness.parser import SemanticValidationError
+from harness.schemas.plan import Plan
+from harness.schemas.scene_build import SceneBuild
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def _usage(prompt: int, completion: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        prompt_tokens=prompt,
+        cached_prompt_text_tokens=0,
+        completion_tokens=completion,
+        reasoning_tokens=5,
+        total_tokens=prompt + completion + 5,
+    )
+
+
+def _session(project_dir: Path, response) -> MagicMock:
+    session = MagicMock()
+    session.project_dir = project_dir
+    session.response_id = None
+    session.create_chat.return_value.sample.return_value = response
+    return session
+
+
+def _usage_events(project_dir: Path) -> list[dict]:
+    return [event for event in read_events(project_dir) if event["event_type"] == "phase_usage"]
+
+
+def test_phase_call_emits_usage_record(tmp_path, plan: Plan) -> None:
+    response = SimpleNamespace(
+        id="resp_plan",
+        content=plan.model_dump_json(),
+        usage=_usage(100, 40),
+        server_side_tool_usage={"SERVER_SIDE_TOOL_COLLECTIONS_SEARCH": 2},
+        cost_usd=0.0125,
+    )
+
+    generate_plan(_session(tmp_path, response), "topic")
+
+    [event] = _usage_events(tmp_path)
+    assert event["phase"] == "plan"
+    assert event["actor"] == "harness"
+    usage = event["metadata"]
+    assert usage["prompt_tokens"] == 100
+    assert usage["completion_tokens"] == 40
+    assert usage["total_tokens"] == 145
+    assert usage["server_side_tool_calls"] == {"SERVER_SIDE_TOOL_COLLECTIONS_SEARCH": 2}
+    assert usage["latency_ms"] >= 0
+    assert usage["cache_hit"] is False
+    assert usage["accepted"] is True
+
+
+def test_rejected_response_still_records_usage(tmp_path) -> None:
+    response = SimpleNamespace(
+        id="resp_scene",
+        content=SceneBuild(scene_body="self.add(Dot())", reasoning="r").model_dump_json(),
+        usage=_usage(80, 20),
+        server_side_tool_usage={},
+    )
+
+    with pytest.raises(SemanticValidationError):
+        generate_scene(_session(tmp_path, response), {"title": "t", "description": "d", "visual_ideas": ["v"]})
+
+    [event] = _usage_events(tmp_path)
+    assert event["metadata"]["accepted"] is False
+    assert event["metadata"]["prompt_tokens"] == 80
+
+
+def test_report_aggregates_usage_per_run_and_phase(tmp_path, plan: Plan) -> None:
+    for prompt in (100, 50):
+        response = SimpleNamespace(
+            id=f"resp_{prompt}",
+            content=plan.model_dump_json(),
+            usage=_usage(prompt, 10),
+            server_side_tool_usage={"SERVER_SIDE_TOOL_CODE_EXECUTION": 1},
+        )
+        generate_plan(_session(tmp_path, response), f"topic {prompt}")
+
+    result = subprocess.run(
+        [sys.executable, str(ROOT_DIR / "scripts" / "update_project_state.py"), "report", "--project-dir", str(tmp_path)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    plan = report["phases"]["plan"]
+    assert plan["calls"] == 2
+    assert plan["prompt_tokens"] == 150
+    assert plan["tool_calls"] == 2
+    [run] = report["runs"].values()
+    assert run["totals"]["total_tokens"] == plan["total_tokens"]
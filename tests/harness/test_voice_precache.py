@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import threading
+from typing import Sequence
+
+import pytest
+
+from harness.contracts.media_pipeline import validate_voice_manifest_files
+from harness.contracts.runtime_pipeline import SceneManifest
+from harness.voice_precache import (
+    live_voice_cache_keys,
+    precache_voiceovers,
+    voice_manifest_matches_scenes,
+    voice_synthesis_backend,
+    write_voice_manifest,
+)
+from wet_donkey_voice.backends import SilentWavBackend, SynthesisRequest
+from wet_donkey_voice.qwen_cached import QwenCachedTTS
+
+
+def _scene_manifest(count: int = 3) -> SceneManifest:
+    return SceneManifest.model_validate(
+        {
+            "generated_at": "2026-01-01T00:00:00Z",
+            "scenes": [
+                {
+                    "scene_id": f"scene_{index:02d}",
+                    "scene_index": index,
+                    "scene_title": f"Scene {index}",
+                    "scene_description": "A scene.",
+                    "scene_file": f"scenes/scene_{index:02d}.py",
+                    "narration_text": " ".join(["word"] * (index + 1)),
+                    "narration_duration_seconds": 0.4 * (index + 1),
+                    "visual_ideas": ["idea"],
+                }
+                for index in range(1, count + 1)
+            ],
+        }
+    )
+
+
+class BarrierBackend(SilentWavBackend):
+    """Blocks until every session is synthesizing at once, proving the sessions overlap."""
+
+    def __init__(self, parties: int) -> None:
+        self.barrier = threading.Barrier(parties)
+        self.texts: list[str] = []
+
+    def synthesize_batch(self, requests: Sequence[SynthesisRequest], *, sample_rate_hz: int, channels: int) -> None:
+        self.texts += [request.text for request in requests]
+        self.barrier.wait(timeout=5)
+        super().synthesize_batch(requests, sample_rate_hz=sample_rate_hz, channels=channels)
+
+
+def test_precache_synthesizes_scenes_concurrently_with_probed_durations(tmp_path) -> None:
+    project_dir = tmp_path / "project"
+    scene_manifest = _scene_manifest()
+    backend = BarrierBackend(parties=3)
+    service = QwenCachedTTS(cache_dir=str(tmp_path / "voice_cache"), audio_format="wav", backend=backend)
+
+    manifest = precache_voiceovers(project_dir, scene_manifest, service=service, workers=3, batch_size=1)
+
+    assert [asset.scene_id for asset in manifest.assets] == ["scene_01", "scene_02", "scene_03"]
+    assert [asset.duration_seconds for asset in manifest.assets] == [0.8, 1.2, 1.6]
+    assert manifest.assets[0].audio_path == "voice/scene_01.wav"
+    validate_voice_manifest_files(manifest, project_dir=project_dir)
+    assert voice_manifest_matches_scenes(project_dir, manifest, scene_manifest)
+
+    again = precache_voiceovers(project_dir, scene_manifest, service=service, workers=1)
+    assert {asset.generation_mode for asset in again.assets} == {"cache_hit"}
+    assert len(backend.texts) == 3
+
+
+class SessionRecordingBackend(SilentWavBackend):
+    def __init__(self) -> None:
+        self.sessions: list[list[str]] = []
+
+    def synthesize_batch(self, requests: Sequence[SynthesisRequest], *, sample_rate_hz: int, channels: int) -> None:
+        self.sessions.append([request.text for request in requests])
+        super().synthesize_batch(requests, sample_rate_hz=sample_rate_hz, channels=channels)
+
+
+def test_precache_sends_all_misses_as_one_backend_session_by_default(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("WD_VOICE_BATCH_SIZE", raising=False)
+    backend = SessionRecordingBackend()
+    service = QwenCachedTTS(cache_dir=str(tmp_path / "voice_cache"), audio_format="wav", backend=backend)
+
+    precache_voiceovers(tmp_path / "project", _scene_manifest(), service=service, workers=3)
+
+    assert backend.sessions == [["word word", "word word word", "word word word word"]]
+
+
+def test_voice_manifest_no_longer_matches_after_narration_edit(tmp_path) -> None:
+    project_dir = tmp_path / "project"
+    scene_manifest = _scene_manifest(count=2)
+    service = QwenCachedTTS(cache_dir=str(tmp_path / "voice_cache"), audio_format="wav")
+    manifest = precache_voiceovers(project_dir, scene_manifest, service=service, workers=2)
+
+    edited = scene_manifest.model_copy(deep=True)
+    edited.scenes[1].narration_text = "a revised line"
+
+    assert not voice_manifest_matches_scenes(project_dir, manifest, edited)
+
+
+def test_live_voice_cache_keys_pin_the_sentences_of_composed_scenes(tmp_path) -> None:
+    project_dir = tmp_path / "project"
+    scene_manifest = _scene_manifest(count=1)
+    scene_manifest.scenes[0].narration_text = "First sentence. Second sentence."
+    service = QwenCachedTTS(cache_dir=str(tmp_path / "voice_cache"), audio_format="wav", segment_sentences=True)
+    manifest = precache_voiceovers(project_dir, scene_manifest, service=service, workers=1)
+    write_voice_manifest(project_dir, manifest)
+
+    keys, live = live_voice_cache_keys([project_dir])
+
+    assert live == {str(project_dir.resolve())}
+    assert keys == set(service.index.keys())
+    assert len(keys) == 3
+
+
+def test_voice_backend_is_selected_by_name_import_path_or_env(monkeypatch, capsys) -> None:
+    monkeypatch.delenv("WD_VOICE_BACKEND", raising=False)
+    assert isinstance(voice_synthesis_backend(), SilentWavBackend)
+    assert "placeholder silence" in capsys.readouterr().err
+
+    backend = voice_synthesis_backend("tests.harness.test_voice_precache:SessionRecordingBackend")
+    assert isinstance(backend, SessionRecordingBackend)
+
+    with pytest.raises(ValueError, match="unknown synthesis backend 'nope'"):
+        voice_synthesis_backend("nope")
+    monkeypatch.setenv("WD_VOICE_BACKEND", "missing.module:Engine")
+    with pytest.raises(PermissionError, match="WD_VOICE_BACKEND: cannot load synthesis backend"):
+        voice_synthesis_backend()